@@ -16,6 +16,9 @@
 #       a[l] is Real
 
 from gurobipy import *
+from dobss_model import big_m_values
+from game_loader import load_game
+import sys
 
 __author__ = "Sailik Sengupta"
 __version__ = "1.0"
@@ -28,7 +31,7 @@ try:
     # Create a new model
     m = Model("MILP")
 
-    f = open(sys.argv[1], "r")
+    game = load_game(sys.argv[1])
     """
     ------ Input file ------
     No. of defender strategies (X)
@@ -58,21 +61,20 @@ try:
     """
 
     # Add defender stategies to the model
-    X = int(f.readline())
-    L = int(f.readline())
+    X = game.X
+    L = game.L
     obj = QuadExpr()
-    M = 100000000
     x = []
 
     for l in range(L):
 
         # Probability of l-th attacker
-        p = float(f.readline())
+        p = float(game.p[l])
 
         ##### q #####
-        Q = int(f.readline())
+        Q = game.Q[l]
         q = []
-        cve_names = f.readline().strip().split("|")
+        cve_names = game.cve_names[l]
         for i in range(Q):
             n = "attacker" + str(l) + "-" + cve_names[i]
             q.append(m.addVar(lb=0, ub=1, vtype=GRB.INTEGER, name=n))
@@ -113,30 +115,25 @@ try:
             m.addConstr(sum_i <= 1)
             m.addConstr(sum_i >= q[j])
 
+        # Per-column big-M and bounds of a from the attacker payoffs
+        M, (a_lb, a_ub) = big_m_values(game.C[l])
         a = m.addVar(
-            lb=-GRB.INFINITY, ub=GRB.INFINITY, vtype=GRB.CONTINUOUS, name="a-" + str(l)
+            lb=max(a_lb, -GRB.INFINITY),
+            ub=min(a_ub, GRB.INFINITY),
+            vtype=GRB.CONTINUOUS,
+            name="a-" + str(l),
         )
 
         m.update()
 
-        # Get reward for attacker and defender
-        R = []
-        C = []
-        for i in range(X):
-            rewards = f.readline().split()
-            r = []
-            c = []
-            for j in range(Q):
-                r_and_c = rewards[j].split(",")
-                r.append(r_and_c[0])
-                c.append(r_and_c[1])
-            R.append(r)
-            C.append(c)
+        # Reward for defender and attacker (already converted to floats)
+        R = game.R[l].tolist()
+        C = game.C[l].tolist()
 
         # Update objective function
         for i in range(X):
             for j in range(Q):
-                r = p * float(R[i][j])
+                r = p * R[i][j]
                 obj.add(r * z[i][j])
 
         # Add constrains to make attacker select dominant pure strategy
@@ -147,9 +144,9 @@ try:
                 x_con = LinExpr()
                 for k in range(Q):
                     x_con.add(z[i][k])
-                val.add(float(C[i][j]) * x_con, -1.0)
+                val.add(C[i][j] * x_con, -1.0)
             m.addConstr(val >= 0)
-            m.addConstr(val <= (1 - q[j]) * M)
+            m.addConstr(val <= (1 - q[j]) * float(M[j]))
 
         m.update()
 
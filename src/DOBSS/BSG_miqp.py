@@ -13,6 +13,8 @@
 #       a[l] is Real
 
 from gurobipy import *
+from dobss_model import big_m_values
+from game_loader import load_game
 import sys
 
 __author__ = "Sailik Sengupta"
@@ -23,12 +25,7 @@ try:
     # Create a new model
     m = Model("MIQP")
 
-    # if len(sys.argv) < 3:
-    f = open(str(sys.argv[1]), "r")
-    # f = open('original_game_data_input.txt', 'r')
-
-    # else:
-    #    f = open(sys.argv[2], 'r')
+    game = load_game(sys.argv[1])
     """
     ------ Input file ------
     No. of defender strategies (X)
@@ -55,7 +52,7 @@ try:
     """
 
     # Add defender stategies to the model
-    X = int(f.readline())
+    X = game.X
     x = []
     for i in range(X):
         n = "x-" + str(i)
@@ -70,48 +67,41 @@ try:
 
     """ Start processing for attacker types """
 
-    L = int(f.readline())
+    L = game.L
     obj = QuadExpr()
-    M = 100000000
 
     for l in range(L):
 
         # Probability of l-th attacker
-        v = f.readline().strip()
-        p = float(v)
+        p = float(game.p[l])
 
         # Add l-th attacker info to the model
-        Q = int(f.readline())
+        Q = game.Q[l]
         q = []
-        cve_names = f.readline().strip().split("|")
+        cve_names = game.cve_names[l]
         for i in range(Q):
             n = str(l) + "-" + cve_names[i]
             q.append(m.addVar(lb=0, ub=1, vtype=GRB.INTEGER, name=n))
 
+        # Per-column big-M and bounds of a from the attacker payoffs
+        M, (a_lb, a_ub) = big_m_values(game.C[l])
         a = m.addVar(
-            lb=-GRB.INFINITY, ub=GRB.INFINITY, vtype=GRB.CONTINUOUS, name="a-" + str(l)
+            lb=max(a_lb, -GRB.INFINITY),
+            ub=min(a_ub, GRB.INFINITY),
+            vtype=GRB.CONTINUOUS,
+            name="a-" + str(l),
         )
 
         m.update()
 
-        # Get reward for attacker and defender
-        R = []
-        C = []
-        for i in range(X):
-            rewards = f.readline().split()
-            r = []
-            c = []
-            for j in range(Q):
-                r_and_c = rewards[j].split(",")
-                r.append(r_and_c[0])
-                c.append(r_and_c[1])
-            R.append(r)
-            C.append(c)
+        # Reward for defender and attacker (already converted to floats)
+        R = game.R[l].tolist()
+        C = game.C[l].tolist()
 
         # Update objective function
         for i in range(X):
             for j in range(Q):
-                r = p * float(R[i][j])
+                r = p * R[i][j]
                 obj.add(r * x[i] * q[j])
 
         # Add constraints to make attaker have a pure strategy
@@ -125,9 +115,9 @@ try:
             val = LinExpr()
             val.add(a)
             for i in range(X):
-                val.add(float(C[i][j]) * x[i], -1.0)
+                val.add(C[i][j] * x[i], -1.0)
             m.addConstr(val >= 0, q[j].getAttr("VarName") + "lb")
-            m.addConstr(val <= (1 - q[j]) * M, q[j].getAttr("VarName") + "ub")
+            m.addConstr(val <= (1 - q[j]) * float(M[j]), q[j].getAttr("VarName") + "ub")
 
     # Set objective funcion as all attackers have now been considered
     m.setObjective(obj, GRB.MAXIMIZE)
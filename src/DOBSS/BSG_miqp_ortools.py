@@ -19,21 +19,36 @@
 #   z[i][j] >= x[i] + q[j] - 1
 #   z[i][j] >= 0
 
-from ortools.linear_solver import pywraplp
-import sys
+from dobss import BACKENDS, solve_dobss
+from game_loader import load_game
+from presolve import Presolve
+import argparse
 
 __author__ = "Sailik Sengupta"
 __version__ = "2.0"
 __email__ = "link2sailik [at] gmail [dot] com"
 
-# Create a new model using SCIP solver (supports MILP)
-solver = pywraplp.Solver.CreateSolver('SCIP')
-if not solver:
-    print("Could not create SCIP solver")
-    sys.exit(1)
-
-f = open(str(sys.argv[1]), "r")
 """
+Usage: python BSG_miqp_ortools.py <input_file> [--backend NAME] [--bulk]
+                                  [--time-limit SECONDS] [--big-m M]
+                                  [--presolve] [--hint-store DIR]
+                                  [--heuristic]
+
+The model is built and solved by dobss.solve_dobss; this script only prints
+the result. --bulk is short for --backend scip-bulk, which assembles the
+constraint matrix with NumPy and loads it into the solver in one call.
+--big-m takes "tight" (default, per-column values computed from the payoffs)
+or a constant such as 100000000 for the original formulation.
+Attacker types with identical payoffs are always merged into one, and
+--presolve also drops duplicate and dominated attacks (see presolve.py); the
+reduction is printed and the result is still reported for every attacker
+type and attack of the input.
+--hint-store keeps the last solution of every input in DIR and hands it to
+the solver as a starting solution the next time the input is solved.
+--heuristic scores the uniform mix, every pure configuration and a local
+search on the simplex first (see heuristics.py) and gives the best one to
+the solver as starting solution and objective cutoff.
+
 ------ Input file ------
 No. of defender strategies (X)
 No. of attackers (L)
@@ -58,113 +73,52 @@ No. of attackers (L)
 |----------------------------------------
 """
 
-# Add defender strategies to the model
-X = int(f.readline())
-x = []
-for i in range(X):
-    n = "x-" + str(i)
-    x.append(solver.NumVar(0, 1, n))
-
-# Add defender strategy constraints: sum of x[i] = 1
-solver.Add(sum(x[i] for i in range(X)) == 1)
-
-""" Start processing for attacker types """
-
-L = int(f.readline())
-M = 100000000
-infinity = solver.infinity()
-
-# Objective function (linear after substitution with z variables)
-objective = solver.Objective()
-
-for l in range(L):
-
-    # Probability of l-th attacker
-    v = f.readline().strip()
-    p = float(v)
-
-    # Add l-th attacker info to the model
-    Q = int(f.readline())
-    q = []
-    cve_names = f.readline().strip().split("|")
-    for j in range(Q):
-        n = str(l) + "-" + cve_names[j]
-        q.append(solver.IntVar(0, 1, n))
-
-    a = solver.NumVar(-infinity, infinity, "a-" + str(l))
-
-    # Get reward for attacker and defender
-    R = []
-    C = []
-    for i in range(X):
-        rewards = f.readline().split()
-        r = []
-        c = []
-        for j in range(Q):
-            r_and_c = rewards[j].split(",")
-            r.append(r_and_c[0])
-            c.append(r_and_c[1])
-        R.append(r)
-        C.append(c)
-
-    # Linearize x[i] * q[j] using auxiliary variables z[i][j]
-    # McCormick envelope for product of continuous [0,1] and binary {0,1}
-    z = []
-    for i in range(X):
-        z_row = []
-        for j in range(Q):
-            z_name = "z-" + str(l) + "-" + str(i) + "-" + str(j)
-            z_ij = solver.NumVar(0, 1, z_name)
-
-            # z[i][j] <= x[i]
-            solver.Add(z_ij <= x[i])
-            # z[i][j] <= q[j]
-            solver.Add(z_ij <= q[j])
-            # z[i][j] >= x[i] + q[j] - 1
-            solver.Add(z_ij >= x[i] + q[j] - 1)
-
-            z_row.append(z_ij)
-        z.append(z_row)
-
-    # Update objective function: sum of p * R[i][j] * z[i][j]
-    for i in range(X):
-        for j in range(Q):
-            coef = p * float(R[i][j])
-            objective.SetCoefficient(z[i][j], coef)
-
-    # Add constraints to make attacker have a pure strategy: sum of q[j] = 1
-    solver.Add(sum(q[j] for j in range(Q)) == 1)
-
-    # Add constraints to make attacker select dominant pure strategy
-    for j in range(Q):
-        # a - sum(C[i][j] * x[i]) >= 0
-        solver.Add(a - sum(float(C[i][j]) * x[i] for i in range(X)) >= 0)
-        # a - sum(C[i][j] * x[i]) <= (1 - q[j]) * M
-        solver.Add(a - sum(float(C[i][j]) * x[i] for i in range(X)) <= (1 - q[j]) * M)
-
-f.close()
-
-# Set objective to maximize
-objective.SetMaximization()
-
-# Solve
-status = solver.Solve()
-
 
 # Print out values
 def printSeperator():
     print("---------------")
 
 
-if status == pywraplp.Solver.OPTIMAL:
-    printSeperator()
-    for var in solver.variables():
-        # Only print x and q variables (skip auxiliary z variables)
-        if not var.name().startswith("z-"):
-            print("%s -> %g" % (var.name(), var.solution_value()))
-
-    printSeperator()
-    print("Obj -> %g" % solver.Objective().Value())
-    printSeperator()
-else:
-    print("The problem does not have an optimal solution. Status:", status)
+def printResult(result):
+    if result.has_solution:
+        print("Status:", result.status)
+        printSeperator()
+        for name, value in result.variables():
+            print("%s -> %g" % (name, value))
+
+        printSeperator()
+        print("Obj -> %g" % result.objective)
+        printSeperator()
+    else:
+        print("The problem does not have a solution. Status:", result.status)
+
+
+def parseArgs():
+    parser = argparse.ArgumentParser(description="Solve a Bayesian Stackelberg game with DOBSS.")
+    parser.add_argument("input_file")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="scip")
+    parser.add_argument("--bulk", action="store_const", const="scip-bulk", dest="backend")
+    parser.add_argument("--time-limit", type=float, default=None)
+    parser.add_argument("--big-m", default="tight")
+    parser.add_argument("--presolve", action="store_true")
+    parser.add_argument("--hint-store", default=None)
+    parser.add_argument("--heuristic", action="store_true")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parseArgs()
+    game = load_game(args.input_file)
+    big_m = args.big_m if args.big_m == "tight" else float(args.big_m)
+    options = {
+        "time_limit": args.time_limit,
+        "big_m": big_m,
+        "presolve": args.presolve,
+        "hint_store": args.hint_store,
+        "heuristic": args.heuristic,
+    }
+    presolve = Presolve(game, drop_columns=args.presolve)
+    if presolve.reduced:
+        print(presolve.summary())
+    result = solve_dobss(game, backend=args.backend, options=options)
+    printResult(result)
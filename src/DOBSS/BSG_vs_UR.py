@@ -11,8 +11,15 @@
 #       x[i] >= 0
 #       For each l, q[l][j] binary
 #       a[l] is Real
+#
+# The uniform random defender (x[i] = 1/X) needs no model: every attacker
+# type best responds to it (see evaluation.py).
 
 from gurobipy import *
+from evaluation import evaluate_strategies, uniform_strategy
+from dobss_model import big_m_values
+from game_loader import load_game
+import sys
 
 __author__ = "Sailik Sengupta"
 __version__ = "1.0"
@@ -22,9 +29,8 @@ try:
 
     # Create a new model
     m = Model("MIQP")
-    m_ur = Model("MIQP_UR")
 
-    f = open(sys.argv[1], "r")
+    game = load_game(sys.argv[1])
     """
     ------ Input file ------
     No. of defender strategies (X)
@@ -51,13 +57,12 @@ try:
     """
 
     # Add defender stategies to the model
-    X = int(f.readline())
+    X = game.X
     x = []
     for i in range(X):
         n = "x-" + str(i)
         x.append(m.addVar(lb=0, ub=1, vtype=GRB.CONTINUOUS, name=n))
     m.update()
-    xr = 1.0 / len(x)
 
     # Add defender stategy constraints
     con = LinExpr()
@@ -67,92 +72,66 @@ try:
 
     """ Start processing for attacker types """
 
-    L = int(f.readline())
+    L = game.L
     obj = QuadExpr()
-    obj_ur = LinExpr()
-    M = 100000000
 
     for l in range(L):
 
         # Probability of l-th attacker
-        p = float(f.readline())
+        p = float(game.p[l])
 
         # Add l-th attacker info to the model
-        Q = int(f.readline())
+        Q = game.Q[l]
         q = []
-        q_ur = []
-        cve_names = f.readline().split("|")
+        cve_names = game.cve_names[l]
         for i in range(Q):
             n = cve_names[i]
             q.append(m.addVar(lb=0, ub=1, vtype=GRB.INTEGER, name=n))
-            q_ur.append(m_ur.addVar(lb=0, ub=1, vtype=GRB.INTEGER, name=n))
 
+        # Per-column big-M and bounds of a from the attacker payoffs
+        M, (a_lb, a_ub) = big_m_values(game.C[l])
         a = m.addVar(
-            lb=-GRB.INFINITY, ub=GRB.INFINITY, vtype=GRB.CONTINUOUS, name="a-" + str(l)
-        )
-        a_ur = m_ur.addVar(
-            lb=-GRB.INFINITY,
-            ub=GRB.INFINITY,
+            lb=max(a_lb, -GRB.INFINITY),
+            ub=min(a_ub, GRB.INFINITY),
             vtype=GRB.CONTINUOUS,
-            name="a_ur-" + str(l),
+            name="a-" + str(l),
         )
 
         m.update()
-        m_ur.update()
 
-        # Get reward for attacker and defender
-        R = []
-        C = []
-        for i in range(X):
-            rewards = f.readline().split()
-            r = []
-            c = []
-            for j in range(Q):
-                r_and_c = rewards[j].split(",")
-                r.append(r_and_c[0])
-                c.append(r_and_c[1])
-            R.append(r)
-            C.append(c)
+        # Reward for defender and attacker (already converted to floats)
+        R = game.R[l].tolist()
+        C = game.C[l].tolist()
 
         # Update objective function
         for i in range(X):
             for j in range(Q):
-                r = p * float(R[i][j])
+                r = p * R[i][j]
                 obj.add(r * x[i] * q[j])
-                obj_ur.add(r * xr * q_ur[j])
 
         # Add constraints to make attaker have a pure strategy
         con = LinExpr()
-        con_ur = LinExpr()
         for j in range(Q):
             con.add(q[j])
-            con_ur.add(q_ur[j])
         m.addConstr(con == 1)
-        m_ur.addConstr(con_ur == 1)
 
         # Add constrains to make attacker select dominant pure strategy
         for j in range(Q):
             val = LinExpr()
             val.add(a)
-            val_ur = LinExpr()
-            val_ur.add(a_ur)
-            val_sub = 0.0
             for i in range(X):
-                val.add(float(C[i][j]) * x[i], -1.0)
-                val_sub += float(C[i][j]) * xr
+                val.add(C[i][j] * x[i], -1.0)
             m.addConstr(val >= 0)
-            m.addConstr(val <= (1 - q[j]) * M)
-            val_ur.add(val_sub, -1.0)
-            m_ur.addConstr(val_ur >= 0)
-            m_ur.addConstr(val_ur <= (1 - q_ur[j]) * M)
+            m.addConstr(val <= (1 - q[j]) * float(M[j]))
 
     # Set objective funcion as all attackers have now been considered
     m.setObjective(obj, GRB.MAXIMIZE)
-    m_ur.setObjective(obj_ur, GRB.MAXIMIZE)
 
     # Solve MIQP
     m.optimize()
-    m_ur.optimize()
+
+    # Evaluate the uniform random defender
+    ur = evaluate_strategies(game, uniform_strategy(game))
 
     # Print out values
     def printSeperator():
@@ -167,14 +146,14 @@ try:
     printSeperator()
 
     printSeperator()
-    for v in m_ur.getVars():
-        print("%s -> %g" % (v.varName, v.x))
+    for l in range(L):
+        for j, n in enumerate(game.cve_names[l]):
+            print("%s -> %g" % (n, 1 if ur.responses[0, l] == j else 0))
+        print("%s -> %g" % ("a_ur-" + str(l), ur.attacker[0, l]))
 
     printSeperator()
-    print("Obj -> %g" % m_ur.objVal)
+    print("Obj -> %g" % ur.defender[0])
     printSeperator()
 
 except GurobiError:
     print("Error reported")
-    # m_ur.computeIIS();
-    # m_ur.write("model.ilp");
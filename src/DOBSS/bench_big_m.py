@@ -0,0 +1,45 @@
+#!/usr/bin/python
+
+"""
+Compares the tight per-column big-M formulation with the original constant
+M = 100000000 on the given games (SCIP nodes, solve time and objective).
+
+Usage: python bench_big_m.py [input_file ...]
+"""
+
+from bench_model_build import random_game
+from dobss import DobssModel
+from dobss_model import M
+from game_loader import load_game
+import sys
+import time
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+
+def run(game, big_m):
+    model = DobssModel(game, {"big_m": big_m})
+    start = time.perf_counter()
+    result = model.solve()
+    return result, model.solver.nodes(), time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    games = [(path, load_game(path)) for path in sys.argv[1:]]
+    if not games:
+        games = [
+            (path, load_game(path))
+            for path in ("input.txt", "mtd_webapps_input", "mtd_neuralnets_input")
+        ]
+        games.append(("random X=8 L=4 Q=50", random_game(8, 4, 50)))
+
+    print("%-24s %-10s %8s %10s %12s" % ("game", "big-M", "nodes", "time (s)", "objective"))
+    for name, game in games:
+        for big_m in ("tight", M):
+            result, nodes, seconds = run(game, big_m)
+            print(
+                "%-24s %-10s %8d %10.3f %12.6g"
+                % (name[:24], "tight" if big_m == "tight" else "%g" % big_m, nodes, seconds, result.objective)
+            )
@@ -0,0 +1,59 @@
+#!/usr/bin/python
+
+"""
+Benchmarks building the OR-Tools DOBSS MILP element by element
+(build_loop_model) against the NumPy/sparse path (build_bulk_model) on
+random games with hundreds of attacks per attacker type.
+
+Usage: python bench_model_build.py [X] [L] [Q] [repeats]
+"""
+
+from ortools.linear_solver import pywraplp
+from dobss_model import build_bulk_model, build_loop_model
+from game_loader import BayesianGame
+import numpy as np
+import sys
+import time
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+
+def random_game(X, L, Q, seed=0):
+    """Random game with L types of Q attacks and one-decimal payoffs."""
+    rng = np.random.default_rng(seed)
+    p = rng.dirichlet(np.ones(L))
+    R = [np.round(rng.uniform(-10, 0, (X, Q)), 1) for l in range(L)]
+    C = [np.round(rng.uniform(0, 10, (X, Q)), 1) for l in range(L)]
+    cve_names = [["CVE-%d-%d" % (l, j) for j in range(Q)] for l in range(L)]
+    return BayesianGame(X, p, R, C, cve_names)
+
+
+def time_build(build, repeats):
+    best = float("inf")
+    for r in range(repeats):
+        start = time.perf_counter()
+        build()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def build_loop(game):
+    solver = pywraplp.Solver.CreateSolver("SCIP")
+    build_loop_model(solver, game)
+    return solver
+
+
+if __name__ == "__main__":
+    X = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    L = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    repeats = int(sys.argv[4]) if len(sys.argv) > 4 else 3
+    Qs = [int(sys.argv[3])] if len(sys.argv) > 3 else [100, 300, 1000]
+
+    print("%6s %4s %6s %12s %12s %8s" % ("X", "L", "Q", "loop (s)", "bulk (s)", "speedup"))
+    for Q in Qs:
+        game = random_game(X, L, Q)
+        t_loop = time_build(lambda: build_loop(game), repeats)
+        t_bulk = time_build(lambda: build_bulk_model(game), repeats)
+        print("%6d %4d %6d %12.4f %12.4f %7.1fx" % (X, L, Q, t_loop, t_bulk, t_loop / t_bulk))
@@ -0,0 +1,60 @@
+#!/usr/bin/python
+
+"""
+Measures what a warm start buys when a game is re-solved with slightly
+different priors: SCIP nodes and solve time without and with the previous
+solution as a hint, and the objective of the incumbent found within a short
+time limit (None means no solution was found in time).
+
+Usage: python bench_warm_start.py [input_file ...]
+"""
+
+from bench_model_build import random_game
+from dobss import DobssModel, solve_dobss
+from game_loader import BayesianGame, load_game
+import numpy as np
+import sys
+import time
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+SHORT_LIMIT = 0.5
+
+
+def shifted_priors(game, seed=1):
+    """The game with its priors moved by up to 20% and renormalized."""
+    rng = np.random.default_rng(seed)
+    p = game.p * rng.uniform(0.8, 1.2, game.L)
+    return BayesianGame(game.X, p / p.sum(), game.R, game.C, game.cve_names, game.cost, game.source)
+
+
+def run(game, options):
+    model = DobssModel(game, options)
+    start = time.perf_counter()
+    result = model.solve()
+    return result, model.solver.nodes(), time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    games = [(path, load_game(path)) for path in sys.argv[1:]]
+    if not games:
+        games = [(path, load_game(path)) for path in ("input.txt", "mtd_webapps_input")]
+        games.append(("random X=8 L=4 Q=50", random_game(8, 4, 50)))
+
+    print(
+        "%-24s %-5s %8s %10s %12s %14s"
+        % ("game", "start", "nodes", "time (s)", "objective", "at %gs" % SHORT_LIMIT)
+    )
+    for name, game in games:
+        previous = solve_dobss(game)
+        game = shifted_priors(game)
+        for start, hint in (("cold", None), ("warm", previous)):
+            result, nodes, seconds = run(game, {"hint": hint})
+            early, _, _ = run(game, {"hint": hint, "time_limit": SHORT_LIMIT})
+            early = "%.6g" % early.objective if early.has_solution else "None"
+            print(
+                "%-24s %-5s %8d %10.3f %12.6g %14s"
+                % (name[:24], start, nodes, seconds, result.objective, early)
+            )
@@ -0,0 +1,79 @@
+#!/usr/bin/python
+
+"""
+Scores the SSE, uniform random, pure and maximin defender policies (and any
+strategies given with --x) of one or more games, and prints a table with the
+defender utility and the defender and attacker utilities per attacker type.
+Each game is read once and solved once (for the SSE); the other policies are
+evaluated in one vectorized batch (see policies.py).
+
+Usage: python compare_policies.py <input_file> [<input_file> ...]
+           [--x 0.5,0.5,0,0 ...] [--no-pure] [--backend scip] [--csv]
+"""
+
+from dobss import BACKENDS
+from game_loader import load_game
+from policies import baseline_policies, compare_policies
+import argparse
+import csv
+import sys
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+
+def parseArgs():
+    parser = argparse.ArgumentParser(description="Compare defender policies of Bayesian Stackelberg games.")
+    parser.add_argument("input_files", nargs="+")
+    parser.add_argument(
+        "--x",
+        action="append",
+        default=[],
+        help="comma separated defender strategy to score, may be repeated",
+    )
+    parser.add_argument("--no-pure", action="store_true", help="leave out the pure strategies")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="scip")
+    parser.add_argument("--csv", action="store_true", help="print comma separated values")
+    return parser.parse_args()
+
+
+def tableRows(path, game, rows):
+    """One line per policy and attacker type."""
+    for row in rows:
+        for l in range(game.L):
+            yield [
+                path,
+                row["name"],
+                "%.6g" % row["defender"],
+                l,
+                "%g" % game.p[l],
+                row["responses"][l],
+                "%.6g" % row["type_defender"][l],
+                "%.6g" % row["attacker"][l],
+            ]
+
+
+HEADER = ["game", "policy", "defender", "type", "p", "response", "type defender", "attacker"]
+
+
+if __name__ == "__main__":
+    args = parseArgs()
+    writer = csv.writer(sys.stdout) if args.csv else None
+    if writer:
+        writer.writerow(HEADER)
+    for path in args.input_files:
+        game = load_game(path)
+        policies = baseline_policies(game, args.backend, pure=not args.no_pure)
+        for n, x in enumerate(args.x):
+            policies.append(("x-%d" % n, [float(v) for v in x.split(",")]))
+        rows = compare_policies(game, policies)
+        if writer:
+            writer.writerows(tableRows(path, game, rows))
+            continue
+
+        print("%s" % path)
+        print("%-10s %12s %5s %6s %-24s %14s %10s" % tuple(HEADER[1:]))
+        for line in tableRows(path, game, rows):
+            print("%-10s %12s %5s %6s %-24s %14s %10s" % tuple(line[1:]))
+        print("")
@@ -0,0 +1,49 @@
+#!/usr/bin/python
+
+"""
+Converts a text game file into the memory-mappable binary format read by
+game_loader.load_game.
+
+Usage:
+    python convert_game.py <input_file> <output_file> [--switch-cost]
+
+Pass --switch-cost for switch-cost games (e.g. cost_BSSG_input.txt) so that
+the X * X switching cost matrix (or the EDGES list) is stored as well.
+"""
+
+from game_loader import load_game, write_binary_game
+import argparse
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+
+def parseArgs():
+    parser = argparse.ArgumentParser(
+        description="Convert a text game file to the binary format.", allow_abbrev=False
+    )
+    parser.add_argument("input_file")
+    parser.add_argument("output_file")
+    parser.add_argument(
+        "--switch-cost",
+        action="store_true",
+        help="the game has a switching cost matrix (or EDGES list)",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parseArgs()
+    game = load_game(args.input_file, switch_cost=args.switch_cost)
+    write_binary_game(game, args.output_file)
+    print(
+        "Wrote %s: X = %d, L = %d, Q = %s%s"
+        % (
+            args.output_file,
+            game.X,
+            game.L,
+            game.Q,
+            ", with switching costs" if game.cost is not None else "",
+        )
+    )
@@ -0,0 +1,415 @@
+#!/usr/bin/python
+
+"""
+Library entry point for solving the DOBSS MILP of a Bayesian Stackelberg
+game in-process:
+
+    from game_loader import load_game
+    from dobss import solve_dobss
+
+    result = solve_dobss(load_game("input.txt"), backend="scip")
+    print(result.objective, result.x, result.responses)
+
+Backends:
+    scip       -- pywraplp SCIP model built element by element
+    scip-bulk  -- ModelBuilder SCIP model built from one sparse matrix
+    gurobi     -- Gurobi MIQP (needs gurobipy and a license)
+    multiple-lps -- one LP per attacker response profile with pruning; fast
+                  for one attacker type or few types with few attacks
+
+Options (all optional):
+    big_m      -- "tight" (default) for per-column big-M values computed from
+                  the attacker payoffs and bounded a variables, or a number
+                  used in every best-response row (the original 100000000)
+    time_limit -- time limit in seconds
+    verbose    -- print the solver log
+    presolve   -- drop duplicate and dominated attacks before building the
+                  model (see presolve.py); results use the original columns
+    merge_types -- merge attacker types with identical payoffs (default True)
+    hint       -- an earlier DobssResult (or warm_start.Hint) handed to the
+                  solver as a starting solution, even if it was found for a
+                  slightly different game (see warm_start.py)
+    heuristic  -- seed the solver with the best mix found by heuristics.py as
+                  its starting solution and objective cutoff; its result is
+                  returned if the solver finds nothing better in time
+    hint_store -- directory keeping the last solution of every game; it is
+                  used as the hint when none is given and updated after
+                  every solve
+"""
+
+from ortools.linear_solver import pywraplp
+from ortools.linear_solver.python import model_builder
+from dobss_model import big_m_values, build_bulk_model, build_loop_model
+from dobss_result import DobssResult
+from multiple_lps import MultipleLPsModel
+from presolve import build_presolved
+from heuristics import heuristic_result
+from warm_start import HintStore, hint_values
+import numpy as np
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+DEFAULT_OPTIONS = {
+    "big_m": "tight",
+    "time_limit": None,
+    "verbose": False,
+    "presolve": False,
+    "merge_types": True,
+    "hint": None,
+    "hint_store": None,
+    "heuristic": False,
+}
+
+
+def cutoff_value(incumbent):
+    """Objective cutoff for a heuristic incumbent, a little below its value."""
+    return incumbent.objective - 1e-6 * max(1.0, abs(incumbent.objective))
+
+
+def heuristic_incumbent(game, options):
+    """The heuristic result of game if the heuristic option is set, else None."""
+    if not options.get("heuristic"):
+        return None
+    return heuristic_result(game)
+
+
+_PYWRAPLP_STATUS = {
+    pywraplp.Solver.OPTIMAL: "OPTIMAL",
+    pywraplp.Solver.FEASIBLE: "FEASIBLE",
+    pywraplp.Solver.INFEASIBLE: "INFEASIBLE",
+    pywraplp.Solver.UNBOUNDED: "UNBOUNDED",
+    pywraplp.Solver.ABNORMAL: "ABNORMAL",
+    pywraplp.Solver.NOT_SOLVED: "NOT_SOLVED",
+}
+
+
+class DobssModel(object):
+    """
+    The DOBSS MILP of a game, built once in a pywraplp SCIP solver.
+
+    fix_attacks() takes attacks out of the model without rebuilding it, so
+    one model can be re-solved for many sets of patched CVEs; set_priors()
+    likewise moves it to other attacker type priors.
+    """
+
+    def __init__(self, game, options=None):
+        self.game = game
+        self.options = dict(DEFAULT_OPTIONS, **(options or {}))
+        self.solver = pywraplp.Solver.CreateSolver("SCIP")
+        if not self.solver:
+            raise RuntimeError("Could not create SCIP solver")
+        self.br_rows = []
+        self.z = []
+        self.x, self.q, self.a = build_loop_model(
+            self.solver, game, self.options["big_m"], br_rows=self.br_rows, z_vars=self.z
+        )
+        self.cutoff = None
+        self.a_lb = [a.lb() for a in self.a]
+        self.fixed = []
+        self.kept = None
+
+    def fix_attacks(self, invalidAttacks, substring=False):
+        """
+        Takes out the columns of invalidAttacks (as BayesianGame.remove_attacks
+        does): their q is clamped to 0 and both best-response rows are
+        relaxed. Undoes any earlier fix first.
+        """
+        self.restore_attacks()
+        infinity = self.solver.infinity()
+        self.kept = []
+        for l, removed in enumerate(self.game.removed_columns(invalidAttacks, substring)):
+            for j in removed:
+                lower, upper = self.br_rows[l][j]
+                self.fixed.append((self.q[l][j], lower, upper, upper.ub()))
+                self.q[l][j].SetUb(0)
+                lower.SetLb(-infinity)
+                upper.SetUb(infinity)
+            removed = set(removed)
+            kept = [j for j in range(self.game.Q[l]) if j not in removed]
+            self.kept.append(kept)
+
+            # a[l] may not lie above the payoff of the attacks that are left
+            if kept and removed:
+                _, (a_lb, a_ub) = big_m_values(self.game.C[l][:, kept], self.options["big_m"])
+                self.a[l].SetLb(max(min(a_lb, self.a_lb[l]), -infinity))
+        self.fixed_game = self.game.remove_attacks(invalidAttacks, substring)
+
+    def set_priors(self, p):
+        """
+        Moves the model to attacker type priors p: only the objective
+        coefficients p[l] * R[l][i][j] of the z variables are rewritten.
+        A cutoff row is rewritten too and switched off.
+        """
+        objective = self.solver.Objective()
+        for l, z in enumerate(self.z):
+            coefs = (float(p[l]) * self.game.R[l]).tolist()
+            for i, z_row in enumerate(z):
+                for j, z_ij in enumerate(z_row):
+                    objective.SetCoefficient(z_ij, coefs[i][j])
+                    if self.cutoff is not None:
+                        self.cutoff.SetCoefficient(z_ij, coefs[i][j])
+        if self.cutoff is not None:
+            self.cutoff.SetLb(-self.solver.infinity())
+        self.game = self.game.with_priors(p)
+        if self.kept is not None:
+            self.fixed_game = self.fixed_game.with_priors(p)
+
+    def restore_attacks(self):
+        """Puts back the attacks taken out by fix_attacks."""
+        for q, lower, upper, ub in self.fixed:
+            q.SetUb(1)
+            lower.SetLb(0)
+            upper.SetUb(ub)
+        self.fixed = []
+        for a, lb in zip(self.a, self.a_lb):
+            a.SetLb(lb)
+        self.kept = None
+
+    def active_game(self):
+        """The game without the attacks taken out by fix_attacks."""
+        return self.game if self.kept is None else self.fixed_game
+
+    def expand(self, result):
+        """Result for active_game() expressed in the columns of the game."""
+        if self.kept is None or result.q is None:
+            return result
+        full = DobssResult(self.game, result.status, result.objective, result.x, [], result.a)
+        for l, q_l in enumerate(result.q):
+            q = np.zeros(self.game.Q[l], dtype=int)
+            q[self.kept[l]] = q_l
+            full.q.append(q)
+        full.responses = np.array(
+            [self.kept[l][j] for l, j in enumerate(result.responses)], dtype=int
+        )
+        full.stats = result.stats
+        return full
+
+    def incumbent(self):
+        """Heuristic solution used as starting point and cutoff, or None."""
+        incumbent = heuristic_incumbent(self.active_game(), self.options)
+        return incumbent and self.expand(incumbent)
+
+    def set_cutoff(self, value):
+        """Adds (or moves) the row objective >= value."""
+        solver = self.solver
+        objective = solver.Objective()
+        if self.cutoff is None:
+            self.cutoff = solver.Constraint(-solver.infinity(), solver.infinity())
+            for v in solver.variables():
+                coef = objective.GetCoefficient(v)
+                if coef != 0:
+                    self.cutoff.SetCoefficient(v, coef)
+        self.cutoff.SetLb(value - objective.offset())
+
+    def solve(self):
+        solver = self.solver
+        if self.options["verbose"]:
+            solver.EnableOutput()
+        if self.options["time_limit"] is not None:
+            solver.SetTimeLimit(int(1000 * self.options["time_limit"]))
+        incumbent = self.incumbent()
+        if incumbent is not None:
+            self.set_cutoff(cutoff_value(incumbent))
+        hint = hint_values(self.active_game(), self.options["hint"] or incumbent)
+        if hint is not None:
+            x, q, a = hint
+            if self.kept is not None:
+                q = [np.bincount(self.kept[l], q[l], self.game.Q[l]) for l in range(self.game.L)]
+            variables = list(self.x) + [v for q_l in self.q for v in q_l] + list(self.a)
+            values = np.concatenate([x] + q + [a]).astype(float).tolist()
+            solver.SetHint(variables, values)
+
+        status = _PYWRAPLP_STATUS.get(solver.Solve(), "ABNORMAL")
+        if status not in ("OPTIMAL", "FEASIBLE"):
+            return incumbent or DobssResult(self.game, status)
+
+        return DobssResult(
+            self.game,
+            status,
+            solver.Objective().Value(),
+            np.array([v.solution_value() for v in self.x]),
+            [np.array([round(v.solution_value()) for v in q], dtype=int) for q in self.q],
+            np.array([v.solution_value() for v in self.a]),
+        )
+
+
+class BulkDobssModel(object):
+    """The DOBSS MILP of a game, built from one sparse matrix in ModelBuilder."""
+
+    def __init__(self, game, options=None):
+        self.game = game
+        self.options = dict(DEFAULT_OPTIONS, **(options or {}))
+        self.model, self.arrays = build_bulk_model(game, self.options["big_m"])
+        self.cutoff = None
+
+    def set_cutoff(self, value):
+        """Adds (or moves) the row objective >= value."""
+        if self.cutoff is None:
+            columns = np.flatnonzero(self.arrays.objective)
+            self.cutoff = self.model.add(
+                model_builder.LinearExpr.weighted_sum(
+                    [self.model.var_from_index(int(i)) for i in columns],
+                    self.arrays.objective[columns].tolist(),
+                )
+                >= value
+            )
+        self.cutoff.lower_bound = value
+
+    def solve(self):
+        solver = model_builder.Solver("SCIP")
+        if self.options["verbose"]:
+            solver.enable_output(True)
+        if self.options["time_limit"] is not None:
+            solver.set_time_limit_in_seconds(self.options["time_limit"])
+        self.model.clear_hints()
+        incumbent = heuristic_incumbent(self.game, self.options)
+        if incumbent is not None:
+            self.set_cutoff(cutoff_value(incumbent))
+        hint = hint_values(self.game, self.options["hint"] or incumbent)
+        if hint is not None:
+            # The z variables are x[i] * q[j], so the whole solution is hinted
+            x, q, a = hint
+            arrays = self.arrays
+            values = np.zeros(self.model.num_variables)
+            values[arrays.x_index] = x
+            for l in range(self.game.L):
+                values[arrays.q_index[l]] = q[l]
+                values[arrays.a_index[l]] = a[l]
+                values[arrays.z_index[l]] = np.outer(x, q[l])
+            for index, value in enumerate(values.tolist()):
+                self.model.add_hint(self.model.var_from_index(index), value)
+
+        status = solver.solve(self.model).name
+        if status not in ("OPTIMAL", "FEASIBLE"):
+            return incumbent or DobssResult(self.game, status)
+
+        values = solver.values(self.model.get_variables()).values
+        arrays = self.arrays
+        return DobssResult(
+            self.game,
+            status,
+            solver.objective_value,
+            values[arrays.x_index],
+            [np.rint(values[q]).astype(int) for q in arrays.q_index],
+            values[arrays.a_index],
+        )
+
+
+class GurobiDobssModel(object):
+    """The DOBSS MIQP of BSG_miqp.py, built in Gurobi."""
+
+    def __init__(self, game, options=None):
+        import gurobipy
+
+        self.gp = gurobipy
+        GRB = gurobipy.GRB
+        self.game = game
+        self.options = dict(DEFAULT_OPTIONS, **(options or {}))
+        m = gurobipy.Model("MIQP")
+        m.setParam("OutputFlag", bool(self.options["verbose"]))
+        X = game.X
+        x = [m.addVar(lb=0, ub=1, vtype=GRB.CONTINUOUS, name="x-" + str(i)) for i in range(X)]
+        m.addConstr(gurobipy.quicksum(x) == 1)
+
+        obj = gurobipy.QuadExpr()
+        self.q = []
+        self.a = []
+        for l in range(game.L):
+            p = float(game.p[l])
+            R = game.R[l].tolist()
+            C = game.C[l].tolist()
+            q = [
+                m.addVar(lb=0, ub=1, vtype=GRB.BINARY, name=str(l) + "-" + name)
+                for name in game.cve_names[l]
+            ]
+            M, (a_lb, a_ub) = big_m_values(game.C[l], self.options["big_m"])
+            a = m.addVar(
+                lb=max(a_lb, -GRB.INFINITY),
+                ub=min(a_ub, GRB.INFINITY),
+                vtype=GRB.CONTINUOUS,
+                name="a-" + str(l),
+            )
+
+            for i in range(X):
+                for j in range(len(q)):
+                    obj.add(p * R[i][j] * x[i] * q[j])
+
+            m.addConstr(gurobipy.quicksum(q) == 1)
+            for j in range(len(q)):
+                val = a - gurobipy.quicksum(C[i][j] * x[i] for i in range(X))
+                m.addConstr(val >= 0)
+                m.addConstr(val <= (1 - q[j]) * float(M[j]))
+
+            self.q.append(q)
+            self.a.append(a)
+
+        m.setObjective(obj, GRB.MAXIMIZE)
+        self.model = m
+        self.x = x
+
+    def solve(self):
+        GRB = self.gp.GRB
+        m = self.model
+        if self.options["time_limit"] is not None:
+            m.setParam("TimeLimit", self.options["time_limit"])
+        incumbent = heuristic_incumbent(self.game, self.options)
+        if incumbent is not None:
+            m.setParam("Cutoff", cutoff_value(incumbent))
+        hint = hint_values(self.game, self.options["hint"] or incumbent)
+        if hint is not None:
+            x, q, a = hint
+            for v, value in zip(self.x, x):
+                v.Start = float(value)
+            for l in range(self.game.L):
+                for v, value in zip(self.q[l], q[l]):
+                    v.Start = float(value)
+                self.a[l].Start = float(a[l])
+        m.optimize()
+
+        if m.SolCount == 0:
+            status = "INFEASIBLE" if m.Status == GRB.INFEASIBLE else "NOT_SOLVED"
+            return incumbent or DobssResult(self.game, status)
+
+        return DobssResult(
+            self.game,
+            "OPTIMAL" if m.Status == GRB.OPTIMAL else "FEASIBLE",
+            m.ObjVal,
+            np.array([v.X for v in self.x]),
+            [np.array([round(v.X) for v in q], dtype=int) for q in self.q],
+            np.array([v.X for v in self.a]),
+        )
+
+
+BACKENDS = {
+    "scip": DobssModel,
+    "scip-bulk": BulkDobssModel,
+    "gurobi": GurobiDobssModel,
+    "multiple-lps": MultipleLPsModel,
+}
+
+
+def build_dobss(game, backend="scip", options=None):
+    """Builds the DOBSS model of game with the given backend."""
+    if backend not in BACKENDS:
+        raise ValueError(
+            "Unknown backend %r, expected one of %s" % (backend, ", ".join(sorted(BACKENDS)))
+        )
+    options = dict(DEFAULT_OPTIONS, **(options or {}))
+    return build_presolved(BACKENDS[backend], game, options)
+
+
+def solve_dobss(game, backend="scip", options=None):
+    """Builds and solves the DOBSS model of game; returns a DobssResult."""
+    options = dict(DEFAULT_OPTIONS, **(options or {}))
+    store = None
+    if options["hint_store"] is not None:
+        store = HintStore(options["hint_store"])
+        if options["hint"] is None:
+            options["hint"] = store.load(game)
+
+    result = build_dobss(game, backend, options).solve()
+    if store is not None:
+        store.save(game, result)
+    return result
@@ -0,0 +1,329 @@
+#!/usr/bin/python
+
+#   maximize
+#       p[l] * R[l][i][j] * z[l][i][j]
+#   subject to
+#       Sum x[i] = 1
+#       For each l & all i, j, z[l][i][j] <= x[i]
+#       For each l & all i, j, z[l][i][j] <= q[l][j]
+#       For each l & all i, j, z[l][i][j] >= x[i] + q[l][j] - 1
+#       For each l,  Sum q[l][j] = 1
+#       For each l & all j, 0 <= a[l] - C[l][i][j] * x[i]
+#       For each l & all j, a[l] - C[l][i][j] * x[i] <= (1-q[l][j])M[l][j]
+#       x[i], z[l][i][j] in [0, 1]
+#       For each l, q[l][j] binary
+#       a[l] is Real
+#
+# With big_m = "tight", M[l][j] = max_i (max_k C[l][i][k] - C[l][i][j]) is the
+# largest value a[l] - C[l][i][j] * x[i] can take over the simplex, and a[l]
+# is bounded by [max_k min_i C[l][i][k], max_i,k C[l][i][k]]. A number uses
+# that constant for every row and leaves a[l] free, as the original model did.
+#
+# Builders for the OR-Tools DOBSS MILP. build_loop_model adds the model one
+# element at a time through pywraplp (as BSG_miqp_ortools.py always did),
+# build_bulk_model assembles the same variables and rows as NumPy arrays and
+# hands them to ModelBuilder as one sparse matrix.
+
+from ortools.linear_solver.python import model_builder
+import numpy as np
+
+try:
+    import scipy.sparse
+except ImportError:
+    scipy = None
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+M = 100000000
+
+
+def big_m_values(C, big_m="tight"):
+    """
+    Returns the big-M of every column of the attacker payoff matrix C and
+    the (lower, upper) bounds of the attacker value a.
+    """
+    if big_m == "tight":
+        if C.shape[1] == 0:
+            return np.zeros(0), (-np.inf, np.inf)
+        M_col = (C.max(axis=1, keepdims=True) - C).max(axis=0)
+        return M_col, (float(C.min(axis=0).max()), float(C.max()))
+    return np.full(C.shape[1], float(big_m)), (-np.inf, np.inf)
+
+
+def build_loop_model(solver, game, big_m="tight", x=None, br_rows=None, z_vars=None):
+    """
+    Adds the DOBSS MILP of game to a pywraplp solver. Returns the x
+    variables and, per attacker type, its q variables and a variable.
+    Models that add their own terms on the defender strategy (e.g. the
+    switching cost model) can pass the x variables they created. If
+    br_rows is a list, the (lower, upper) best-response rows of every
+    attack are appended to it, one list per attacker type; likewise the
+    z variables (X lists of Q_l) are appended to z_vars.
+    """
+    X = game.X
+    if x is None:
+        x = []
+        for i in range(X):
+            n = "x-" + str(i)
+            x.append(solver.NumVar(0, 1, n))
+
+        # Add defender strategy constraints: sum of x[i] = 1
+        solver.Add(sum(x[i] for i in range(X)) == 1)
+
+    infinity = solver.infinity()
+
+    # Objective function (linear after substitution with z variables)
+    objective = solver.Objective()
+
+    q_all = []
+    a_all = []
+    for l in range(game.L):
+
+        # Probability of l-th attacker
+        p = float(game.p[l])
+
+        # Add l-th attacker info to the model
+        Q = game.Q[l]
+        q = []
+        cve_names = game.cve_names[l]
+        for j in range(Q):
+            n = str(l) + "-" + cve_names[j]
+            q.append(solver.IntVar(0, 1, n))
+
+        M_col, (a_lb, a_ub) = big_m_values(game.C[l], big_m)
+        a = solver.NumVar(max(a_lb, -infinity), min(a_ub, infinity), "a-" + str(l))
+
+        # Reward for defender and attacker (already converted to floats)
+        R = game.R[l].tolist()
+        C = game.C[l].tolist()
+        M = M_col.tolist()
+
+        # Linearize x[i] * q[j] using auxiliary variables z[i][j]
+        # McCormick envelope for product of continuous [0,1] and binary {0,1}
+        z = []
+        for i in range(X):
+            z_row = []
+            for j in range(Q):
+                z_name = "z-" + str(l) + "-" + str(i) + "-" + str(j)
+                z_ij = solver.NumVar(0, 1, z_name)
+
+                # z[i][j] <= x[i]
+                solver.Add(z_ij <= x[i])
+                # z[i][j] <= q[j]
+                solver.Add(z_ij <= q[j])
+                # z[i][j] >= x[i] + q[j] - 1
+                solver.Add(z_ij >= x[i] + q[j] - 1)
+
+                z_row.append(z_ij)
+            z.append(z_row)
+
+        # Update objective function: sum of p * R[i][j] * z[i][j]
+        for i in range(X):
+            for j in range(Q):
+                coef = p * R[i][j]
+                objective.SetCoefficient(z[i][j], coef)
+
+        # Add constraints to make attacker have a pure strategy: sum of q[j] = 1
+        solver.Add(sum(q[j] for j in range(Q)) == 1)
+
+        # Add constraints to make attacker select dominant pure strategy
+        rows = []
+        for j in range(Q):
+            val = a - sum(C[i][j] * x[i] for i in range(X))
+            # a - sum(C[i][j] * x[i]) >= 0
+            lower = solver.Add(val >= 0)
+            # a - sum(C[i][j] * x[i]) <= (1 - q[j]) * M[j]
+            upper = solver.Add(val <= (1 - q[j]) * M[j])
+            rows.append((lower, upper))
+        if br_rows is not None:
+            br_rows.append(rows)
+        if z_vars is not None:
+            z_vars.append(z)
+
+        q_all.append(q)
+        a_all.append(a)
+
+    # Set objective to maximize
+    objective.SetMaximization()
+
+    return x, q_all, a_all
+
+
+class DobssArrays(object):
+    """
+    The DOBSS MILP in matrix form, with the variables and rows in the order
+    build_loop_model creates them.
+
+    Variables are x (X), then for each type q (Q_l), a and z (X * Q_l,
+    row-major). x_index, q_index[l], a_index[l] and z_index[l] hold their
+    column positions; names holds the names of the x, q and a variables.
+    """
+
+    def __init__(self, game, big_m="tight"):
+        X = game.X
+        n_vars = X + sum(q + 1 + X * q for q in game.Q)
+        n_rows = 1 + sum(3 * X * q + 1 + 2 * q for q in game.Q)
+
+        self.var_lb = np.zeros(n_vars)
+        self.var_ub = np.ones(n_vars)
+        self.is_integer = np.zeros(n_vars, dtype=bool)
+        self.objective = np.zeros(n_vars)
+        self.row_lb = np.empty(n_rows)
+        self.row_ub = np.empty(n_rows)
+        self.names = {}
+
+        rows = []
+        cols = []
+        vals = []
+
+        self.x_index = np.arange(X)
+        for i in range(X):
+            self.names[i] = "x-" + str(i)
+
+        # Sum x[i] = 1
+        rows.append(np.zeros(X, dtype=np.int64))
+        cols.append(self.x_index)
+        vals.append(np.ones(X))
+        self.row_lb[0] = self.row_ub[0] = 1
+
+        self.q_index = []
+        self.a_index = []
+        self.z_index = []
+        var = X
+        row = 1
+        for l in range(game.L):
+            Q = game.Q[l]
+            q_idx = np.arange(var, var + Q)
+            a_idx = var + Q
+            z_idx = np.arange(a_idx + 1, a_idx + 1 + X * Q).reshape(X, Q)
+            var = a_idx + 1 + X * Q
+
+            M_col, (a_lb, a_ub) = big_m_values(game.C[l], big_m)
+            self.is_integer[q_idx] = True
+            self.var_lb[a_idx] = a_lb
+            self.var_ub[a_idx] = a_ub
+            for j in range(Q):
+                self.names[q_idx[j]] = str(l) + "-" + game.cve_names[l][j]
+            self.names[a_idx] = "a-" + str(l)
+            self.objective[z_idx] = float(game.p[l]) * game.R[l]
+
+            # McCormick rows, three per (i, j) in row-major order:
+            #   z[i][j] - x[i] <= 0
+            #   z[i][j] - q[j] <= 0
+            #   z[i][j] - x[i] - q[j] >= -1
+            n_z = X * Q
+            base = row + 3 * np.arange(n_z)
+            z_flat = z_idx.ravel()
+            x_of_z = np.repeat(self.x_index, Q)
+            q_of_z = np.tile(q_idx, X)
+            rows += [base, base, base + 1, base + 1, base + 2, base + 2, base + 2]
+            cols += [z_flat, x_of_z, z_flat, q_of_z, z_flat, x_of_z, q_of_z]
+            vals += [
+                np.ones(n_z),
+                -np.ones(n_z),
+                np.ones(n_z),
+                -np.ones(n_z),
+                np.ones(n_z),
+                -np.ones(n_z),
+                -np.ones(n_z),
+            ]
+            self.row_lb[base] = -np.inf
+            self.row_ub[base] = 0
+            self.row_lb[base + 1] = -np.inf
+            self.row_ub[base + 1] = 0
+            self.row_lb[base + 2] = -1
+            self.row_ub[base + 2] = np.inf
+            row += 3 * n_z
+
+            # Sum q[j] = 1
+            rows.append(np.full(Q, row))
+            cols.append(q_idx)
+            vals.append(np.ones(Q))
+            self.row_lb[row] = self.row_ub[row] = 1
+            row += 1
+
+            # Best response rows, two per j:
+            #   a - sum(C[i][j] * x[i]) >= 0
+            #   a - sum(C[i][j] * x[i]) + M[j] * q[j] <= M[j]
+            lower = row + 2 * np.arange(Q)
+            upper = lower + 1
+            rows += [lower, np.repeat(lower, X), upper, np.repeat(upper, X), upper]
+            cols += [
+                np.full(Q, a_idx),
+                np.tile(self.x_index, Q),
+                np.full(Q, a_idx),
+                np.tile(self.x_index, Q),
+                q_idx,
+            ]
+            minus_c = -game.C[l].T.ravel()
+            vals += [np.ones(Q), minus_c, np.ones(Q), minus_c, M_col]
+            self.row_lb[lower] = 0
+            self.row_ub[lower] = np.inf
+            self.row_lb[upper] = -np.inf
+            self.row_ub[upper] = M_col
+            row += 2 * Q
+
+            self.q_index.append(q_idx)
+            self.a_index.append(a_idx)
+            self.z_index.append(z_idx)
+
+        # Zero payoffs do not become matrix entries, as in the loop model
+        vals = np.concatenate(vals)
+        nonzero = vals != 0
+        self.rows = np.concatenate(rows)[nonzero]
+        self.cols = np.concatenate(cols)[nonzero]
+        self.vals = vals[nonzero]
+        self.shape = (n_rows, n_vars)
+
+
+def build_bulk_model(game, big_m="tight"):
+    """
+    Builds the DOBSS MILP of game as a ModelBuilder model from one sparse
+    constraint matrix. Returns the model and its DobssArrays.
+    """
+    arrays = DobssArrays(game, big_m)
+    model = model_builder.Model()
+    helper = model.helper
+
+    if scipy is not None:
+        matrix = scipy.sparse.csr_matrix(
+            (arrays.vals, (arrays.rows, arrays.cols)), shape=arrays.shape
+        )
+        helper.fill_model_from_sparse_data(
+            arrays.var_lb,
+            arrays.var_ub,
+            arrays.objective,
+            arrays.row_lb,
+            arrays.row_ub,
+            matrix,
+        )
+        for v in np.flatnonzero(arrays.is_integer):
+            helper.set_var_integrality(int(v), True)
+    else:
+        # Without SciPy, add the variables in one call and the rows one by one
+        helper.add_var_array_with_bounds(
+            arrays.var_lb, arrays.var_ub, arrays.is_integer, ""
+        )
+        helper.set_objective_coefficients(
+            list(range(arrays.shape[1])), arrays.objective.tolist()
+        )
+        order = np.argsort(arrays.rows, kind="stable")
+        starts = np.searchsorted(arrays.rows[order], np.arange(arrays.shape[0] + 1))
+        for r in range(arrays.shape[0]):
+            ct = helper.add_linear_constraint()
+            helper.set_constraint_lower_bound(ct, arrays.row_lb[r])
+            helper.set_constraint_upper_bound(ct, arrays.row_ub[r])
+            terms = order[starts[r] : starts[r + 1]]
+            helper.add_terms_to_constraint(
+                ct,
+                [model.var_from_index(int(v)) for v in arrays.cols[terms]],
+                arrays.vals[terms].tolist(),
+            )
+
+    helper.set_maximize(True)
+    for v, name in arrays.names.items():
+        helper.set_var_name(int(v), name)
+
+    return model, arrays
@@ -0,0 +1,60 @@
+#!/usr/bin/python
+
+"""
+Solution container shared by the DOBSS engines (see dobss.py).
+"""
+
+import numpy as np
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+
+class DobssResult(object):
+    """
+    Strong Stackelberg equilibrium of a game, as found by any DOBSS engine.
+
+    status     -- "OPTIMAL", "FEASIBLE", "INFEASIBLE", ...
+    objective  -- defender's expected utility, or None without a solution
+    x          -- float array (X,) with the defender's mixed strategy
+    q          -- list with one 0/1 array (Q_l,) per attacker type
+    a          -- float array (L,) with each type's expected utility
+    responses  -- int array (L,) with the attack index chosen by each type
+    stats      -- engine specific counters (e.g. LPs solved)
+    """
+
+    def __init__(self, game, status, objective=None, x=None, q=None, a=None):
+        self.game = game
+        self.stats = {}
+        self.status = status
+        self.objective = objective
+        self.x = x
+        self.q = q
+        self.a = a
+        self.responses = None
+        if q is not None:
+            self.responses = np.array([int(np.argmax(q_l)) for q_l in q], dtype=int)
+
+    @property
+    def optimal(self):
+        return self.status == "OPTIMAL"
+
+    @property
+    def has_solution(self):
+        return self.x is not None
+
+    def response_names(self):
+        """Name of the attack chosen by each attacker type."""
+        return [self.game.cve_names[l][j] for l, j in enumerate(self.responses)]
+
+    def variables(self):
+        """(name, value) of the x, q and a variables, as the CLIs print them."""
+        values = []
+        for i in range(self.game.X):
+            values.append(("x-" + str(i), self.x[i]))
+        for l in range(self.game.L):
+            for j, name in enumerate(self.game.cve_names[l]):
+                values.append((str(l) + "-" + name, self.q[l][j]))
+            values.append(("a-" + str(l), self.a[l]))
+        return values
@@ -0,0 +1,91 @@
+#!/usr/bin/python
+
+"""
+Evaluation of fixed defender strategies.
+
+Once x is fixed the DOBSS problem needs no solver: every attacker type plays
+a best response to x (ties broken in favour of the defender, as in the
+Strong Stackelberg equilibrium and the MILP with x fixed) and the defender
+gets the prior-weighted rewards of those responses. StrategyEvaluator does
+this for a batch of strategies at once, with the columns of all attacker
+types stacked into one matrix:
+
+    evaluator = StrategyEvaluator(game)
+    evaluation = evaluator.evaluate(xs)      # xs is (N, X)
+    evaluation.defender                      # (N,) defender utilities
+"""
+
+import numpy as np
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+# Attacker utilities within this of the best count as ties and are resolved
+# in the defender's favour. It matches the solvers' feasibility tolerance,
+# so strategies read from a MILP solution keep the responses it chose.
+TIE_TOLERANCE = 1e-6
+
+
+class Evaluation(object):
+    """
+    defender       -- float array (N,) with the defender utility of every x
+    type_defender  -- float array (N, L) with the defender reward per type
+    attacker       -- float array (N, L) with the attacker utility per type
+    responses      -- int array (N, L) with the attack chosen by every type
+    """
+
+    def __init__(self, defender, type_defender, attacker, responses):
+        self.defender = defender
+        self.type_defender = type_defender
+        self.attacker = attacker
+        self.responses = responses
+
+
+class StrategyEvaluator(object):
+    """
+    Evaluates batches of defender strategies of game. Attacks whose utility
+    is within tolerance of a type's best are ties, resolved in the
+    defender's favour.
+    """
+
+    def __init__(self, game, tolerance=TIE_TOLERANCE):
+        if game.L == 0 or min(game.Q) == 0:
+            raise ValueError("Every attacker type needs at least one attack")
+        self.game = game
+        self.tolerance = tolerance
+        self.offsets = np.concatenate(([0], np.cumsum(game.Q)[:-1])).astype(int)
+        self.R = np.hstack(game.R)
+        self.C = np.hstack(game.C)
+        self.type_of = np.repeat(np.arange(game.L), game.Q)
+
+    def evaluate(self, xs):
+        """Evaluation of every row of xs, an (N, X) array (or one x)."""
+        xs = np.atleast_2d(np.asarray(xs, dtype=np.float64))
+        attacker_all = xs @ self.C
+        defender_all = xs @ self.R
+
+        # Best responses per type, then the best of them for the defender
+        attacker = np.maximum.reduceat(attacker_all, self.offsets, axis=1)
+        best = attacker_all >= attacker[:, self.type_of] - self.tolerance
+        masked = np.where(best, defender_all, -np.inf)
+        type_defender = np.maximum.reduceat(masked, self.offsets, axis=1)
+
+        # First column of every type reaching both maxima
+        columns = np.arange(self.C.shape[1])
+        first = np.where(masked >= type_defender[:, self.type_of], columns, self.C.shape[1])
+        responses = np.minimum.reduceat(first, self.offsets, axis=1) - self.offsets
+        attacker = np.take_along_axis(attacker_all, responses + self.offsets, axis=1)
+
+        defender = type_defender @ self.game.p
+        return Evaluation(defender, type_defender, attacker, responses)
+
+
+def evaluate_strategies(game, xs, tolerance=TIE_TOLERANCE):
+    """StrategyEvaluator(game, tolerance).evaluate(xs)."""
+    return StrategyEvaluator(game, tolerance).evaluate(xs)
+
+
+def uniform_strategy(game):
+    """The uniform random defender strategy."""
+    return np.full(game.X, 1.0 / game.X)
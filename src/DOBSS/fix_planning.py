@@ -0,0 +1,204 @@
+#!/usr/bin/python
+
+#   The DOBSS MILP, where patching CVE c removes the attacks j that use it
+#   (see BayesianGame.removed_columns, as whatToFix does):
+#
+#   maximize
+#       p[l] * R[l][i][j] * z[l][i][j]
+#   subject to
+#       the DOBSS rows, with
+#       For each l & all j, a[l] - C[l][i][j] * x[i] + Mf[l][j] * Sum_{c in j} f[c] >= 0
+#       For each l & all j & c in j, q[l][j] <= 1 - f[c]
+#       Sum f[c] <= k
+#       f[c] in [0, 1]
+#
+# Mf[l][j] = max_i C[l][i][j] - min C[l] switches the best-response row of a
+# patched attack off; a[l] is bounded below by min C[l] since some attack of
+# every type stays. With binary f this is the patch budget problem; with
+# continuous f its optimum bounds the value of every patch set of size k,
+# which best_fix_sets uses to search patch sets best first. That bound is
+# still a MILP, since q stays binary; with lp_bound q is continuous too and
+# every bound is one LP, but the DOBSS LP relaxation is loose (on input.txt
+# it bounds no node below the best set), so the default keeps q binary.
+# solve_fix_budget solves the binary model, so one branch-and-bound tree
+# picks the patch set.
+
+from dobss import DobssModel, solve_dobss
+import heapq
+import numpy as np
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+TOLERANCE = 1e-6
+
+
+class FixPlanModel(DobssModel):
+    """
+    DobssModel with a patch variable f per candidate CVE and a budget on
+    how many are patched. set_node() fixes some patches and limits the rest,
+    so one model serves every step of the search. With integer f is binary,
+    with lp q is continuous too (the LP relaxation).
+    """
+
+    def __init__(self, game, candidates=None, options=None, integer=False, substring=False, lp=False):
+        DobssModel.__init__(self, game, options)
+        solver = self.solver
+        self.candidates = list(candidates if candidates is not None else game.attack_names())
+        self.integer = integer
+        if integer:
+            self.f = [solver.IntVar(0, 1, "fix-" + c) for c in self.candidates]
+        else:
+            self.f = [solver.NumVar(0, 1, "fix-" + c) for c in self.candidates]
+        if lp:
+            for q_l in self.q:
+                for v in q_l:
+                    v.SetInteger(False)
+
+        covering = {}
+        for n, c in enumerate(self.candidates):
+            for l, removed in enumerate(game.removed_columns([c], substring)):
+                for j in removed:
+                    covering.setdefault((l, j), []).append(n)
+
+        for l in range(game.L):
+            C = game.C[l]
+            self.a[l].SetLb(float(C.min()))
+            self.a_lb[l] = self.a[l].lb()
+            for j in range(game.Q[l]):
+                lower, upper = self.br_rows[l][j]
+                for n in covering.get((l, j), ()):
+                    lower.SetCoefficient(self.f[n], float(C[:, j].max() - C.min()))
+                    solver.Add(self.q[l][j] <= 1 - self.f[n])
+
+        self.budget = solver.Add(sum(self.f) <= len(self.candidates))
+
+    def set_node(self, fixed, allowed, budget):
+        """
+        Patches the candidates with index in fixed, lets at most budget of
+        the candidates with index in allowed be patched, and no others.
+        """
+        allowed = set(allowed)
+        for n, f in enumerate(self.f):
+            f.SetBounds(1 if n in fixed else 0, 1 if n in fixed or n in allowed else 0)
+        self.budget.SetUb(len(fixed) + budget)
+
+    def patches(self):
+        """Candidate indices patched in the last solution, most patched first."""
+        values = np.array([f.solution_value() for f in self.f])
+        order = np.argsort(-values, kind="stable")
+        return [int(n) for n in order if values[n] > TOLERANCE]
+
+    def incumbent(self):
+        """
+        None unless f is binary: a heuristic solution of the unpatched game
+        is no cutoff for the bound of a patched node.
+        """
+        return DobssModel.incumbent(self) if self.integer else None
+
+    def value(self):
+        """
+        Upper bound from a solve: the optimum, or the solver's best bound if
+        it stopped early; -inf if the node is infeasible.
+        """
+        result = self.solve()
+        if result.optimal:
+            return result.objective
+        if result.status == "INFEASIBLE":
+            return float("-inf")
+        if result.status == "FEASIBLE":
+            return self.solver.Objective().BestBound()
+        return float("inf")
+
+
+def fixed_value(game, attacks, backend="scip", options=None, substring=False):
+    """Objective of game with attacks fixed, or -inf if it has no optimum."""
+    options = dict(options or {}, presolve=True)
+    result = solve_dobss(game.remove_attacks(attacks, substring), backend, options)
+    return result.objective if result.optimal else float("-inf")
+
+
+def best_fix_sets(
+    game, k, top=1, candidates=None, backend="scip", options=None, substring=False, lp_bound=False
+):
+    """
+    The top patch sets of k candidate CVEs (all attack names by default),
+    as a list of (attack set, objective) pairs, best first, and a dict of
+    search counters.
+
+    Patch sets are grown one CVE at a time, in candidate order. A partial
+    set is only expanded while the relaxed patch model (continuous f over
+    the CVEs after its last one, with the remaining budget) can still beat
+    the top-th best complete set found so far. Bounds are computed when a
+    set is taken off the queue, so its siblings first inherit the bound of
+    their parent. Complete sets are solved on the presolved game without
+    their attacks, with backend. With lp_bound the bounds are LPs (q
+    continuous too): cheaper, but they prune far less.
+    """
+    model = FixPlanModel(game, candidates, options, substring=substring, lp=lp_bound)
+    names = model.candidates
+    n = len(names)
+    stats = {"bounds": 0, "evaluated": 0, "pruned": 0}
+    results = []
+    counter = 0
+
+    def threshold():
+        return results[0][0] if len(results) >= top else float("-inf")
+
+    # Entries: (-bound, tie-break, patch set, children order or None while
+    # the bound is the parent's)
+    queue = [(-float("inf"), counter, (), None)]
+    while queue:
+        bound, _, fixed, order = heapq.heappop(queue)
+        bound = -bound
+        if bound <= threshold() + TOLERANCE:
+            stats["pruned"] += 1 + len(queue)
+            break
+
+        first = fixed[-1] + 1 if fixed else 0
+        budget = k - len(fixed)
+        if order is None:
+            if budget == 0:
+                value = fixed_value(game, [names[m] for m in fixed], backend, options, substring)
+                stats["evaluated"] += 1
+                heapq.heappush(results, (value, tuple(names[m] for m in fixed)))
+                if len(results) > top:
+                    heapq.heappop(results)
+                continue
+            model.set_node(fixed, range(first, n), budget)
+            value = model.value()
+            stats["bounds"] += 1
+            if value <= threshold() + TOLERANCE:
+                stats["pruned"] += 1
+            else:
+                # Children the relaxation patches most are tried first
+                hints = [m for m in model.patches() if m >= first]
+                order = hints + [m for m in range(first, n) if m not in hints]
+                counter += 1
+                heapq.heappush(queue, (-value, counter, fixed, order))
+            continue
+
+        # Children keep the bound of this set until they are taken off
+        for m in order:
+            if n - m - 1 >= budget - 1:
+                counter += 1
+                heapq.heappush(queue, (-bound, counter, fixed + (m,), None))
+
+    results.sort(key=lambda entry: -entry[0])
+    return [(attacks, value) for value, attacks in results], stats
+
+
+def solve_fix_budget(game, k, candidates=None, options=None, substring=False):
+    """
+    The best patch set of at most k candidate CVEs from one MILP, the patch
+    model with binary f. Returns the patched attack names and the
+    DobssResult of the patched game (x and q of the original columns).
+    """
+    model = FixPlanModel(game, candidates, options, integer=True, substring=substring)
+    model.set_node((), range(len(model.candidates)), k)
+    result = model.solve()
+    attacks = ()
+    if result.has_solution:
+        attacks = tuple(model.candidates[n] for n in sorted(model.patches()))
+    return attacks, result
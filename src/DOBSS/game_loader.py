@@ -0,0 +1,359 @@
+#!/usr/bin/python
+
+"""
+Shared reader for the Bayesian Stackelberg game files used by the DOBSS and
+switch-cost solvers. The file is parsed once, line by line, and the payoffs
+are stored as float64 arrays so that the model builders never have to touch
+strings again.
+
+------ Input file ------
+No. of defender strategies (X)
+[ X * X switching cost matrix ]      (switch-cost games only)
+No. of attackers (L)
+| Probability for an attacker (p_l)
+| No. of attack strategies for an attacker (Q_l)
+| Name of each attack separated by |
+| [
+|       Matrix ( X * Q_l) with
+|       values r, c
+| ]
+| where r,c are rewards for defender and attacker respectively
+------------------------------------------------------------------
+
+Switch-cost games with many configurations can list only the switches that
+are allowed, in place of the cost matrix; every other switch is disallowed:
+
+| EDGES E
+| E lines "i j cost": switching from configuration i to j costs cost
+
+Games can also be stored in a binary container (see convert_game.py) that is
+memory-mapped on load, so large games are neither copied nor tokenised:
+
+------ Binary file ------
+| BINARY_MAGIC (8 bytes)
+| Header length in bytes (uint64, little endian)
+| JSON header with X, p, Q, cve_names, has_cost and cost_edges
+| Zero padding up to a multiple of 64 bytes
+| For each attacker type: R (X * Q_l) then C (X * Q_l) as float64
+| Switching cost matrix (X * X) as float64, if has_cost and not cost_edges
+| or i, j and cost of the cost_edges switches, each (E,) as float64
+------------------------------------------------------------------
+"""
+
+import json
+import struct
+
+import numpy as np
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+BINARY_MAGIC = b"BSGGAME\x01"
+_ALIGNMENT = 64
+
+# Separates the CVEs of a combined attack, e.g. "Attack1+Attack3"
+ATTACK_SEPARATOR = "+"
+
+
+class BayesianGame(object):
+    """
+    A Bayesian Stackelberg game held as NumPy arrays.
+
+    X          -- number of defender strategies (configurations)
+    p          -- float64 array of shape (L,) with the attacker type priors
+    R, C       -- lists with one float64 array of shape (X, Q_l) per attacker
+                  type holding the defender and attacker rewards
+    cve_names  -- list with the attack names of every attacker type
+    cost       -- float64 array (X, X) of switching costs, SwitchEdges, or None
+    source     -- path the game was read from, if any
+    """
+
+    def __init__(self, X, p, R, C, cve_names, cost=None, source=None):
+        self.X = X
+        self.p = p
+        self.R = R
+        self.C = C
+        self.cve_names = cve_names
+        self.cost = cost
+        self.source = source
+        self._attack_index = None
+
+    @property
+    def L(self):
+        return len(self.R)
+
+    @property
+    def Q(self):
+        return [r.shape[1] for r in self.R]
+
+    def attack_names(self):
+        """Unique attack names across all types, in order of appearance."""
+        seen = set()
+        names = []
+        for type_names in self.cve_names:
+            for name in type_names:
+                if name not in seen:
+                    seen.add(name)
+                    names.append(name)
+        return names
+
+    def with_priors(self, p):
+        """Returns a copy of the game with attacker type priors p."""
+        return BayesianGame(
+            self.X, np.asarray(p, dtype=np.float64), self.R, self.C, self.cve_names, self.cost, self.source
+        )
+
+    def attack_index(self):
+        """
+        Dict from every attack name, and every CVE of a combined attack,
+        to the list of its (type, column) positions. Built on first use.
+        """
+        if self._attack_index is None:
+            index = {}
+            for l, type_names in enumerate(self.cve_names):
+                for j, name in enumerate(type_names):
+                    keys = set(name.split(ATTACK_SEPARATOR))
+                    keys.add(name)
+                    for key in keys:
+                        index.setdefault(key, []).append((l, j))
+            self._attack_index = index
+        return self._attack_index
+
+    def removed_columns(self, invalidAttacks, substring=False):
+        """
+        Columns taken out by fixing invalidAttacks, as a sorted list per
+        attacker type: the attacks named by one of them, or combining it
+        with others. With substring, every attack whose name contains one
+        of them (the matching of the original whatToFix scripts).
+        """
+        removed = [set() for l in range(self.L)]
+        if substring:
+            for l, type_names in enumerate(self.cve_names):
+                for j, name in enumerate(type_names):
+                    if any(a in name for a in invalidAttacks):
+                        removed[l].add(j)
+        else:
+            index = self.attack_index()
+            for a in invalidAttacks:
+                for l, j in index.get(a, ()):
+                    removed[l].add(j)
+        return [sorted(r) for r in removed]
+
+    def remove_attacks(self, invalidAttacks, substring=False):
+        """
+        Returns a copy of the game without the columns taken out by fixing
+        invalidAttacks (see removed_columns). Types that keep all of their
+        columns share their arrays with this game.
+        """
+        R, C, cve_names = [], [], []
+        for l, removed in enumerate(self.removed_columns(invalidAttacks, substring)):
+            if not removed:
+                R.append(self.R[l])
+                C.append(self.C[l])
+                cve_names.append(self.cve_names[l])
+                continue
+            R.append(np.delete(self.R[l], removed, axis=1))
+            C.append(np.delete(self.C[l], removed, axis=1))
+            removed = set(removed)
+            cve_names.append([name for j, name in enumerate(self.cve_names[l]) if j not in removed])
+        return BayesianGame(self.X, self.p, R, C, cve_names, self.cost, self.source)
+
+
+class SwitchEdges(object):
+    """
+    Sparse switching costs: the switches allowed between configurations and
+    their costs. Switches that are not listed are disallowed (infinite cost).
+
+    X     -- number of defender strategies
+    i, j  -- int64 arrays (E,) with the configurations switched from and to
+    cost  -- float64 array (E,) with the cost of every switch
+    """
+
+    def __init__(self, X, i, j, cost):
+        self.X = X
+        self.i = np.asarray(i, dtype=np.int64)
+        self.j = np.asarray(j, dtype=np.int64)
+        self.cost = np.asarray(cost, dtype=np.float64)
+        if not self.i.shape == self.j.shape == self.cost.shape:
+            raise ValueError("Switch sources, targets and costs differ in length")
+        if self.E and (min(self.i.min(), self.j.min()) < 0 or max(self.i.max(), self.j.max()) >= X):
+            raise ValueError("Switches must be between configurations 0 to %d" % (X - 1))
+        if np.unique(self.i * X + self.j).size != self.E:
+            raise ValueError("A switch is listed more than once")
+
+    @property
+    def E(self):
+        return self.cost.size
+
+    @classmethod
+    def from_dense(cls, cost):
+        """The switches i -> j (i != j) of an X * X matrix with a finite cost."""
+        cost = np.asarray(cost, dtype=np.float64)
+        allowed = np.isfinite(cost) & ~np.eye(cost.shape[0], dtype=bool)
+        i, j = np.nonzero(allowed)
+        return cls(cost.shape[0], i, j, cost[i, j])
+
+    def dense(self):
+        """X * X cost matrix, inf for the disallowed switches and 0 on the diagonal."""
+        cost = np.full((self.X, self.X), np.inf)
+        np.fill_diagonal(cost, 0)
+        cost[self.i, self.j] = self.cost
+        return cost
+
+
+def _read_line(f):
+    line = f.readline()
+    if not line:
+        raise ValueError("Unexpected end of game file")
+    return line
+
+
+def _read_payoff_row(f, Q):
+    values = np.array(_read_line(f).replace(",", " ").split(), dtype=np.float64)
+    if values.size < 2 * Q:
+        raise ValueError(
+            "Expected %d 'r,c' pairs in payoff row, found %d" % (Q, values.size // 2)
+        )
+    return values[: 2 * Q]
+
+
+def _read_edges(f, X, E):
+    edges = np.empty((E, 3), dtype=np.float64)
+    for e in range(E):
+        values = _read_line(f).split()
+        if len(values) < 3:
+            raise ValueError("Expected 'i j cost' for switch %d, found %r" % (e, " ".join(values)))
+        edges[e] = np.array(values[:3], dtype=np.float64)
+    return SwitchEdges(X, edges[:, 0].astype(np.int64), edges[:, 1].astype(np.int64), edges[:, 2])
+
+
+def read_game(f, switch_cost=False, source=None):
+    """
+    Parses a game from an open text file. When switch_cost is set, the
+    X * X switching cost matrix that follows X is read as well, or the
+    SwitchEdges of an EDGES list.
+    """
+    X = int(_read_line(f))
+
+    cost = None
+    if switch_cost:
+        line = _read_line(f)
+        values = line.split()
+        if values and values[0].upper() == "EDGES":
+            cost = _read_edges(f, X, int(values[1]))
+        else:
+            cost = np.empty((X, X), dtype=np.float64)
+            cost[0] = np.array(values[:X], dtype=np.float64)
+            for i in range(1, X):
+                cost[i] = np.array(_read_line(f).split()[:X], dtype=np.float64)
+
+    L = int(_read_line(f))
+    p = np.empty(L, dtype=np.float64)
+    R = []
+    C = []
+    cve_names = []
+    for l in range(L):
+        p[l] = float(_read_line(f))
+        Q = int(_read_line(f))
+        cve_names.append(_read_line(f).strip().split("|"))
+
+        # Rows hold r,c pairs; split them into the two payoff matrices
+        payoffs = np.empty((X, 2 * Q), dtype=np.float64)
+        for i in range(X):
+            payoffs[i] = _read_payoff_row(f, Q)
+        R.append(np.ascontiguousarray(payoffs[:, 0::2]))
+        C.append(np.ascontiguousarray(payoffs[:, 1::2]))
+
+    return BayesianGame(X, p, R, C, cve_names, cost, source)
+
+
+def write_binary_game(game, path):
+    """Stores game in the binary container format at path."""
+    header = {
+        "X": game.X,
+        "p": [float(v) for v in game.p],
+        "Q": game.Q,
+        "cve_names": game.cve_names,
+        "has_cost": game.cost is not None,
+        "cost_edges": game.cost.E if isinstance(game.cost, SwitchEdges) else None,
+    }
+    header = json.dumps(header).encode("utf-8")
+    data_offset = len(BINARY_MAGIC) + 8 + len(header)
+    padding = -data_offset % _ALIGNMENT
+
+    with open(str(path), "wb") as f:
+        f.write(BINARY_MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        f.write(b"\0" * padding)
+        for l in range(game.L):
+            f.write(np.ascontiguousarray(game.R[l], dtype="<f8").tobytes())
+            f.write(np.ascontiguousarray(game.C[l], dtype="<f8").tobytes())
+        if isinstance(game.cost, SwitchEdges):
+            for values in (game.cost.i, game.cost.j, game.cost.cost):
+                f.write(np.ascontiguousarray(values, dtype="<f8").tobytes())
+        elif game.cost is not None:
+            f.write(np.ascontiguousarray(game.cost, dtype="<f8").tobytes())
+
+
+def load_binary_game(path):
+    """
+    Opens a game stored by write_binary_game. The payoff and cost matrices
+    are read-only views into a memory map of the file (the switch sources
+    and targets of SwitchEdges are copied as integers).
+    """
+    with open(str(path), "rb") as f:
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError("%s is not a binary game file" % path)
+        (header_len,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_len).decode("utf-8"))
+
+    data_offset = len(BINARY_MAGIC) + 8 + header_len
+    data_offset += -data_offset % _ALIGNMENT
+
+    X = header["X"]
+    Q = header["Q"]
+    E = header.get("cost_edges")
+    size = sum(2 * X * q for q in Q)
+    if header["has_cost"]:
+        size += X * X if E is None else 3 * E
+    data = np.memmap(str(path), dtype="<f8", mode="r", offset=data_offset, shape=(size,))
+
+    R = []
+    C = []
+    start = 0
+    for q in Q:
+        R.append(data[start : start + X * q].reshape(X, q))
+        start += X * q
+        C.append(data[start : start + X * q].reshape(X, q))
+        start += X * q
+
+    cost = None
+    if header["has_cost"] and E is not None:
+        i, j, values = data[start : start + 3 * E].reshape(3, E)
+        cost = SwitchEdges(X, i.astype(np.int64), j.astype(np.int64), values)
+    elif header["has_cost"]:
+        cost = data[start : start + X * X].reshape(X, X)
+
+    p = np.array(header["p"], dtype=np.float64)
+    return BayesianGame(X, p, R, C, header["cve_names"], cost, source=str(path))
+
+
+def is_binary_game(path):
+    with open(str(path), "rb") as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def load_game(path, switch_cost=False):
+    """
+    Reads the game stored at path, in either the text or the binary format.
+    """
+    if is_binary_game(path):
+        game = load_binary_game(path)
+        if switch_cost and game.cost is None:
+            raise ValueError("%s does not contain a switching cost matrix" % path)
+        return game
+
+    with open(str(path), "r") as f:
+        return read_game(f, switch_cost, source=str(path))
@@ -0,0 +1,89 @@
+#!/usr/bin/python
+
+"""
+Cheap feasible solutions of the DOBSS problem, used to seed the exact
+engines with an incumbent and an objective cutoff (the heuristic option).
+
+Any defender mix x is a feasible DOBSS solution once every attacker type
+plays a best response to it, so candidate mixes are scored with vectorized
+best responses (ties broken in favour of the defender, as in the Strong
+Stackelberg equilibrium):
+
+    - the uniform mix, as played by BSG_vs_UR.py
+    - every pure configuration
+    - random mixes drawn uniformly from the simplex (fixed seed)
+    - a greedy local search on the simplex from the best few of the above,
+      moving probability mass between pairs of configurations
+"""
+
+import numpy as np
+
+from dobss_result import DobssResult
+from evaluation import evaluate_strategies
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+TOLERANCE = 1e-9
+
+
+def evaluate(game, xs):
+    """
+    Defender utility of every row of xs (N, X) against best-responding
+    attackers. Returns the (N,) utilities and the (N, L) attack indices.
+    """
+    evaluation = evaluate_strategies(game, xs)
+    return evaluation.defender, evaluation.responses
+
+
+def local_search(game, x, value, step=0.25, min_step=1e-3):
+    """
+    Greedy ascent from x: moves min(step, x[i]) from configuration i to j
+    for the best pair (i, j) while that improves the value, halving step
+    when no move does. Returns the final x and value.
+    """
+    X = game.X
+    i, j = np.nonzero(~np.eye(X, dtype=bool))
+    while step >= min_step:
+        moved = np.minimum(step, x[i])
+        candidates = np.repeat(x[None, :], len(i), axis=0)
+        candidates[np.arange(len(i)), i] -= moved
+        candidates[np.arange(len(i)), j] += moved
+        values, _ = evaluate(game, candidates)
+        best = int(np.argmax(values))
+        if values[best] > value + TOLERANCE:
+            x, value = candidates[best], values[best]
+        else:
+            step /= 2
+    return x, value
+
+
+def heuristic_result(game, samples=100, starts=10, seed=0):
+    """
+    The best mix found by the heuristics, as a FEASIBLE DobssResult, or
+    None if some attacker type has no attacks.
+    """
+    if game.X == 0 or min(game.Q + [1]) == 0:
+        return None
+    rng = np.random.default_rng(seed)
+    xs = np.vstack(
+        (np.full(game.X, 1.0 / game.X), np.eye(game.X), rng.dirichlet(np.ones(game.X), samples))
+    )
+    values, _ = evaluate(game, xs)
+    x, value = None, -np.inf
+    for start in np.argsort(-values, kind="stable")[:starts]:
+        x_start, value_start = local_search(game, xs[start], values[start])
+        if value_start > value:
+            x, value = x_start, value_start
+
+    _, responses = evaluate(game, x)
+    q = []
+    for l, j in enumerate(responses[0]):
+        q_l = np.zeros(game.Q[l], dtype=int)
+        q_l[j] = 1
+        q.append(q_l)
+    a = np.array([x @ game.C[l][:, j] for l, j in enumerate(responses[0])])
+    result = DobssResult(game, "FEASIBLE", float(value), x, q, a)
+    result.stats = {"candidates": len(xs)}
+    return result
@@ -0,0 +1,205 @@
+#!/usr/bin/python
+
+#   For every response profile j = (j[0], ..., j[L-1]):
+#       maximize
+#           Sum_l p[l] * R[l][i][j[l]] * x[i]
+#       subject to
+#           Sum x[i] = 1
+#           For each l & all k, Sum_i (C[l][i][j[l]] - C[l][i][k]) * x[i] >= 0
+#           x[i] >= 0
+#   and keep the best profile (Conitzer & Sandholm's multiple-LPs method).
+#
+# Profiles are enumerated depth first, one attacker type at a time. A node
+# that has fixed the responses of the first d types solves the LP above with
+# only those types' rows and objective terms; its value plus
+# Sum_{l >= d} p[l] * max R[l] bounds every profile below it, so branches
+# that cannot beat the incumbent (or whose LP is infeasible) are pruned.
+# Attacks that are never a best response of their type on their own are
+# dropped before the search starts.
+# The same LP object is reused for every node: only the objective and the
+# rows of the type being (un)fixed change between solves.
+
+from ortools.linear_solver import pywraplp
+from dobss_result import DobssResult
+from heuristics import heuristic_result
+from warm_start import hint_values
+import numpy as np
+import time
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+TOLERANCE = 1e-9
+
+
+class MultipleLPsModel(object):
+    """
+    Exact DOBSS engine solving one LP per (pruned) attacker response profile.
+    Best suited to single-type games or few types with few attacks.
+
+    Options:
+        lp_solver  -- pywraplp LP solver name (default GLOP)
+        time_limit -- stop the enumeration after this many seconds and return
+                      the incumbent as FEASIBLE
+        hint       -- earlier solution whose response profile is solved first
+                      to start with a good incumbent
+        heuristic  -- use the heuristics.py solution as hint if none is given
+    """
+
+    def __init__(self, game, options=None):
+        self.game = game
+        self.options = dict(options or {})
+        lp_solver = self.options.get("lp_solver") or "GLOP"
+        self.solver = pywraplp.Solver.CreateSolver(lp_solver)
+        if not self.solver:
+            raise RuntimeError("Could not create %s solver" % lp_solver)
+        solver = self.solver
+        infinity = solver.infinity()
+
+        X = game.X
+        self.x = [solver.NumVar(0, 1, "x-" + str(i)) for i in range(X)]
+        solver.Add(sum(self.x) == 1)
+
+        # One row per attack and type, switched off until the type is fixed
+        self.rows = []
+        for l in range(game.L):
+            self.rows.append(
+                [solver.Constraint(-infinity, infinity) for k in range(game.Q[l])]
+            )
+
+        self.objective = solver.Objective()
+        self.objective.SetMaximization()
+
+        # Optimistic value of each type's attacks, independent of x
+        self.best_reward = [float(game.p[l]) * game.R[l].max(axis=0) for l in range(game.L)]
+
+    def _fix(self, l, j):
+        """Makes attack j the best response of type l in the LP."""
+        C = self.game.C[l]
+        gain = C[:, j : j + 1] - C
+        for k, row in enumerate(self.rows[l]):
+            for i in range(self.game.X):
+                row.SetCoefficient(self.x[i], float(gain[i, k]))
+            row.SetLb(0)
+        reward = float(self.game.p[l]) * self.game.R[l][:, j]
+        for i in range(self.game.X):
+            self.objective.SetCoefficient(self.x[i], self._objective[i] + reward[i])
+        self._objective += reward
+
+    def _release(self, l, j):
+        """Undoes _fix(l, j)."""
+        for row in self.rows[l]:
+            row.SetLb(-self.solver.infinity())
+        self._objective -= float(self.game.p[l]) * self.game.R[l][:, j]
+        for i in range(self.game.X):
+            self.objective.SetCoefficient(self.x[i], self._objective[i])
+
+    def _search(self, l, profile, fixed_bound):
+        game = self.game
+        if l == game.L:
+            return
+
+        # Bound contributed by the types after l, before any LP is solved
+        rest = sum(self.best_reward[k].max() for k in range(l + 1, game.L))
+        for j in self.candidates[l]:
+            if fixed_bound + self.best_reward[l][j] + rest <= self.incumbent + TOLERANCE:
+                self.stats["pruned"] += 1
+                break
+            if self._deadline is not None and time.perf_counter() > self._deadline:
+                self.timed_out = True
+                return
+
+            self._fix(l, j)
+            status = self.solver.Solve()
+            self.stats["lps_solved"] += 1
+            if status == pywraplp.Solver.OPTIMAL:
+                value = self.objective.Value()
+                if l == game.L - 1:
+                    if value > self.incumbent + TOLERANCE:
+                        self.incumbent = value
+                        self.best_profile = profile + [int(j)]
+                        self.best_x = np.array([v.solution_value() for v in self.x])
+                elif value + rest > self.incumbent + TOLERANCE:
+                    # The LP optimum over types <= l bounds this whole branch
+                    self._search(l + 1, profile + [int(j)], fixed_bound + self.best_reward[l][j])
+                else:
+                    self.stats["pruned"] += 1
+            else:
+                self.stats["infeasible"] += 1
+            self._release(l, j)
+            if self.timed_out:
+                return
+
+    def _candidates(self, l):
+        """
+        Attacks of type l that are a best response for some x, best first.
+        Once the time limit is reached the attacks not checked yet are kept.
+        """
+        candidates = []
+        order = np.argsort(-self.best_reward[l], kind="stable")
+        for n, j in enumerate(order):
+            if self._deadline is not None and time.perf_counter() > self._deadline:
+                self.timed_out = True
+                return candidates + [int(k) for k in order[n:]]
+            self._fix(l, j)
+            status = self.solver.Solve()
+            self.stats["lps_solved"] += 1
+            if status == pywraplp.Solver.OPTIMAL:
+                candidates.append(int(j))
+            else:
+                self.stats["infeasible"] += 1
+            self._release(l, j)
+        return candidates
+
+    def _seed(self, hint):
+        """Makes the profile of a hint the incumbent, if its LP is feasible."""
+        if hint is None:
+            return
+        profile = [int(np.argmax(q_l)) for q_l in hint[1]]
+        for l, j in enumerate(profile):
+            self._fix(l, j)
+        status = self.solver.Solve()
+        self.stats["lps_solved"] += 1
+        if status == pywraplp.Solver.OPTIMAL:
+            self.incumbent = self.objective.Value()
+            self.best_profile = profile
+            self.best_x = np.array([v.solution_value() for v in self.x])
+        for l, j in enumerate(profile):
+            self._release(l, j)
+
+    def solve(self):
+        game = self.game
+        self.incumbent = -np.inf
+        self.best_profile = None
+        self.best_x = None
+        self.timed_out = False
+        self.stats = {"lps_solved": 0, "pruned": 0, "infeasible": 0}
+        self._objective = np.zeros(game.X)
+        # The time limit covers the candidate LPs as well as the search
+        time_limit = self.options.get("time_limit")
+        self._deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        self.candidates = [self._candidates(l) for l in range(game.L)]
+
+        # A type that can never best respond makes every profile infeasible
+        if all(self.candidates):
+            hint = self.options.get("hint")
+            if hint is None and self.options.get("heuristic"):
+                hint = heuristic_result(game)
+            self._seed(hint_values(game, hint))
+            self._search(0, [], 0.0)
+
+        if self.best_profile is None:
+            result = DobssResult(game, "NOT_SOLVED" if self.timed_out else "INFEASIBLE")
+        else:
+            x = self.best_x
+            q = []
+            for l, j in enumerate(self.best_profile):
+                q_l = np.zeros(game.Q[l], dtype=int)
+                q_l[j] = 1
+                q.append(q_l)
+            a = np.array([x @ game.C[l][:, j] for l, j in enumerate(self.best_profile)])
+            status = "FEASIBLE" if self.timed_out else "OPTIMAL"
+            result = DobssResult(game, status, self.incumbent, x, q, a)
+        result.stats = self.stats
+        return result
@@ -0,0 +1,110 @@
+#!/usr/bin/python
+
+"""
+Defender policies to compare against the Strong Stackelberg equilibrium.
+
+    sse       -- the DOBSS solution (one solve)
+    uniform   -- x[i] = 1/X, as in BSG_vs_UR.py
+    pure-i    -- configuration i with probability 1
+    maximin   -- the x maximizing Sum_l p[l] * min_j R[l][:, j] . x, the
+                 defender's value if every type picked the attack worst for
+                 the defender (one LP)
+
+Every policy is then scored against best-responding attackers in one batch
+(see evaluation.py). The SSE is scored against the responses the solver
+chose instead: its x sits on attacker ties that the solver only meets to
+its feasibility tolerance, and re-breaking them could hand the defender a
+far worse attack.
+"""
+
+from ortools.linear_solver import pywraplp
+import numpy as np
+
+from dobss import solve_dobss
+from evaluation import StrategyEvaluator, uniform_strategy
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+
+def maximin_strategy(game):
+    """The defender strategy maximizing the prior-weighted worst case (GLOP)."""
+    solver = pywraplp.Solver.CreateSolver("GLOP")
+    if not solver:
+        raise RuntimeError("Could not create GLOP solver")
+    infinity = solver.infinity()
+    x = [solver.NumVar(0, 1, "x-" + str(i)) for i in range(game.X)]
+    solver.Add(sum(x) == 1)
+    v = [solver.NumVar(-infinity, infinity, "v-" + str(l)) for l in range(game.L)]
+    for l in range(game.L):
+        R = game.R[l]
+        for j in range(game.Q[l]):
+            solver.Add(v[l] <= sum(float(R[i, j]) * x[i] for i in range(game.X)))
+    objective = solver.Objective()
+    for l in range(game.L):
+        objective.SetCoefficient(v[l], float(game.p[l]))
+    objective.SetMaximization()
+    if solver.Solve() != pywraplp.Solver.OPTIMAL:
+        raise RuntimeError("The maximin LP has no optimal solution")
+    return np.array([xi.solution_value() for xi in x])
+
+
+def check_strategy(game, x):
+    """x as a float array, if it is a defender strategy of game."""
+    x = np.asarray(x, dtype=np.float64)
+    if x.shape != (game.X,):
+        raise ValueError("A strategy needs %d probabilities, got %d" % (game.X, x.size))
+    if (x < -1e-9).any() or abs(x.sum() - 1) > 1e-6:
+        raise ValueError("A strategy must be non-negative and sum to 1: %s" % x)
+    return x
+
+
+def baseline_policies(game, backend="scip", options=None, pure=True):
+    """
+    List of policies (see compare_policies) with the SSE, with the attacks
+    of the DOBSS solution, and the uniform, the pure (if pure) and the
+    maximin strategies of game.
+    """
+    policies = []
+    result = solve_dobss(game, backend, options)
+    if result.has_solution:
+        policies.append(("sse", np.asarray(result.x, dtype=np.float64), result.responses))
+    policies.append(("uniform", uniform_strategy(game)))
+    if pure:
+        for i in range(game.X):
+            policies.append(("pure-%d" % i, np.eye(game.X)[i]))
+    policies.append(("maximin", maximin_strategy(game)))
+    return policies
+
+
+def compare_policies(game, policies):
+    """
+    Scores every (name, x) in policies against best-responding attackers,
+    and every (name, x, responses) against the attack index responses[l]
+    of every type. Returns a list with one dict per policy: name, x,
+    defender (utility), and the per-type lists type_defender, attacker and
+    responses (attack names).
+    """
+    xs = np.vstack([check_strategy(game, policy[1]) for policy in policies])
+    evaluation = StrategyEvaluator(game).evaluate(xs)
+    rows = []
+    for n, policy in enumerate(policies):
+        type_defender = evaluation.type_defender[n]
+        attacker = evaluation.attacker[n]
+        responses = evaluation.responses[n]
+        if len(policy) > 2:
+            responses = [int(j) for j in policy[2]]
+            type_defender = np.array([xs[n] @ game.R[l][:, j] for l, j in enumerate(responses)])
+            attacker = np.array([xs[n] @ game.C[l][:, j] for l, j in enumerate(responses)])
+        rows.append(
+            {
+                "name": policy[0],
+                "x": xs[n],
+                "defender": float(type_defender @ game.p),
+                "type_defender": type_defender.tolist(),
+                "attacker": attacker.tolist(),
+                "responses": [game.cve_names[l][j] for l, j in enumerate(responses)],
+            }
+        )
+    return rows
@@ -0,0 +1,216 @@
+#!/usr/bin/python
+
+"""
+Presolve for the DOBSS models: shrinks a game without changing its Strong
+Stackelberg equilibrium.
+
+Attacker types with identical R and C matrices always choose the same
+attack, so they are merged into the first of them with the sum of their
+priors (merge_types).
+
+For every attacker type, column k is dropped when another column j has
+    C[:, j] >= C[:, k] and R[:, j] >= R[:, k]     (j is as good for the
+                                                   attacker and, on ties,
+                                                   for the defender)
+or
+    C[:, j] >  C[:, k]                            (k is never a best response)
+Identical columns are merged into the first of them. Whenever a dropped
+column is a best response, the column that removed it is a best response too
+with at least the same defender reward, so the optimum is unchanged
+(drop_columns).
+
+    presolved = Presolve(game)
+    result = presolved.restore(solve_dobss(presolved.game))
+
+restore() maps the solution back to the columns and CVE names of the
+original game.
+"""
+
+import copy
+import hashlib
+
+import numpy as np
+
+from game_loader import BayesianGame
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+
+def dominance(R, C):
+    """
+    Boolean (Q, Q) array whose [j, k] entry is True when column j removes
+    column k (identical columns remove each other).
+    """
+    C_ge = (C[:, :, None] >= C[:, None, :]).all(axis=0)
+    C_gt = (C[:, :, None] > C[:, None, :]).all(axis=0)
+    R_ge = (R[:, :, None] >= R[:, None, :]).all(axis=0)
+    dominated = (C_ge & R_ge) | C_gt
+    np.fill_diagonal(dominated, False)
+    return dominated
+
+
+def kept_columns(R, C):
+    """
+    Indices of the columns of one attacker type that survive the presolve,
+    and a dict mapping every kept column to the identical columns merged
+    into it.
+    """
+    Q = C.shape[1]
+    # Merge identical (R, C) columns into their first occurrence
+    payoffs = np.vstack((R, C)).T
+    _, first, inverse = np.unique(payoffs, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    unique = np.sort(first)
+    duplicates = {}
+    for j in range(Q):
+        rep = int(first[inverse[j]])
+        if rep != j:
+            duplicates.setdefault(rep, []).append(j)
+
+    dominated = dominance(R[:, unique], C[:, unique])
+    keep = unique[~dominated.any(axis=0)]
+    duplicates = dict((j, duplicates[j]) for j in keep if j in duplicates)
+    return keep, duplicates
+
+
+def _payoff_key(R, C):
+    digest = hashlib.sha1()
+    digest.update(str(R.shape).encode("ascii"))
+    digest.update(np.ascontiguousarray(R, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(C, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def type_map(game):
+    """
+    Index of the type every attacker type is merged into: the first type
+    with identical R and C matrices.
+    """
+    first = {}
+    merged_into = []
+    for l in range(game.L):
+        candidates = first.setdefault(_payoff_key(game.R[l], game.C[l]), [])
+        for m in candidates:
+            if np.array_equal(game.R[m], game.R[l]) and np.array_equal(game.C[m], game.C[l]):
+                merged_into.append(m)
+                break
+        else:
+            candidates.append(l)
+            merged_into.append(l)
+    return merged_into
+
+
+class Presolve(object):
+    """
+    The presolved copy of a game and the map back to its types and columns.
+
+    game        -- the reduced BayesianGame
+    original    -- the game that was presolved
+    types       -- list with the original index of every kept type
+    type_index  -- list with the kept type (index into game) of every
+                   original type
+    kept        -- list with the original index of every kept column, per
+                   kept type
+    duplicates  -- list of dicts {kept column: [identical original columns]}
+    """
+
+    def __init__(self, game, merge_types=True, drop_columns=True):
+        self.original = game
+        self.drop_columns = drop_columns
+        merged_into = type_map(game) if merge_types else list(range(game.L))
+        self.types = sorted(set(merged_into))
+        self.type_index = [self.types.index(m) for m in merged_into]
+        p = np.zeros(len(self.types), dtype=np.float64)
+        np.add.at(p, self.type_index, game.p)
+
+        self.kept = []
+        self.duplicates = []
+        R, C, cve_names = [], [], []
+        for l in self.types:
+            if drop_columns:
+                keep, duplicates = kept_columns(game.R[l], game.C[l])
+            else:
+                keep, duplicates = np.arange(game.Q[l]), {}
+            self.kept.append(keep)
+            self.duplicates.append(duplicates)
+            R.append(np.ascontiguousarray(game.R[l][:, keep]))
+            C.append(np.ascontiguousarray(game.C[l][:, keep]))
+            cve_names.append([game.cve_names[l][j] for j in keep])
+        self.game = BayesianGame(game.X, p, R, C, cve_names, game.cost, game.source)
+
+    @property
+    def reduced(self):
+        """True if the presolved game is smaller than the original."""
+        return self.game.L < self.original.L or sum(self.game.Q) < sum(
+            self.original.Q[l] for l in self.types
+        )
+
+    def summary(self):
+        """Lines with the types merged and the number of columns kept per type."""
+        lines = []
+        if self.game.L < self.original.L:
+            lines.append("types: %d -> %d" % (self.original.L, self.game.L))
+            for k, l in enumerate(self.types):
+                merged = [m for m in range(self.original.L) if self.type_index[m] == k and m != l]
+                if merged:
+                    lines.append(
+                        "type %d: merged types %s, p = %g"
+                        % (l, ", ".join(str(m) for m in merged), self.game.p[k])
+                    )
+        for k, l in enumerate(self.types if self.drop_columns else ()):
+            merged = sum(len(v) for v in self.duplicates[k].values())
+            lines.append(
+                "type %d: %d -> %d attacks (%d duplicates merged, %d dominated)"
+                % (
+                    l,
+                    self.original.Q[l],
+                    self.game.Q[k],
+                    merged,
+                    self.original.Q[l] - self.game.Q[k] - merged,
+                )
+            )
+        return "\n".join(lines)
+
+    def restore(self, result):
+        """
+        Returns a copy of result, solved on the presolved game, expressed in
+        the types and columns of the original game.
+        """
+        restored = copy.copy(result)
+        restored.game = self.original
+        if result.q is not None:
+            restored.q = []
+            restored.responses = np.zeros(self.original.L, dtype=int)
+            for l in range(self.original.L):
+                k = self.type_index[l]
+                q = np.zeros(self.original.Q[l], dtype=int)
+                q[self.kept[k]] = result.q[k]
+                restored.q.append(q)
+                restored.responses[l] = self.kept[k][result.responses[k]]
+            restored.a = np.asarray(result.a)[self.type_index]
+        return restored
+
+
+class PresolvedModel(object):
+    """Any DOBSS model class, built on the game of a Presolve."""
+
+    def __init__(self, presolve, model_class, *args):
+        self.presolve = presolve
+        self.model = model_class(presolve.game, *args)
+
+    def solve(self):
+        return self.presolve.restore(self.model.solve())
+
+
+def build_presolved(model_class, game, options, *args):
+    """
+    Builds model_class(game, *args, options), on the presolved game if the
+    merge_types or presolve options reduce it.
+    """
+    if options.get("merge_types") or options.get("presolve"):
+        presolve = Presolve(game, bool(options.get("merge_types")), bool(options.get("presolve")))
+        if presolve.reduced:
+            return PresolvedModel(presolve, model_class, *(args + (options,)))
+    return model_class(game, *(args + (options,)))
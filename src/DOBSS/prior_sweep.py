@@ -0,0 +1,149 @@
+#!/usr/bin/python
+
+"""
+Re-solves a game over a grid of attacker type priors.
+
+One DobssModel is built per worker; between grid points only the objective
+coefficients p[l] * R[l][i][j] change (DobssModel.set_priors) and every
+point is started from the solution of the point before it, so grids should
+list neighbouring priors next to each other (type_grid and simplex_grid do).
+With workers > 1 the grid is cut into that many contiguous chunks, each
+swept by its own process.
+
+    python prior_sweep.py mtd_webapps_input --type 0 --values 0.05,0.1,0.2,0.3
+    python prior_sweep.py mtd_webapps_input --simplex 10 --workers 4
+    python prior_sweep.py input.txt --priors 0.5,0.35,0.05,0.1 --priors 0.25,0.25,0.25,0.25
+"""
+
+from itertools import product
+from multiprocessing import Pool
+from dobss import DobssModel
+from game_loader import load_game
+import argparse
+import numpy as np
+import time
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+
+def type_grid(game, l, values):
+    """
+    Priors with p[l] set to every value in values and the other types
+    scaled to share the rest in their original proportions.
+    """
+    others = game.p.copy()
+    others[l] = 0
+    grid = []
+    for value in values:
+        p = others * (1 - value) / others.sum() if others.sum() > 0 else others
+        p[l] = value
+        grid.append(p)
+    return grid
+
+
+def simplex_grid(L, steps):
+    """All priors of L types that are multiples of 1/steps, neighbours next to each other."""
+    grid = []
+    for head in product(range(steps + 1), repeat=L - 1):
+        if sum(head) <= steps:
+            grid.append(np.array(head + (steps - sum(head),), dtype=np.float64) / steps)
+    return grid
+
+
+def check_priors(game, p):
+    """p as a float array, if it is a prior of game's attacker types."""
+    p = np.asarray(p, dtype=np.float64)
+    if p.shape != (game.L,):
+        raise ValueError("Priors need %d probabilities, got %d" % (game.L, p.size))
+    if (p < 0).any() or abs(p.sum() - 1) > 1e-6:
+        raise ValueError("Priors must be non-negative and sum to 1: %s" % p)
+    return p
+
+
+def sweep_chunk(game, grid, options=None, warm=True):
+    """
+    Solves game at every prior of grid with one model. Returns one row per
+    point: (p, status, objective, x, attack names, seconds).
+    """
+    model = DobssModel(game, options)
+    rows = []
+    for p in grid:
+        start = time.time()
+        model.set_priors(p)
+        result = model.solve()
+        if warm and result.has_solution:
+            model.options["hint"] = result
+        if result.has_solution:
+            row = (p, result.status, result.objective, result.x, result.response_names())
+        else:
+            row = (p, result.status, None, None, None)
+        rows.append(row + (time.time() - start,))
+    return rows
+
+
+def _sweep_chunk(args):
+    return sweep_chunk(*args)
+
+
+def sweep_priors(game, grid, options=None, workers=1, warm=True):
+    """
+    Rows of sweep_chunk for every prior of grid, in grid order; with
+    workers > 1 contiguous chunks of the grid are swept in parallel.
+    """
+    grid = [check_priors(game, p) for p in grid]
+    if workers <= 1 or len(grid) <= 1:
+        return sweep_chunk(game, grid, options, warm)
+    chunks = [list(chunk) for chunk in np.array_split(np.arange(len(grid)), workers) if len(chunk)]
+    tasks = [(game, [grid[n] for n in chunk], options, warm) for chunk in chunks]
+    with Pool(len(tasks)) as pool:
+        return [row for rows in pool.map(_sweep_chunk, tasks) for row in rows]
+
+
+def printTable(game, rows):
+    print(
+        "%-*s %10s  %-*s %s  %8s"
+        % (6 * game.L, "p", "objective", 6 * game.X, "x", "responses", "time (s)")
+    )
+    for p, status, objective, x, responses, seconds in rows:
+        p = " ".join("%5.3g" % v for v in p)
+        if objective is None:
+            print("%s %10s  %s" % (p, status, ""))
+            continue
+        x = " ".join("%5.3g" % v for v in np.clip(x, 0, None))
+        print("%s %10.5g  %s %s  %8.3f" % (p, objective, x, " | ".join(responses), seconds))
+
+
+def parseArgs():
+    parser = argparse.ArgumentParser(description="Re-solve a game over a grid of attacker type priors.")
+    parser.add_argument("input_file")
+    parser.add_argument(
+        "--priors",
+        action="append",
+        default=[],
+        help="comma separated priors of all types, may be repeated",
+    )
+    parser.add_argument("--type", type=int, default=None, help="type whose prior takes --values")
+    parser.add_argument("--values", default=None, help="comma separated priors of --type")
+    parser.add_argument("--simplex", type=int, default=None, help="all priors in steps of 1/N")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--cold", action="store_true", help="do not start from the previous point")
+    parser.add_argument("--time-limit", type=float, default=None)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parseArgs()
+    game = load_game(args.input_file)
+    grid = [[float(v) for v in p.split(",")] for p in args.priors]
+    if args.type is not None:
+        grid += type_grid(game, args.type, [float(v) for v in args.values.split(",")])
+    if args.simplex is not None:
+        grid += simplex_grid(game.L, args.simplex)
+    if not grid:
+        grid = [game.p]
+    start = time.time()
+    rows = sweep_priors(game, grid, {"time_limit": args.time_limit}, args.workers, not args.cold)
+    printTable(game, rows)
+    print("Points -> %d, total time -> %.2fs" % (len(rows), time.time() - start))
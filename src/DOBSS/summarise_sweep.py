@@ -0,0 +1,32 @@
+#!/usr/bin/python
+
+"""
+Prints the best attack sets of a whatToFix sweep log (whatToFix_ortools.py
+--log), reading it one line at a time.
+
+    python summarise_sweep.py <log> [--top N]
+"""
+
+from sweep_log import summarise
+import argparse
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+
+def parseArgs():
+    parser = argparse.ArgumentParser(description="Summarise a whatToFix sweep log.")
+    parser.add_argument("log")
+    parser.add_argument("--top", type=int, default=10, help="number of best sets printed")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parseArgs()
+    summary = summarise(args.log, args.top)
+    print("Sets -> %d, without an optimal solution -> %d" % (summary["entries"], summary["failed"]))
+    print("Solve time -> %.2fs" % summary["seconds"])
+    print("=====")
+    for attacks, obj in summary["best"]:
+        print("%g %s" % (obj, attacks))
@@ -0,0 +1,93 @@
+#!/usr/bin/python
+
+"""
+Append-only log of the results of a whatToFix sweep, one JSON object per
+line:
+
+    {"attacks": ["CVE-2014-0185"], "objective": -2.435, "status": "OPTIMAL", "seconds": 3.1}
+
+objective is null when the set has no optimal solution. Every result is
+flushed as soon as it is written, so a sweep that is stopped loses at most
+the set being solved, and a restarted sweep skips the sets already in the
+log (recorded()). A line cut short by the stop is ignored when the log is
+read and terminated before the next result is appended.
+
+summarise() reads the log line by line and keeps only the best sets.
+"""
+
+import heapq
+import json
+import os
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+
+def read_entries(path):
+    """Yields the entries of the log at path, skipping unreadable lines."""
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                entry["attacks"] = tuple(entry["attacks"])
+            except (ValueError, KeyError, TypeError):
+                continue
+            yield entry
+
+
+class SweepLog(object):
+    """The log of one sweep, in the JSONL file at path."""
+
+    def __init__(self, path):
+        self.path = str(path)
+
+    def recorded(self):
+        """Set of the attack sets already in the log."""
+        return set(entry["attacks"] for entry in read_entries(self.path))
+
+    def open(self):
+        """Opens the log for appending, after any line cut short."""
+        f = open(self.path, "a+")
+        if f.tell() > 0:
+            f.seek(f.tell() - 1)
+            if f.read(1) != "\n":
+                f.write("\n")
+        return f
+
+    def append(self, f, attacks, objective, status, seconds):
+        """Writes the result of one attack set to the open log f."""
+        entry = {
+            "attacks": list(attacks),
+            "objective": objective if objective != float("-inf") else None,
+            "status": status,
+            "seconds": round(seconds, 6),
+        }
+        f.write(json.dumps(entry) + "\n")
+        f.flush()
+
+
+def summarise(path, top=1):
+    """
+    Streams the log at path and returns a dict with the number of entries,
+    of sets without an optimal solution, the solve seconds and the top
+    (attack set, objective) pairs, best first (ties in log order).
+    """
+    summary = {"entries": 0, "failed": 0, "seconds": 0.0}
+    best = []
+    for n, entry in enumerate(read_entries(path)):
+        summary["entries"] += 1
+        summary["seconds"] += entry.get("seconds") or 0.0
+        if entry.get("objective") is None:
+            summary["failed"] += 1
+            continue
+        item = (entry["objective"], -n, entry["attacks"])
+        if len(best) < top:
+            heapq.heappush(best, item)
+        elif item > best[0]:
+            heapq.heapreplace(best, item)
+    best.sort(reverse=True)
+    summary["best"] = [(attacks, obj) for obj, n, attacks in best]
+    return summary
@@ -0,0 +1,148 @@
+#!/usr/bin/python
+"""
+Test for the dobss.py library API.
+Solves input.txt in-process and verifies the returned arrays.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DOBSS_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, DOBSS_DIR)
+
+from dobss import DobssModel, solve_dobss
+from dobss_model import big_m_values
+from game_loader import load_game
+from whatToFix_ortools import whatToFix
+
+X_EXPECTED = [0.428571, 0.414286, 0.0, 0.157143]
+RESPONSES_EXPECTED = ["Attack2", "Attack1+Attack4", "Attack2+Attack3", "Attack3"]
+
+
+class TestSolveDobss(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.game = load_game(os.path.join(DOBSS_DIR, "input.txt"))
+
+    def check_result(self, result):
+        self.assertEqual(result.status, "OPTIMAL")
+        self.assertAlmostEqual(result.objective, 0.912143, places=4)
+        np.testing.assert_allclose(result.x, X_EXPECTED, atol=1e-4)
+        self.assertEqual(result.response_names(), RESPONSES_EXPECTED)
+        for l in range(self.game.L):
+            self.assertEqual(result.q[l].sum(), 1)
+            self.assertEqual(result.q[l][result.responses[l]], 1)
+
+    def test_scip_backend(self):
+        """Test the element-by-element SCIP backend."""
+        self.check_result(solve_dobss(self.game, backend="scip"))
+
+    def test_scip_bulk_backend(self):
+        """Test the sparse-matrix SCIP backend."""
+        self.check_result(solve_dobss(self.game, backend="scip-bulk"))
+
+    def test_multiple_lps_backend(self):
+        """Test the multiple-LPs backend against the MILP optimum."""
+        result = solve_dobss(self.game, backend="multiple-lps")
+        self.check_result(result)
+        self.assertGreater(result.stats["lps_solved"], 0)
+
+    def test_multiple_lps_neuralnets(self):
+        """Test that the multiple-LPs backend matches SCIP on another game."""
+        game = load_game(os.path.join(DOBSS_DIR, "mtd_neuralnets_input"))
+        expected = solve_dobss(game, backend="scip").objective
+        result = solve_dobss(game, backend="multiple-lps")
+        self.assertEqual(result.status, "OPTIMAL")
+        self.assertAlmostEqual(result.objective, expected, places=4)
+
+    def test_multiple_lps_time_limit(self):
+        """Test that the time limit of multiple-LPs covers the candidate LPs."""
+        game = load_game(os.path.join(DOBSS_DIR, "mtd_webapps_input"))
+        result = solve_dobss(game, backend="multiple-lps", options={"time_limit": 0})
+        self.assertIn(result.status, ("FEASIBLE", "NOT_SOLVED"))
+        self.assertLess(result.stats["lps_solved"], 2)
+
+    def test_multiple_lps_infeasible(self):
+        """Test that a type without attacks is infeasible for multiple-LPs."""
+        result = solve_dobss(self.game.remove_attacks(("Attack",), substring=True), backend="multiple-lps")
+        self.assertEqual(result.status, "INFEASIBLE")
+
+    def test_constant_big_m(self):
+        """Test that the original constant big-M gives the same optimum."""
+        for backend in ("scip", "scip-bulk"):
+            self.check_result(solve_dobss(self.game, backend, {"big_m": 100000000}))
+
+    def test_tight_big_m_values(self):
+        """Test the per-column big-M and the bounds of a for type 1."""
+        M_col, (a_lb, a_ub) = big_m_values(self.game.C[1])
+        # Column Attack1 (6, -8, 6, -8) against the row maxima (6, 0, 10, 10)
+        self.assertEqual(M_col[0], 18)
+        np.testing.assert_allclose(M_col, [18, 8, 10, 10])
+        self.assertEqual((a_lb, a_ub), (0, 10))
+
+    def test_attacker_values(self):
+        """Test that a[l] is the attacker's utility for its response."""
+        result = solve_dobss(self.game)
+        for l in range(self.game.L):
+            value = result.x @ self.game.C[l][:, result.responses[l]]
+            self.assertAlmostEqual(result.a[l], value, places=5)
+
+    def test_variables_order(self):
+        """Test that variables() lists x, then q and a per type."""
+        names = [name for name, value in solve_dobss(self.game).variables()]
+        self.assertEqual(names[:5], ["x-0", "x-1", "x-2", "x-3", "0-Attack1"])
+        self.assertEqual(names[7], "a-0")
+        self.assertEqual(len(names), self.game.X + sum(self.game.Q) + self.game.L)
+
+    def test_infeasible(self):
+        """Test that removing every attack of a type is reported as infeasible."""
+        result = solve_dobss(self.game.remove_attacks(("Attack",), substring=True))
+        self.assertFalse(result.optimal)
+        self.assertIsNone(result.objective)
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend name is rejected."""
+        with self.assertRaises(ValueError):
+            solve_dobss(self.game, backend="cplex")
+
+    def test_fix_attacks(self):
+        """Test that fixing attacks in a built model matches rebuilding without them."""
+        model = DobssModel(self.game)
+        for attacks in (("Attack3",), ("Attack1", "Attack9"), ("Attack2+Attack4",)):
+            model.fix_attacks(attacks)
+            result = model.solve()
+            expected = solve_dobss(self.game.remove_attacks(attacks))
+            self.assertAlmostEqual(result.objective, expected.objective, places=5)
+            for name in result.response_names():
+                self.assertFalse(any(a in name for a in attacks))
+
+        model.fix_attacks(("Attack",), substring=True)
+        self.assertFalse(model.solve().optimal)
+
+        model.restore_attacks()
+        self.check_result(model.solve())
+
+    def test_what_to_fix(self):
+        """Test the whatToFix sweep in-process."""
+        allSet = dict(whatToFix(self.game, 1))
+        self.assertEqual(len(allSet), 9)
+        self.assertAlmostEqual(allSet[("Attack3",)], 2.514286, places=4)
+
+
+    def test_what_to_fix_parallel(self):
+        """Test that a pool of workers gives the serial results in order."""
+        serial = whatToFix(self.game, 1)
+        parallel = whatToFix(self.game, 1, workers=2)
+        self.assertEqual([attacks for attacks, obj in parallel], [attacks for attacks, obj in serial])
+        np.testing.assert_allclose(
+            [obj for attacks, obj in parallel], [obj for attacks, obj in serial], atol=1e-6
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
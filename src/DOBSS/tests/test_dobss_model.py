@@ -0,0 +1,109 @@
+#!/usr/bin/python
+"""
+Test for dobss_model.py.
+Checks that the bulk (sparse matrix) builder produces the same MILP as the
+element-by-element pywraplp builder.
+"""
+
+import os
+import sys
+import unittest
+
+from ortools.linear_solver import linear_solver_pb2, pywraplp
+from ortools.linear_solver.python import model_builder
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DOBSS_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, DOBSS_DIR)
+
+import dobss_model
+from dobss_model import build_bulk_model, build_loop_model
+from game_loader import load_game
+
+
+def constraint_terms(proto):
+    """Each row as (lower bound, upper bound, {variable: coefficient})."""
+    return [
+        (c.lower_bound, c.upper_bound, dict(zip(c.var_index, c.coefficient)))
+        for c in proto.constraint
+    ]
+
+
+class TestBulkModel(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Build both models for input.txt."""
+        cls.game = load_game(os.path.join(DOBSS_DIR, "input.txt"))
+
+        cls.solver = pywraplp.Solver.CreateSolver("SCIP")
+        build_loop_model(cls.solver, cls.game)
+        cls.loop_proto = linear_solver_pb2.MPModelProto()
+        cls.solver.ExportModelToProto(cls.loop_proto)
+
+        cls.model, cls.arrays = build_bulk_model(cls.game)
+        cls.bulk_proto = cls.model.export_to_proto()
+
+    def test_same_variables(self):
+        """Test that variables match in order, bounds, type and objective."""
+        self.assertEqual(len(self.loop_proto.variable), len(self.bulk_proto.variable))
+        for v, w in zip(self.loop_proto.variable, self.bulk_proto.variable):
+            self.assertEqual(v.lower_bound, w.lower_bound)
+            self.assertEqual(v.upper_bound, w.upper_bound)
+            self.assertEqual(v.is_integer, w.is_integer)
+            self.assertAlmostEqual(v.objective_coefficient, w.objective_coefficient)
+            if not v.name.startswith("z-"):
+                self.assertEqual(v.name, w.name)
+
+    def test_same_constraints(self):
+        """Test that every row has the same bounds and coefficients."""
+        loop_rows = constraint_terms(self.loop_proto)
+        bulk_rows = constraint_terms(self.bulk_proto)
+        self.assertEqual(len(loop_rows), len(bulk_rows))
+        for r, (a, b) in enumerate(zip(loop_rows, bulk_rows)):
+            self.assertEqual(a, b, "row %d differs" % r)
+
+    def test_same_optimum(self):
+        """Test that both models solve to the DOBSS optimum."""
+        self.assertEqual(self.solver.Solve(), pywraplp.Solver.OPTIMAL)
+        solver = model_builder.Solver("SCIP")
+        self.assertEqual(solver.solve(self.model), model_builder.SolveStatus.OPTIMAL)
+        self.assertAlmostEqual(solver.objective_value, 0.912143, places=4)
+        self.assertAlmostEqual(
+            solver.objective_value, self.solver.Objective().Value(), places=6
+        )
+
+
+class TestBulkModelWithoutScipy(unittest.TestCase):
+
+    def setUp(self):
+        """Hide SciPy from dobss_model for the row by row fallback."""
+        self.scipy = dobss_model.scipy
+        dobss_model.scipy = None
+
+    def tearDown(self):
+        dobss_model.scipy = self.scipy
+
+    def test_same_model(self):
+        """Test that the fallback builds the same rows and optimum."""
+        game = load_game(os.path.join(DOBSS_DIR, "input.txt"))
+        solver = pywraplp.Solver.CreateSolver("SCIP")
+        build_loop_model(solver, game)
+        loop_proto = linear_solver_pb2.MPModelProto()
+        solver.ExportModelToProto(loop_proto)
+
+        model, arrays = build_bulk_model(game)
+        bulk_proto = model.export_to_proto()
+        self.assertEqual(len(loop_proto.variable), len(bulk_proto.variable))
+        for v, w in zip(loop_proto.variable, bulk_proto.variable):
+            self.assertEqual(v.is_integer, w.is_integer)
+            self.assertAlmostEqual(v.objective_coefficient, w.objective_coefficient)
+        self.assertEqual(constraint_terms(loop_proto), constraint_terms(bulk_proto))
+
+        solver = model_builder.Solver("SCIP")
+        self.assertEqual(solver.solve(model), model_builder.SolveStatus.OPTIMAL)
+        self.assertAlmostEqual(solver.objective_value, 0.912143, places=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
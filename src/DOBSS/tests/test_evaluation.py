@@ -0,0 +1,89 @@
+#!/usr/bin/python
+"""
+Test for evaluation.py.
+Compares the batch evaluator with solved models of input.txt.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DOBSS_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, DOBSS_DIR)
+
+from dobss import DobssModel, solve_dobss
+from evaluation import StrategyEvaluator, evaluate_strategies, uniform_strategy
+from game_loader import BayesianGame, load_game
+
+
+class TestEvaluation(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.game = load_game(os.path.join(DOBSS_DIR, "input.txt"))
+
+    def test_uniform_matches_fixed_milp(self):
+        """Test the uniform defender against the DOBSS MILP with x fixed to it."""
+        model = DobssModel(self.game)
+        for x in model.x:
+            x.SetBounds(0.25, 0.25)
+        result = model.solve()
+        ur = evaluate_strategies(self.game, uniform_strategy(self.game))
+        self.assertAlmostEqual(ur.defender[0], result.objective, places=6)
+        np.testing.assert_allclose(ur.attacker[0], result.a, atol=1e-6)
+        # Equal ties may pick other columns, with the same rewards
+        for l, j in enumerate(result.responses):
+            self.assertAlmostEqual(ur.type_defender[0, l], 0.25 * self.game.R[l][:, j].sum())
+
+    def test_equilibrium_value(self):
+        """Test that the SSE strategy evaluates to the DOBSS objective."""
+        result = solve_dobss(self.game)
+        evaluation = evaluate_strategies(self.game, result.x)
+        self.assertAlmostEqual(evaluation.defender[0], result.objective, places=5)
+
+    def test_batch_matches_types(self):
+        """Test a batch against a per-type loop over its rows."""
+        xs = np.random.default_rng(0).dirichlet(np.ones(self.game.X), 200)
+        evaluation = StrategyEvaluator(self.game).evaluate(xs)
+        self.assertEqual(evaluation.responses.shape, (200, self.game.L))
+        for n, x in enumerate(xs):
+            value = 0.0
+            for l in range(self.game.L):
+                j = evaluation.responses[n, l]
+                attacker = x @ self.game.C[l]
+                self.assertAlmostEqual(attacker[j], attacker.max())
+                self.assertAlmostEqual(evaluation.attacker[n, l], attacker.max())
+                self.assertAlmostEqual(evaluation.type_defender[n, l], x @ self.game.R[l][:, j])
+                value += self.game.p[l] * x @ self.game.R[l][:, j]
+            self.assertAlmostEqual(evaluation.defender[n], value)
+
+    def test_ties_favour_defender(self):
+        """Test that attacker ties go to the attack better for the defender."""
+        R = np.array([[0.0, 1.0, 2.0], [0.0, 1.0, 2.0]])
+        C = np.array([[1.0, 1.0, 0.0], [1.0, 1.0, 0.0]])
+        game = BayesianGame(2, np.array([1.0]), [R], [C], [["A", "B", "D"]])
+        evaluation = evaluate_strategies(game, [[0.5, 0.5], [1.0, 0.0]])
+        np.testing.assert_array_equal(evaluation.responses[:, 0], [1, 1])
+        np.testing.assert_allclose(evaluation.defender, [1.0, 1.0])
+
+    def test_near_ties_favour_defender(self):
+        """Test that ties within the tolerance, as in solver output, favour the defender."""
+        R = np.array([[0.0, 1.0], [0.0, 1.0]])
+        C = np.array([[1.0, 1.0], [1.0, 1.0 - 2e-7]])
+        game = BayesianGame(2, np.array([1.0]), [R], [C], [["A", "B"]])
+        x = [[0.5, 0.5]]
+        self.assertEqual(evaluate_strategies(game, x).responses[0, 0], 1)
+        self.assertEqual(evaluate_strategies(game, x, tolerance=1e-9).responses[0, 0], 0)
+
+    def test_type_without_attacks(self):
+        """Test that a type without attacks is rejected."""
+        game = self.game.remove_attacks(("Attack",), substring=True)
+        with self.assertRaises(ValueError):
+            StrategyEvaluator(game)
+
+
+if __name__ == "__main__":
+    unittest.main()
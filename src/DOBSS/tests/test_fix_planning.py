@@ -0,0 +1,95 @@
+#!/usr/bin/python
+"""
+Test for fix_planning.py.
+Compares the best-first patch set search with the enumerated values of
+input.txt.
+"""
+
+import os
+import sys
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DOBSS_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, DOBSS_DIR)
+
+from dobss import solve_dobss
+from fix_planning import FixPlanModel, best_fix_sets, solve_fix_budget
+from game_loader import load_game
+from whatToFix_ortools import whatToFix
+
+
+class TestFixPlanning(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.game = load_game(os.path.join(DOBSS_DIR, "input.txt"))
+
+    def test_fixed_set_value(self):
+        """Test that a fully fixed node is the game without those attacks."""
+        model = FixPlanModel(self.game)
+        names = model.candidates
+        fixed = (names.index("Attack1"), names.index("Attack9"))
+        model.set_node(fixed, [], 0)
+        expected = solve_dobss(self.game.remove_attacks(("Attack1", "Attack9")))
+        self.assertAlmostEqual(model.value(), expected.objective, places=5)
+
+    def test_relaxation_bounds(self):
+        """Test that the relaxed budget model bounds the best single fix."""
+        model = FixPlanModel(self.game)
+        model.set_node((), range(len(model.candidates)), 1)
+        self.assertGreaterEqual(model.value(), 2.514286 - 1e-6)
+
+    def test_lp_bound(self):
+        """Test that the LP relaxation bounds the patch model and finds the same pair."""
+        model = FixPlanModel(self.game)
+        lp = FixPlanModel(self.game, lp=True)
+        for m in (model, lp):
+            m.set_node((), range(len(m.candidates)), 2)
+        self.assertGreaterEqual(lp.value(), model.value() - 1e-6)
+        allSet, stats = best_fix_sets(self.game, 2, lp_bound=True)
+        self.assertEqual(allSet[0][0], ("Attack9", "Attack3"))
+        self.assertAlmostEqual(allSet[0][1], 3.075, places=4)
+
+    def test_best_single_fix(self):
+        """Test k = 1 against the whatToFix sweep."""
+        allSet, stats = best_fix_sets(self.game, 1)
+        self.assertEqual(allSet[0][0], ("Attack3",))
+        self.assertAlmostEqual(allSet[0][1], 2.514286, places=4)
+
+    def test_best_pairs(self):
+        """Test the top 3 pairs, whose values come from enumerating all 36."""
+        allSet, stats = best_fix_sets(self.game, 2, top=3)
+        self.assertEqual(allSet[0][0], ("Attack9", "Attack3"))
+        self.assertAlmostEqual(allSet[0][1], 3.075, places=4)
+        self.assertAlmostEqual(allSet[1][1], 3.0, places=4)
+        self.assertAlmostEqual(allSet[2][1], 3.0, places=4)
+        self.assertLess(stats["bounds"] + stats["evaluated"], 36)
+
+    def test_best_triple(self):
+        """Test k = 3, where bounds prune most of the 84 sets."""
+        allSet, stats = best_fix_sets(self.game, 3)
+        self.assertAlmostEqual(allSet[0][1], 5.0, places=4)
+        self.assertLess(stats["bounds"] + stats["evaluated"], 84)
+
+    def test_fix_budget_matches_enumeration(self):
+        """Test the single budget MILP against the k = 1 and k = 2 sweeps."""
+        for k in (1, 2):
+            best = max(obj for attacks, obj in whatToFix(self.game, k))
+            attacks, result = solve_fix_budget(self.game, k)
+            self.assertTrue(result.optimal)
+            self.assertAlmostEqual(result.objective, best, places=4)
+            self.assertLessEqual(len(attacks), k)
+            fixed = solve_dobss(self.game.remove_attacks(attacks))
+            self.assertAlmostEqual(fixed.objective, best, places=4)
+
+    def test_fix_budget_triple(self):
+        """Test that the budget MILP finds the best triple and leaves its attacks out."""
+        attacks, result = solve_fix_budget(self.game, 3)
+        self.assertAlmostEqual(result.objective, 5.0, places=4)
+        for l, name in enumerate(result.response_names()):
+            self.assertFalse(any(a in name for a in attacks))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+#!/usr/bin/python
+"""
+Test for game_loader.py.
+Parses the bundled game files and verifies the resulting arrays.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DOBSS_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, DOBSS_DIR)
+
+from game_loader import BayesianGame, SwitchEdges, load_game, write_binary_game
+
+
+class TestGameLoader(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Parse input.txt once."""
+        cls.game = load_game(os.path.join(DOBSS_DIR, "input.txt"))
+
+    def test_dimensions(self):
+        """Test the number of strategies, types and attacks."""
+        self.assertEqual(self.game.X, 4)
+        self.assertEqual(self.game.L, 4)
+        self.assertEqual(self.game.Q, [3, 4, 9, 5])
+
+    def test_priors(self):
+        """Test that the type priors are read as floats."""
+        np.testing.assert_allclose(self.game.p, [0.5, 0.35, 0.05, 0.1])
+
+    def test_payoffs_are_float_arrays(self):
+        """Test that rewards are split into defender and attacker matrices."""
+        R, C = self.game.R[1], self.game.C[1]
+        self.assertEqual(R.dtype, np.float64)
+        self.assertEqual(R.shape, (4, 4))
+        np.testing.assert_allclose(R[1], [5, 5, 10, 0])
+        np.testing.assert_allclose(C[1], [-8, -2, -10, 0])
+
+    def test_attack_names(self):
+        """Test per-type names and the unique attack list."""
+        self.assertEqual(self.game.cve_names[0], ["Attack1", "Attack2", "Attack9"])
+        names = self.game.attack_names()
+        self.assertEqual(len(names), 9)
+        self.assertEqual(len(set(names)), 9)
+
+    def test_remove_attacks(self):
+        """Test that removing an attack drops every column containing it."""
+        g = self.game.remove_attacks(("Attack1",))
+        self.assertEqual(g.cve_names[1], ["Attack4", "Attack9"])
+        self.assertEqual(g.R[1].shape, (4, 2))
+        np.testing.assert_allclose(g.C[1][:, 0], self.game.C[1][:, 1])
+
+    def test_attack_index(self):
+        """Test that the index lists every column of an attack and its combinations."""
+        index = self.game.attack_index()
+        self.assertEqual(index["Attack9"], [(0, 2), (1, 3), (2, 8), (3, 4)])
+        self.assertEqual(sorted(index["Attack4"]), [(1, 1), (1, 2), (2, 3), (2, 6), (2, 7), (3, 3)])
+        self.assertEqual(index["Attack1+Attack4"], [(1, 2), (2, 6)])
+        self.assertNotIn("Attack", index)
+
+    def test_remove_attacks_exact(self):
+        """Test that names are matched exactly unless substring is asked for."""
+        g = BayesianGame(
+            2,
+            np.array([1.0]),
+            [np.zeros((2, 3))],
+            [np.zeros((2, 3))],
+            [["CVE-1", "CVE-10", "CVE-1+CVE-2"]],
+        )
+        self.assertEqual(g.remove_attacks(("CVE-1",)).cve_names, [["CVE-10"]])
+        self.assertEqual(g.remove_attacks(("CVE-1",), substring=True).cve_names, [[]])
+        self.assertEqual(g.remove_attacks(("CVE",)).Q, [3])
+        self.assertEqual(g.removed_columns(("CVE-2", "CVE-10")), [[1, 2]])
+
+    def test_remove_attacks_shares_untouched_types(self):
+        """Test that types without removed columns keep their arrays."""
+        g = self.game.remove_attacks(("Attack3",))
+        self.assertIs(g.R[0], self.game.R[0])
+        self.assertEqual(g.Q, [3, 4, 6, 4])
+
+    def test_large_input(self):
+        """Test the webapps game with 269 CVE columns."""
+        g = load_game(os.path.join(DOBSS_DIR, "mtd_webapps_input"))
+        self.assertIn(269, g.Q)
+        for l in range(g.L):
+            self.assertEqual(len(g.cve_names[l]), g.Q[l])
+
+    def test_switch_cost_input(self):
+        """Test that the switching cost matrix is read when requested."""
+        path = os.path.join(
+            os.path.dirname(DOBSS_DIR), "switch_cost_DOBSS", "cost_BSSG_input.txt"
+        )
+        g = load_game(path, switch_cost=True)
+        self.assertEqual(g.cost.shape, (4, 4))
+        self.assertEqual(g.cost[0, 3], 10)
+        self.assertEqual(g.L, 3)
+
+    def test_switch_edges_input(self):
+        """Test that an EDGES list is read as the allowed switches."""
+        path = os.path.join(
+            os.path.dirname(DOBSS_DIR), "switch_cost_DOBSS", "tests", "sparse_cost_input.txt"
+        )
+        g = load_game(path, switch_cost=True)
+        self.assertIsInstance(g.cost, SwitchEdges)
+        self.assertEqual(g.cost.E, 8)
+        self.assertEqual((g.cost.i[1], g.cost.j[1], g.cost.cost[1]), (0, 3, 10))
+        self.assertEqual(g.cost.dense()[0, 2], np.inf)
+        self.assertEqual(g.cost.dense()[1, 1], 0)
+        self.assertEqual(g.L, 3)
+
+    def test_switch_edges_checked(self):
+        """Test that switches out of range or listed twice are rejected."""
+        with self.assertRaises(ValueError):
+            SwitchEdges(2, [0, 1], [1, 2], [1, 1])
+        with self.assertRaises(ValueError):
+            SwitchEdges(2, [0, 0], [1, 1], [1, 2])
+
+
+class TestBinaryGame(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def assertSameGame(self, a, b):
+        self.assertEqual(a.X, b.X)
+        self.assertEqual(a.cve_names, b.cve_names)
+        np.testing.assert_array_equal(a.p, b.p)
+        for l in range(a.L):
+            np.testing.assert_array_equal(a.R[l], b.R[l])
+            np.testing.assert_array_equal(a.C[l], b.C[l])
+
+    def test_round_trip(self):
+        """Test that a converted game loads back with identical payoffs."""
+        text_game = load_game(os.path.join(DOBSS_DIR, "mtd_webapps_input"))
+        path = os.path.join(self.tmp_dir, "webapps.bsg")
+        write_binary_game(text_game, path)
+
+        binary_game = load_game(path)
+        self.assertSameGame(text_game, binary_game)
+        self.assertIsNone(binary_game.cost)
+
+    def test_payoffs_are_memory_mapped(self):
+        """Test that the loaded matrices are read-only views of the file."""
+        path = os.path.join(self.tmp_dir, "input.bsg")
+        write_binary_game(load_game(os.path.join(DOBSS_DIR, "input.txt")), path)
+
+        game = load_game(path)
+        self.assertIsInstance(game.R[0].base, np.memmap)
+        self.assertFalse(game.C[2].flags.writeable)
+
+    def test_switch_cost_round_trip(self):
+        """Test that the switching cost matrix is stored and restored."""
+        text_path = os.path.join(
+            os.path.dirname(DOBSS_DIR), "switch_cost_DOBSS", "cost_BSSG_input.txt"
+        )
+        text_game = load_game(text_path, switch_cost=True)
+        path = os.path.join(self.tmp_dir, "cost.bsg")
+        write_binary_game(text_game, path)
+
+        binary_game = load_game(path, switch_cost=True)
+        self.assertSameGame(text_game, binary_game)
+        np.testing.assert_array_equal(text_game.cost, binary_game.cost)
+
+    def test_switch_edges_round_trip(self):
+        """Test that an edge list of switches is stored and restored."""
+        text_path = os.path.join(
+            os.path.dirname(DOBSS_DIR), "switch_cost_DOBSS", "tests", "sparse_cost_input.txt"
+        )
+        text_game = load_game(text_path, switch_cost=True)
+        path = os.path.join(self.tmp_dir, "sparse.bsg")
+        write_binary_game(text_game, path)
+
+        binary_game = load_game(path, switch_cost=True)
+        self.assertSameGame(text_game, binary_game)
+        for values in ("i", "j", "cost"):
+            np.testing.assert_array_equal(getattr(text_game.cost, values), getattr(binary_game.cost, values))
+
+    def test_missing_switch_cost(self):
+        """Test that asking for switching costs of a plain game fails."""
+        path = os.path.join(self.tmp_dir, "input.bsg")
+        write_binary_game(load_game(os.path.join(DOBSS_DIR, "input.txt")), path)
+        with self.assertRaises(ValueError):
+            load_game(path, switch_cost=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/python
+"""
+Test for heuristics.py and the heuristic option of the DOBSS engines.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DOBSS_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, DOBSS_DIR)
+
+from bench_model_build import random_game
+from dobss import DobssModel, solve_dobss
+from game_loader import load_game
+from heuristics import evaluate, heuristic_result
+
+
+class TestHeuristics(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.game = load_game(os.path.join(DOBSS_DIR, "input.txt"))
+
+    def test_evaluate(self):
+        """Test the vectorized evaluation against the DOBSS optimum."""
+        result = solve_dobss(self.game)
+        values, responses = evaluate(self.game, result.x)
+        self.assertAlmostEqual(values[0], result.objective, places=5)
+        np.testing.assert_array_equal(responses[0], result.responses)
+
+    def test_evaluate_pure(self):
+        """Test that a pure configuration is scored against the best attacks."""
+        values, responses = evaluate(self.game, np.eye(self.game.X))
+        for i in range(self.game.X):
+            expected = 0.0
+            for l in range(self.game.L):
+                j = responses[i, l]
+                self.assertEqual(self.game.C[l][i, j], self.game.C[l][i].max())
+                expected += self.game.p[l] * self.game.R[l][i, j]
+            self.assertAlmostEqual(values[i], expected)
+
+    def test_heuristic_result(self):
+        """Test that the heuristic solution is feasible and close to optimal."""
+        result = heuristic_result(self.game)
+        self.assertEqual(result.status, "FEASIBLE")
+        self.assertAlmostEqual(result.x.sum(), 1)
+        self.assertLessEqual(result.objective, 0.912143 + 1e-6)
+        self.assertGreater(result.objective, 0.85)
+
+    def test_heuristic_option(self):
+        """Test that seeding with the heuristic keeps the optimum."""
+        for backend in ("scip", "scip-bulk", "multiple-lps"):
+            result = solve_dobss(self.game, backend, {"heuristic": True})
+            self.assertEqual(result.status, "OPTIMAL")
+            self.assertAlmostEqual(result.objective, 0.912143, places=4)
+
+    def test_cutoff(self):
+        """Test that the cutoff row excludes solutions below it."""
+        model = DobssModel(self.game)
+        model.set_cutoff(0.95)
+        self.assertEqual(model.solve().status, "INFEASIBLE")
+        model.set_cutoff(0.9)
+        self.assertAlmostEqual(model.solve().objective, 0.912143, places=4)
+
+    def test_time_limited(self):
+        """Test that a time-limited run returns at least the heuristic solution."""
+        game = random_game(8, 4, 50)
+        result = solve_dobss(game, options={"heuristic": True, "time_limit": 0.01})
+        self.assertTrue(result.has_solution)
+        self.assertGreaterEqual(result.objective, heuristic_result(game).objective - 1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/python
+"""
+Test for policies.py and compare_policies.py.
+Scores the baseline policies of input.txt.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DOBSS_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, DOBSS_DIR)
+
+from dobss import solve_dobss
+from game_loader import BayesianGame, load_game
+from policies import baseline_policies, compare_policies, maximin_strategy
+
+
+class TestPolicies(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.game = load_game(os.path.join(DOBSS_DIR, "input.txt"))
+        cls.rows = compare_policies(cls.game, baseline_policies(cls.game))
+        cls.by_name = dict((row["name"], row) for row in cls.rows)
+
+    def test_policy_names(self):
+        """Test that the SSE, uniform, pure and maximin policies are scored."""
+        names = [row["name"] for row in self.rows]
+        self.assertEqual(names, ["sse", "uniform", "pure-0", "pure-1", "pure-2", "pure-3", "maximin"])
+
+    def test_values(self):
+        """Test the SSE and uniform values and that the SSE is the best policy."""
+        self.assertAlmostEqual(self.by_name["sse"]["defender"], 0.912143, places=5)
+        self.assertAlmostEqual(self.by_name["uniform"]["defender"], -0.55, places=6)
+        for row in self.rows:
+            self.assertLessEqual(row["defender"], self.by_name["sse"]["defender"] + 1e-6)
+            self.assertAlmostEqual(row["defender"], np.dot(self.game.p, row["type_defender"]))
+
+    def test_maximin(self):
+        """Test that maximin has the best worst case over all attacks."""
+        def worst(x):
+            return sum(self.game.p[l] * (x @ self.game.R[l]).min() for l in range(self.game.L))
+
+        x = maximin_strategy(self.game)
+        self.assertAlmostEqual(x.sum(), 1.0)
+        for policy in baseline_policies(self.game, pure=True):
+            self.assertGreaterEqual(worst(x), worst(policy[1]) - 1e-9)
+        self.assertGreaterEqual(self.by_name["maximin"]["defender"], worst(x) - 1e-9)
+
+    def test_sse_on_attacker_tie(self):
+        """Test that the SSE row keeps the solver's response at an attacker tie."""
+        # The attacker plays A while x[0] >= x[1]; the defender wants x[1]
+        # high with A played, so the SSE is x = (0.5, 0.5) on the tie
+        R = np.array([[0.0, -1.0], [2.0, -1.0]])
+        C = np.array([[1.0, 0.0], [0.0, 1.0]])
+        game = BayesianGame(2, np.array([1.0]), [R], [C], [["A", "B"]])
+        result = solve_dobss(game)
+        rows = compare_policies(game, baseline_policies(game, pure=False))
+        self.assertEqual(rows[0]["name"], "sse")
+        self.assertEqual(rows[0]["responses"], ["A"])
+        self.assertAlmostEqual(rows[0]["defender"], result.objective, places=5)
+        self.assertAlmostEqual(rows[0]["defender"], 1.0, places=5)
+
+        # A solver x just past the tie still scores the solver's response
+        x = [0.499998, 0.500002]
+        rows = compare_policies(game, [("sse", x, [0]), ("x", x)])
+        self.assertEqual(rows[0]["responses"], ["A"])
+        self.assertAlmostEqual(rows[0]["defender"], 1.0, places=5)
+        self.assertEqual(rows[1]["responses"], ["B"])
+
+    def test_user_strategy(self):
+        """Test that user strategies are checked and scored."""
+        rows = compare_policies(self.game, [("mine", [0.25, 0.25, 0.25, 0.25])])
+        self.assertAlmostEqual(rows[0]["defender"], -0.55, places=6)
+        with self.assertRaises(ValueError):
+            compare_policies(self.game, [("bad", [1.0, 0.0])])
+        with self.assertRaises(ValueError):
+            compare_policies(self.game, [("bad", [0.5, 0.5, 0.5, 0.0])])
+
+    def test_csv_output(self):
+        """Test the CSV table of the command line script."""
+        result = subprocess.run(
+            [sys.executable, "compare_policies.py", "input.txt", "--no-pure", "--csv", "--x", "1,0,0,0"],
+            capture_output=True,
+            text=True,
+            cwd=DOBSS_DIR,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        lines = result.stdout.strip().split("\n")
+        self.assertEqual(lines[0], "game,policy,defender,type,p,response,type defender,attacker")
+        # sse, uniform, maximin and x-0 with a line per attacker type
+        self.assertEqual(len(lines), 1 + 4 * self.game.L)
+        self.assertTrue(lines[-1].startswith("input.txt,x-0,-1.55,3,"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/python
+"""
+Test for presolve.py.
+Checks which attacks are removed and that the optimum does not change.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DOBSS_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, DOBSS_DIR)
+
+from dobss import solve_dobss
+from game_loader import BayesianGame, load_game
+from presolve import Presolve, kept_columns, type_map
+from whatToFix_ortools import whatToFix
+
+
+def with_copied_type(game, l, p):
+    """game with a copy of type l (renamed attacks) added with prior p."""
+    priors = np.append(game.p, p)
+    priors[l] -= p
+    names = game.cve_names + [[name + "-copy" for name in game.cve_names[l]]]
+    return BayesianGame(
+        game.X, priors, game.R + [game.R[l]], game.C + [game.C[l]], names, game.cost
+    )
+
+
+class TestPresolve(unittest.TestCase):
+
+    def test_kept_columns(self):
+        """Test duplicate merging and both kinds of domination."""
+        R = np.array([[1.0, 1.0, 0.0, 5.0, 2.0], [2.0, 2.0, 3.0, 5.0, 0.0]])
+        C = np.array([[4.0, 4.0, 4.0, 1.0, 0.0], [3.0, 3.0, 3.0, 3.5, 2.0]])
+        keep, duplicates = kept_columns(R, C)
+        # 1 duplicates 0; 4 is strictly worse than 0 for the attacker; 0 and 2
+        # tie for the attacker but neither is better for the defender; 3 is
+        # not dominated for the attacker
+        np.testing.assert_array_equal(keep, [0, 2, 3])
+        self.assertEqual(duplicates, {0: [1]})
+
+    def test_defender_tie_break(self):
+        """Test that of two attacker-equivalent columns the defender's best stays."""
+        R = np.array([[1.0, 2.0], [0.0, 1.0]])
+        C = np.array([[3.0, 3.0], [1.0, 1.0]])
+        keep, duplicates = kept_columns(R, C)
+        np.testing.assert_array_equal(keep, [1])
+        self.assertEqual(duplicates, {})
+
+    def test_no_reduction(self):
+        """Test that input.txt has nothing to remove."""
+        game = load_game(os.path.join(DOBSS_DIR, "input.txt"))
+        self.assertEqual(Presolve(game).game.Q, game.Q)
+
+    def test_webapps(self):
+        """Test the reduction and the optimum on mtd_webapps_input."""
+        game = load_game(os.path.join(DOBSS_DIR, "mtd_webapps_input"))
+        presolved = Presolve(game)
+        self.assertEqual(presolved.game.Q, [10, 6, 14])
+        self.assertIn("type 1: 269 -> 6 attacks", presolved.summary())
+
+        result = solve_dobss(game, options={"presolve": True})
+        self.assertEqual(result.status, "OPTIMAL")
+        self.assertAlmostEqual(result.objective, -3.25, places=4)
+        self.assertIs(result.game, game)
+        self.assertEqual(len(result.variables()), game.X + sum(game.Q) + game.L)
+        for l in range(game.L):
+            self.assertEqual(len(result.q[l]), game.Q[l])
+            self.assertEqual(result.q[l][result.responses[l]], 1)
+            value = result.x @ game.C[l][:, result.responses[l]]
+            self.assertAlmostEqual(value, (result.x @ game.C[l]).max(), places=5)
+
+    def test_restore_names(self):
+        """Test that responses are reported with the original attack names."""
+        R = [np.array([[0.0, 1.0, 1.0], [0.0, 1.0, 1.0]])]
+        C = [np.array([[2.0, 1.0, 1.0], [0.0, 1.0, 1.0]])]
+        game = BayesianGame(2, np.array([1.0]), R, C, [["A", "B", "C"]])
+        presolved = Presolve(game)
+        self.assertEqual(presolved.game.cve_names, [["A", "B"]])
+        result = solve_dobss(game, options={"presolve": True})
+        self.assertEqual(result.response_names(), ["B"])
+        np.testing.assert_array_equal(result.q[0], [0, 1, 0])
+
+
+    def test_type_map(self):
+        """Test that only types with identical payoffs are merged."""
+        game = load_game(os.path.join(DOBSS_DIR, "input.txt"))
+        self.assertEqual(type_map(game), [0, 1, 2, 3])
+        self.assertEqual(type_map(with_copied_type(game, 1, 0.15)), [0, 1, 2, 3, 1])
+
+    def test_merge_types(self):
+        """Test that a copied type is merged and reported for both types."""
+        game = with_copied_type(load_game(os.path.join(DOBSS_DIR, "input.txt")), 1, 0.15)
+        presolved = Presolve(game, drop_columns=False)
+        self.assertEqual(presolved.game.L, 4)
+        np.testing.assert_allclose(presolved.game.p, [0.5, 0.35, 0.05, 0.1])
+        self.assertIn("types: 5 -> 4", presolved.summary())
+
+        for backend in ("scip", "multiple-lps"):
+            result = solve_dobss(game, backend)
+            self.assertAlmostEqual(result.objective, 0.912143, places=4)
+            self.assertEqual(len(result.q), 5)
+            self.assertEqual(result.response_names()[4], "Attack1+Attack4-copy")
+            self.assertAlmostEqual(result.a[4], result.a[1])
+
+        unmerged = solve_dobss(game, options={"merge_types": False})
+        self.assertAlmostEqual(unmerged.objective, 0.912143, places=4)
+
+    def test_what_to_fix_merged(self):
+        """Test that the whatToFix sweep is unchanged by a copied type."""
+        game = load_game(os.path.join(DOBSS_DIR, "input.txt"))
+        expected = dict(whatToFix(game, 1))
+        allSet = dict(whatToFix(with_copied_type(game, 3, 0.0), 1))
+        for attacks, obj in expected.items():
+            self.assertAlmostEqual(allSet[attacks], obj, places=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
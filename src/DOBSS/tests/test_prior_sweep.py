@@ -0,0 +1,70 @@
+#!/usr/bin/python
+"""
+Test for prior_sweep.py.
+Compares a prior sweep of input.txt with solving every point from scratch.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DOBSS_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, DOBSS_DIR)
+
+from dobss import solve_dobss
+from game_loader import load_game
+from prior_sweep import check_priors, simplex_grid, sweep_priors, type_grid
+
+
+class TestPriorSweep(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.game = load_game(os.path.join(DOBSS_DIR, "input.txt"))
+        cls.grid = [cls.game.p, [0.25, 0.25, 0.25, 0.25], [0.1, 0.2, 0.3, 0.4]]
+        cls.rows = sweep_priors(cls.game, cls.grid)
+
+    def test_matches_fresh_solves(self):
+        """Test that every point of the sweep has the objective of a fresh solve."""
+        for p, row in zip(self.grid, self.rows):
+            expected = solve_dobss(self.game.with_priors(p))
+            self.assertEqual(row[1], "OPTIMAL")
+            self.assertAlmostEqual(row[2], expected.objective, places=5)
+            # The strategy is optimal for the priors of its point
+            value = sum(p[l] * row[3] @ self.game.R[l][:, self.game.cve_names[l].index(name)]
+                        for l, name in enumerate(row[4]))
+            self.assertAlmostEqual(value, expected.objective, places=5)
+
+    def test_parallel_sweep(self):
+        """Test that a sweep on two processes gives the same rows in grid order."""
+        rows = sweep_priors(self.game, self.grid, workers=2)
+        self.assertEqual(len(rows), len(self.grid))
+        for row, expected in zip(rows, self.rows):
+            np.testing.assert_allclose(row[0], expected[0])
+            self.assertAlmostEqual(row[2], expected[2], places=5)
+
+    def test_grids(self):
+        """Test the one-type and simplex grids."""
+        grid = type_grid(self.game, 0, [0.2, 0.8])
+        for p, value in zip(grid, (0.2, 0.8)):
+            self.assertAlmostEqual(p.sum(), 1.0)
+            self.assertAlmostEqual(p[0], value)
+            np.testing.assert_allclose(p[1:] / p[1:].sum(), self.game.p[1:] / self.game.p[1:].sum())
+        grid = simplex_grid(3, 4)
+        self.assertEqual(len(grid), 15)
+        for p in grid:
+            self.assertAlmostEqual(p.sum(), 1.0)
+
+    def test_check_priors(self):
+        """Test that priors of the wrong size or sum are rejected."""
+        with self.assertRaises(ValueError):
+            check_priors(self.game, [0.5, 0.5])
+        with self.assertRaises(ValueError):
+            check_priors(self.game, [0.5, 0.5, 0.5, 0.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/python
+"""
+Test for screening.py.
+Checks the inert sets and the bounds against solving every set of input.txt.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DOBSS_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, DOBSS_DIR)
+
+from dobss import solve_dobss
+from game_loader import BayesianGame, load_game
+from screening import FixScreen
+from whatToFix_ortools import screenedWhatToFix, whatToFix
+
+
+class TestScreening(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.game = load_game(os.path.join(DOBSS_DIR, "input.txt"))
+
+    def test_inert_dominated_attack(self):
+        """Test that a dominated attack is inert only while its dominator stays."""
+        R = np.array([[1.0, 0.0, 0.5], [0.0, 1.0, -1.0]])
+        C = np.array([[1.0, 0.0, 1.0], [0.0, 1.0, -1.0]])
+        game = BayesianGame(2, np.array([1.0]), [R], [C], [["A", "B", "D"]])
+        screen = FixScreen(game)
+        # A is as good as D for the attacker and at least as good for the defender
+        self.assertTrue(screen.inert(("D",)))
+        self.assertFalse(screen.inert(("A",)))
+        self.assertFalse(screen.inert(("A", "D")))
+        self.assertAlmostEqual(
+            solve_dobss(game.remove_attacks(("D",))).objective, solve_dobss(game).objective
+        )
+
+    def test_bounds(self):
+        """Test that every bound lies above the objective of its set."""
+        screen = FixScreen(self.game)
+        for attacks, obj in whatToFix(self.game, 1):
+            self.assertGreaterEqual(screen.bound(attacks), obj - 1e-6)
+
+    def test_screened_sweep(self):
+        """Test that the screened sweep finds the best sets with fewer solves."""
+        for k, sets, expected in ((1, 9, 2.514286), (2, 36, 3.075)):
+            allSet, report = screenedWhatToFix(self.game, k)
+            self.assertAlmostEqual(max(obj for attacks, obj in allSet), expected, places=4)
+            self.assertEqual(
+                report["inert"] + report["infeasible"] + report["bounded"] + report["solved"], sets
+            )
+            self.assertEqual(len(allSet), report["inert"] + report["infeasible"] + report["solved"])
+            self.assertGreater(report["bounded"], 0)
+
+    def test_every_set_infeasible(self):
+        """Test that sets leaving a type without attacks are kept with -inf."""
+        R = np.array([[1.0], [0.0]])
+        C = np.array([[0.0], [1.0]])
+        game = BayesianGame(2, np.array([0.5, 0.5]), [R, R], [C, C], [["A"], ["B"]])
+        allSet, report = screenedWhatToFix(game, 1)
+        self.assertEqual(allSet, whatToFix(game, 1))
+        self.assertEqual(allSet, [(("A",), float("-inf")), (("B",), float("-inf"))])
+        self.assertEqual(report["infeasible"], 2)
+        # Both skipped sets are estimated at the baseline solve time
+        self.assertAlmostEqual(report["saved_time"], 2 * report["solve_time"] - report["screen_time"])
+
+
+if __name__ == "__main__":
+    unittest.main()
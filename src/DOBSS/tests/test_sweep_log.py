@@ -0,0 +1,78 @@
+#!/usr/bin/python
+"""
+Test for sweep_log.py.
+Writes, resumes and summarises whatToFix sweep logs of input.txt.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DOBSS_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, DOBSS_DIR)
+
+from game_loader import load_game
+from sweep_log import SweepLog, read_entries, summarise
+from whatToFix_ortools import loggedWhatToFix
+
+
+class TestSweepLog(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.game = load_game(os.path.join(DOBSS_DIR, "input.txt"))
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "sweep.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_append_and_summarise(self):
+        """Test the recorded sets and the streamed top sets."""
+        log = SweepLog(self.path)
+        with log.open() as f:
+            log.append(f, ("A",), 1.0, "OPTIMAL", 0.5)
+            log.append(f, ("B",), float("-inf"), "INFEASIBLE", 0.25)
+            log.append(f, ("C",), 2.0, "OPTIMAL", 0.5)
+            log.append(f, ("D",), 1.0, "OPTIMAL", 0.5)
+        self.assertEqual(log.recorded(), {("A",), ("B",), ("C",), ("D",)})
+        summary = summarise(self.path, top=3)
+        self.assertEqual(summary["entries"], 4)
+        self.assertEqual(summary["failed"], 1)
+        self.assertAlmostEqual(summary["seconds"], 1.75)
+        self.assertEqual(summary["best"], [(("C",), 2.0), (("A",), 1.0), (("D",), 1.0)])
+
+    def test_cut_line(self):
+        """Test that a line cut short is skipped and terminated before appending."""
+        log = SweepLog(self.path)
+        with log.open() as f:
+            log.append(f, ("A",), 1.0, "OPTIMAL", 0.5)
+        with open(self.path, "a") as f:
+            f.write('{"attacks": ["B"], "obj')
+        self.assertEqual(log.recorded(), {("A",)})
+        with log.open() as f:
+            log.append(f, ("C",), 3.0, "OPTIMAL", 0.5)
+        self.assertEqual([entry["attacks"] for entry in read_entries(self.path)], [("A",), ("C",)])
+
+    def test_resumed_sweep(self):
+        """Test that a resumed sweep only solves the sets missing from the log."""
+        log = SweepLog(self.path)
+        with log.open() as f:
+            log.append(f, ("Attack1",), 0.344643, "OPTIMAL", 1.0)
+            log.append(f, ("Attack2",), 0.825, "OPTIMAL", 1.0)
+        solved, skipped = loggedWhatToFix(self.game, self.path, 1)
+        self.assertEqual((solved, skipped), (7, 2))
+        self.assertEqual(loggedWhatToFix(self.game, self.path, 1), (0, 9))
+        summary = summarise(self.path)
+        self.assertEqual(summary["entries"], 9)
+        self.assertEqual(summary["best"][0][0], ("Attack3",))
+        self.assertAlmostEqual(summary["best"][0][1], 2.514286, places=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
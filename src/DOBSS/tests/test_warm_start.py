@@ -0,0 +1,87 @@
+#!/usr/bin/python
+"""
+Test for warm_start.py.
+Checks the hinted values and that hinted solves reach the same optimum.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DOBSS_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, DOBSS_DIR)
+
+from dobss import solve_dobss
+from game_loader import BayesianGame, load_game
+from warm_start import Hint, HintStore, hint_values
+
+
+class TestWarmStart(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.game = load_game(os.path.join(DOBSS_DIR, "input.txt"))
+        cls.result = solve_dobss(cls.game)
+
+    def test_hint_values(self):
+        """Test that the hint of a solution reproduces its q and a."""
+        x, q, a = hint_values(self.game, self.result)
+        np.testing.assert_allclose(x, self.result.x)
+        for l in range(self.game.L):
+            np.testing.assert_array_equal(q[l], self.result.q[l])
+        np.testing.assert_allclose(a, self.result.a, atol=1e-6)
+
+    def test_hint_on_other_game(self):
+        """Test that removed or beaten hinted attacks are replaced by best responses."""
+        game = self.game.remove_attacks(("Attack3",))
+        x, q, a = hint_values(game, self.result)
+        for l in range(game.L):
+            values = x @ game.C[l]
+            self.assertEqual(q[l].sum(), 1)
+            self.assertAlmostEqual(a[l], values.max())
+            self.assertAlmostEqual(values[np.argmax(q[l])], values.max())
+
+    def test_hint_near_tie(self):
+        """Test that a hinted attack tied up to solver tolerance is kept."""
+        R = np.array([[1.0, 0.0], [1.0, 0.0]])
+        C = np.array([[1.0, 1.0], [1.0 - 2e-7, 1.0]])
+        game = BayesianGame(2, np.array([1.0]), [R], [C], [["A", "B"]])
+        x, q, a = hint_values(game, Hint([0.5, 0.5], ["A"]))
+        np.testing.assert_array_equal(q[0], [1, 0])
+
+    def test_hint_wrong_size(self):
+        """Test that a hint for another number of configurations is ignored."""
+        self.assertIsNone(hint_values(self.game, Hint([0.5, 0.5], [])))
+
+    def test_hinted_solves(self):
+        """Test that every backend reaches the optimum from a hint."""
+        for backend in ("scip", "scip-bulk", "multiple-lps"):
+            result = solve_dobss(self.game, backend, {"hint": self.result})
+            self.assertEqual(result.status, "OPTIMAL")
+            self.assertAlmostEqual(result.objective, 0.912143, places=4)
+
+    def test_hint_store(self):
+        """Test that the last solution of a game is stored and reused."""
+        directory = tempfile.mkdtemp()
+        try:
+            store = HintStore(directory)
+            self.assertIsNone(store.load(self.game))
+            result = solve_dobss(self.game, options={"hint_store": directory})
+            hint = store.load(self.game)
+            np.testing.assert_allclose(hint.x, result.x)
+            self.assertEqual(hint.responses, result.response_names())
+
+            result = solve_dobss(self.game, options={"hint_store": directory})
+            self.assertAlmostEqual(result.objective, 0.912143, places=4)
+            self.assertEqual(len(os.listdir(directory)), 1)
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+#!/usr/bin/python
+
+"""
+Warm starts for the DOBSS engines.
+
+A Hint is the defender mix x and the attack chosen by every attacker type,
+taken from an earlier solve (solve_dobss(game, options={"hint": result})).
+The earlier game may differ from the one being solved, e.g. in its priors
+or CVE set: hint_values keeps a hinted attack only while it is still a best
+response to x and otherwise picks the best response (ties, up to the
+solvers' feasibility tolerance, broken in favour of the defender), so the
+values handed to the solver always form a feasible solution.
+
+HintStore keeps the last solution of every game in a directory of JSON
+files, so repeated solves of the same input can be seeded automatically
+(the hint_store option).
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from evaluation import TIE_TOLERANCE
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+
+class Hint(object):
+    """
+    x          -- float array (X,) with the defender's mixed strategy
+    responses  -- list with the attack name chosen by each attacker type
+    """
+
+    def __init__(self, x, responses):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.responses = list(responses)
+
+    @classmethod
+    def from_result(cls, result):
+        return cls(result.x, result.response_names())
+
+    def to_json(self):
+        return {"x": [float(v) for v in self.x], "responses": self.responses}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["x"], data["responses"])
+
+
+def as_hint(hint):
+    """Returns hint as a Hint; accepts a Hint, a DobssResult or None."""
+    if hint is None or isinstance(hint, Hint):
+        return hint
+    if not hint.has_solution:
+        return None
+    return Hint.from_result(hint)
+
+
+def best_response(x, R, C):
+    """Attacker best response to x, breaking ties in favour of the defender."""
+    values = x @ C
+    ties = np.flatnonzero(values >= values.max() - TIE_TOLERANCE)
+    return int(ties[np.argmax((x @ R)[ties])])
+
+
+def hint_values(game, hint):
+    """
+    Returns (x, q, a) of game for hint: x as hinted, and for every attacker
+    type a 0/1 q array and its value a. Returns None if the hint does not
+    fit the game.
+    """
+    hint = as_hint(hint)
+    if hint is None or len(hint.x) != game.X or min(game.Q + [1]) == 0:
+        return None
+    x = np.clip(hint.x, 0, None)
+    if x.sum() <= 0:
+        return None
+    x = x / x.sum()
+
+    q = []
+    a = np.empty(game.L)
+    for l in range(game.L):
+        values = x @ game.C[l]
+        j = None
+        if l < len(hint.responses) and hint.responses[l] in game.cve_names[l]:
+            j = game.cve_names[l].index(hint.responses[l])
+            if values[j] < values.max() - TIE_TOLERANCE:
+                j = None
+        if j is None:
+            j = best_response(x, game.R[l], game.C[l])
+        q_l = np.zeros(game.Q[l], dtype=int)
+        q_l[j] = 1
+        q.append(q_l)
+        a[l] = values[j]
+    return x, q, a
+
+
+def game_key(game):
+    """Name of the stored hint of game: its source path, or its shape and attacks."""
+    if game.source is not None:
+        key = os.path.abspath(str(game.source))
+    else:
+        key = json.dumps([game.X, game.cve_names])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+class HintStore(object):
+    """The last solution of every game, as JSON files in directory."""
+
+    def __init__(self, directory):
+        self.directory = str(directory)
+
+    def _path(self, game):
+        return os.path.join(self.directory, game_key(game) + ".json")
+
+    def load(self, game):
+        """The stored Hint of game, or None."""
+        try:
+            with open(self._path(game)) as f:
+                return Hint.from_json(json.load(f))
+        except (IOError, OSError, ValueError, KeyError):
+            return None
+
+    def save(self, game, result):
+        """Stores the solution in result as the hint of game."""
+        if not result.has_solution:
+            return
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        path = self._path(game)
+        with open(path + ".tmp", "w") as f:
+            json.dump(Hint.from_result(result).to_json(), f)
+        os.replace(path + ".tmp", path)
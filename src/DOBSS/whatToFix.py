@@ -16,28 +16,24 @@ from gurobipy import *
 from itertools import *
 from sys import *
 from copy import deepcopy
+from game_loader import load_game
+from multiprocessing import Pool
+import argparse
 
 __author__ = "Sailik Sengupta"
 __version__ = "1.0"
 __email__ = "link2sailik [at] gmail [dot] com"
 
 
+# Match invalid attacks as substrings of the attack names (--substring)
+substring = False
+
+
 def getAllAttacks():
     """
-    Reads the input file to obtain attacks for all attackers
-    And then make a list of unique attacks
+    Makes a list of the unique attacks of all attackers
     """
-    f = open(sys.argv[1], "r")
-    f_lines = f.read().split("\n")
-    attacks = list()
-    for line in f_lines:
-        if "|" in line:
-            a = line.split("|")
-            for x in a:
-                attacks.append(x)
-    f.close()
-    # print(list(set(attacks)))
-    return list(set(attacks))
+    return game.attack_names()
 
 
 def solveBSG(invalidAttacks):
@@ -45,33 +41,11 @@ def solveBSG(invalidAttacks):
     m = Model("MIQP")
     m.setParam("OutputFlag", False)
 
-    f = open(sys.argv[1], "r")
-    """
-    ------ Input file ------
-    No. of defender strategies (X)
-    No. of attackers (L)
-    | Probability for an attacker (p_l)
-    | No. of attack strategies for an attacker (Q_l)
-    | [
-    |       Matrix ( X * Q_l) with
-    |       values r, c
-    | ]
-    | where r,c are rewards for defender and attacker respectively
-    ------ Example (see BSSG_input.txt)------
-    | 2
-    | 2
-    | 0.5
-    | 2
-    | 8,2 6,0
-    | 7,0 2,6
-    | 0.5
-    | 2
-    | 5,0 4,2
-    | 4,2 5,0
-    |----------------------------------------
-    """
+    # Drop the columns of the invalid attacks from the already parsed game
+    g = game.remove_attacks(invalidAttacks, substring)
+
     # Add defender stategies to the model
-    X = int(f.readline())
+    X = g.X
     x = []
     for i in range(X):
         n = "x-" + str(i)
@@ -86,30 +60,22 @@ def solveBSG(invalidAttacks):
 
     """ Start processing for attacker types """
 
-    L = int(f.readline())
+    L = g.L
     obj = QuadExpr()
     M = 11
 
-    def isAttackValid(invalidAttacks, cve_name):
-        for a in invalidAttacks:
-            if a in cve_name:
-                return False
-        return True
-
     for l in range(L):
 
         # Probability of l-th attacker
-        p = float(f.readline())
+        p = float(g.p[l])
 
         # Add l-th attacker info to the model
-        Q = int(f.readline())
         q = []
-        cve_names = f.readline().strip().split("|")
+        cve_names = g.cve_names[l]
 
-        for i in range(Q):
-            if isAttackValid(invalidAttacks, cve_names[i]):
-                n = str(l) + "-" + cve_names[i]
-                q.append(m.addVar(lb=0, ub=1, vtype=GRB.INTEGER, name=n))
+        for i in range(g.Q[l]):
+            n = str(l) + "-" + cve_names[i]
+            q.append(m.addVar(lb=0, ub=1, vtype=GRB.INTEGER, name=n))
 
         a = m.addVar(
             lb=-GRB.INFINITY, ub=GRB.INFINITY, vtype=GRB.CONTINUOUS, name="a-" + str(l)
@@ -117,26 +83,14 @@ def solveBSG(invalidAttacks):
 
         m.update()
 
-        # Get reward for attacker and defender
-        R = []
-        C = []
-        for i in range(X):
-            addAttack = True
-            rewards = f.readline().split()
-            r = []
-            c = []
-            for j in range(Q):
-                if isAttackValid(invalidAttacks, cve_names[j]):
-                    r_and_c = rewards[j].split(",")
-                    r.append(r_and_c[0])
-                    c.append(r_and_c[1])
-            R.append(r)
-            C.append(c)
+        # Reward for defender and attacker (only for valid attacks)
+        R = g.R[l].tolist()
+        C = g.C[l].tolist()
 
         # Update objective function
         for i in range(X):
             for j in range(len(q)):
-                r = p * float(R[i][j])
+                r = p * R[i][j]
                 obj.add(r * x[i] * q[j])
 
         # Add constraints to make attaker have a pure strategy
@@ -150,7 +104,7 @@ def solveBSG(invalidAttacks):
             val = LinExpr()
             val.add(a)
             for i in range(X):
-                val.add(float(C[i][j]) * x[i], -1.0)
+                val.add(C[i][j] * x[i], -1.0)
 
             m.addConstr(val >= 0)
             m.addConstr(val <= (1 - q[j]) * M)
@@ -182,32 +136,73 @@ def solveBSG(invalidAttacks):
     return (m.objVal, m.getVars())
 
 
+def initWorker(path, matchSubstring):
+    """
+    Loads the game in a worker process of a parallel sweep. Unlike
+    whatToFix_ortools.py, solveBSG still builds a model for every set.
+    """
+    global game, substring
+    game = load_game(path)
+    substring = matchSubstring
+
+
+def solveObj(invalidAttacks):
+    return solveBSG(invalidAttacks)[0]
+
+
+def parseArgs():
+    # The flags shared with whatToFix_ortools.py; --search, --screen and
+    # --log are only available there
+    parser = argparse.ArgumentParser(description="Find the attacks whose fix helps the defender most.")
+    parser.add_argument("input_file")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("-k", type=int, default=1, help="number of attacks fixed together")
+    parser.add_argument(
+        "--substring",
+        action="store_true",
+        help="fix every attack whose name contains a fixed attack",
+    )
+    return parser.parse_args()
+
+
 """ Main code starts here """
-attack_list = getAllAttacks()
-
-# Gets K-set permutations of attack actions
-# NO-OP is not a member of the permutations sets
-k = 1
-attack_sets = combinations(attack_list, k)
-
-# Obtain the subtracted attack_set that gives the highest reward
-maxObj = -1000000
-bestSet = []
-maxVar = []
-allSet = []
-for attacks in attack_sets:
-    obj, var = solveBSG(attacks)
-    allSet.append((attacks, obj))
-    if obj > maxObj:
-        maxObj = obj
-
-# for var in maxVar:
-#    print str(var)
-print("=====")
-print(allSet)
-print("=====")
-print("Best Obj value -> " + str(maxObj))
-
-for attacks, obj in allSet:
-    if obj == maxObj:
-        print(attacks)
+# Usage: python whatToFix.py <input_file> [--workers N] [-k K] [--substring]
+if __name__ == "__main__":
+    args = parseArgs()
+    substring = args.substring
+    game = load_game(args.input_file)
+    workers = args.workers
+    attack_list = getAllAttacks()
+
+    # Gets K-set permutations of attack actions
+    # NO-OP is not a member of the permutations sets
+    attack_sets = list(combinations(attack_list, args.k))
+
+    # Obtain the subtracted attack_set that gives the highest reward
+    maxObj = -1000000
+    bestSet = []
+    maxVar = []
+    allSet = []
+    if workers > 1:
+        # Every worker process solves its share of the sets; map keeps their order
+        with Pool(workers, initializer=initWorker, initargs=(args.input_file, substring)) as pool:
+            objs = pool.map(solveObj, attack_sets, max(1, len(attack_sets) // (4 * workers)))
+        allSet = list(zip(attack_sets, objs))
+        maxObj = max([maxObj] + objs)
+    else:
+        for attacks in attack_sets:
+            obj, var = solveBSG(attacks)
+            allSet.append((attacks, obj))
+            if obj > maxObj:
+                maxObj = obj
+
+    # for var in maxVar:
+    #    print str(var)
+    print("=====")
+    print(allSet)
+    print("=====")
+    print("Best Obj value -> " + str(maxObj))
+
+    for attacks, obj in allSet:
+        if obj == maxObj:
+            print(attacks)
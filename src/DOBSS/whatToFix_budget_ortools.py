@@ -0,0 +1,47 @@
+#!/usr/bin/python
+
+#   whatToFix as a single MILP: the DOBSS model with a binary fix variable
+#   per attack name and a budget on how many are fixed (see fix_planning.py)
+#
+#   maximize
+#       p[l] * R[l][i][j] * z[l][i][j]
+#   subject to
+#       the DOBSS rows, with the best-response row of attack j switched off
+#       and q[l][j] = 0 when any fix[c] with c in j is 1
+#       Sum fix[c] <= k
+#       fix[c] binary
+
+from BSG_miqp_ortools import printResult
+from fix_planning import solve_fix_budget
+from game_loader import load_game
+from whatToFix_ortools import sweepGame
+import argparse
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+
+def parseArgs():
+    parser = argparse.ArgumentParser(description="Find the k attacks whose fix helps the defender most, in one MILP.")
+    parser.add_argument("input_file")
+    parser.add_argument("-k", type=int, default=1, help="number of attacks that can be fixed")
+    parser.add_argument("--time-limit", type=float, default=None, help="solver time limit in seconds")
+    parser.add_argument(
+        "--substring",
+        action="store_true",
+        help="fix every attack whose name contains a fixed attack",
+    )
+    return parser.parse_args()
+
+
+""" Main code starts here """
+if __name__ == "__main__":
+    args = parseArgs()
+    game = sweepGame(load_game(args.input_file))
+    attacks, result = solve_fix_budget(
+        game, args.k, options={"time_limit": args.time_limit}, substring=args.substring
+    )
+    if result.has_solution:
+        print("Attacks fixed -> " + ", ".join(attacks))
+    printResult(result)
@@ -19,199 +19,246 @@
 #   z[i][j] >= x[i] + q[j] - 1
 #   z[i][j] >= 0
 
-from ortools.linear_solver import pywraplp
 from itertools import combinations
-import sys
+from multiprocessing import Pool
+from dobss import DobssModel, solve_dobss
+from fix_planning import best_fix_sets
+from game_loader import load_game
+from presolve import Presolve
+from screening import screen_fix_sets
+from sweep_log import SweepLog, summarise
+import argparse
+import time
 
 __author__ = "Sailik Sengupta"
 __version__ = "2.0"
 __email__ = "link2sailik [at] gmail [dot] com"
 
 
-def getAllAttacks():
-    """
-    Reads the input file to obtain attacks for all attackers
-    And then make a list of unique attacks
-    """
-    f = open(sys.argv[1], "r")
-    f_lines = f.read().split("\n")
-    attacks = list()
-    for line in f_lines:
-        if "|" in line:
-            a = line.split("|")
-            for x in a:
-                attacks.append(x)
-    f.close()
-    return list(set(attacks))
-
-
-def solveBSG(invalidAttacks):
-    # Create a new model using SCIP solver (supports MILP)
-    solver = pywraplp.Solver.CreateSolver('SCIP')
-    if not solver:
-        print("Could not create SCIP solver")
-        sys.exit(1)
-
-    f = open(str(sys.argv[1]), "r")
-    """
-    ------ Input file ------
-    No. of defender strategies (X)
-    No. of attackers (L)
-    | Probability for an attacker (p_l)
-    | No. of attack strategies for an attacker (Q_l)
-    | [
-    |       Matrix ( X * Q_l) with
-    |       values r, c
-    | ]
-    | where r,c are rewards for defender and attacker respectively
-    ------ Example (see BSSG_input.txt)------
-    | 2
-    | 2
-    | 0.5
-    | 2
-    | 8,2 6,0
-    | 7,0 2,6
-    | 0.5
-    | 2
-    | 5,0 4,2
-    | 4,2 5,0
-    |----------------------------------------
-    """
-
-    def isAttackValid(invalidAttacks, cve_name):
-        for a in invalidAttacks:
-            if a in cve_name:
-                return False
-        return True
-
-    # Add defender strategies to the model
-    X = int(f.readline())
-    x = []
-    for i in range(X):
-        n = "x-" + str(i)
-        x.append(solver.NumVar(0, 1, n))
-
-    # Add defender strategy constraints: sum of x[i] = 1
-    solver.Add(sum(x[i] for i in range(X)) == 1)
-
-    """ Start processing for attacker types """
-
-    L = int(f.readline())
-    M = 100000000
-    infinity = solver.infinity()
-
-    # Objective function (linear after substitution with z variables)
-    objective = solver.Objective()
-
-    for l in range(L):
-
-        # Probability of l-th attacker
-        v = f.readline().strip()
-        p = float(v)
-
-        # Add l-th attacker info to the model
-        Q = int(f.readline())
-        q = []
-        cve_names = f.readline().strip().split("|")
-
-        # Track valid attack indices
-        valid_indices = []
-        for j in range(Q):
-            if isAttackValid(invalidAttacks, cve_names[j]):
-                valid_indices.append(j)
-                n = str(l) + "-" + cve_names[j]
-                q.append(solver.IntVar(0, 1, n))
-
-        a = solver.NumVar(-infinity, infinity, "a-" + str(l))
-
-        # Get reward for attacker and defender (only for valid attacks)
-        R = []
-        C = []
-        for i in range(X):
-            rewards = f.readline().split()
-            r = []
-            c = []
-            for j in range(Q):
-                if isAttackValid(invalidAttacks, cve_names[j]):
-                    r_and_c = rewards[j].split(",")
-                    r.append(r_and_c[0])
-                    c.append(r_and_c[1])
-            R.append(r)
-            C.append(c)
-
-        # Linearize x[i] * q[j] using auxiliary variables z[i][j]
-        # McCormick envelope for product of continuous [0,1] and binary {0,1}
-        z = []
-        for i in range(X):
-            z_row = []
-            for j in range(len(q)):
-                z_name = "z-" + str(l) + "-" + str(i) + "-" + str(j)
-                z_ij = solver.NumVar(0, 1, z_name)
-
-                # z[i][j] <= x[i]
-                solver.Add(z_ij <= x[i])
-                # z[i][j] <= q[j]
-                solver.Add(z_ij <= q[j])
-                # z[i][j] >= x[i] + q[j] - 1
-                solver.Add(z_ij >= x[i] + q[j] - 1)
-
-                z_row.append(z_ij)
-            z.append(z_row)
-
-        # Update objective function: sum of p * R[i][j] * z[i][j]
-        for i in range(X):
-            for j in range(len(q)):
-                coef = p * float(R[i][j])
-                objective.SetCoefficient(z[i][j], coef)
-
-        # Add constraints to make attacker have a pure strategy: sum of q[j] = 1
-        solver.Add(sum(q[j] for j in range(len(q))) == 1)
-
-        # Add constraints to make attacker select dominant pure strategy
-        for j in range(len(q)):
-            # a - sum(C[i][j] * x[i]) >= 0
-            solver.Add(a - sum(float(C[i][j]) * x[i] for i in range(X)) >= 0)
-            # a - sum(C[i][j] * x[i]) <= (1 - q[j]) * M
-            solver.Add(a - sum(float(C[i][j]) * x[i] for i in range(X)) <= (1 - q[j]) * M)
-
-    f.close()
-
-    # Set objective to maximize
-    objective.SetMaximization()
-
-    # Solve
-    status = solver.Solve()
-
-    if status == pywraplp.Solver.OPTIMAL:
-        return (solver.Objective().Value(), solver.variables())
+def getAllAttacks(game):
+    """
+    Makes a list of the unique attacks of all attackers
+    """
+    return game.attack_names()
+
+
+def solveBSG(game, invalidAttacks, substring=False):
+    """
+    Solves the game after the columns of the invalid attacks are taken out
+    of the already parsed game. Returns the objective and the DobssResult.
+    """
+    result = solve_dobss(game.remove_attacks(invalidAttacks, substring))
+
+    if result.optimal:
+        return (result.objective, result)
+    else:
+        return (float('-inf'), result)
+
+
+def solveFixed(model, invalidAttacks, substring=False):
+    """
+    Like solveBSG, but re-solves an already built DobssModel of the game
+    with the invalid attacks fixed instead of building a new model.
+    """
+    model.fix_attacks(invalidAttacks, substring)
+    result = model.solve()
+
+    if result.optimal:
+        return (result.objective, result)
     else:
-        return (float('-inf'), [])
+        return (float('-inf'), result)
+
+
+def solveTimed(model, invalidAttacks, substring=False):
+    """solveFixed, returning the objective, the status and the seconds taken."""
+    start = time.time()
+    obj, result = solveFixed(model, invalidAttacks, substring)
+    return (obj, result.status, time.time() - start)
+
+
+def sweepGame(game):
+    """
+    The game the sweep model is built on: attacker types with identical
+    payoffs and attack names are merged, since fixing an attack by name
+    affects all of them alike.
+    """
+    presolve = Presolve(game, drop_columns=False)
+    for l in range(game.L):
+        if game.cve_names[l] != presolve.game.cve_names[presolve.type_index[l]]:
+            return game
+    return presolve.game
+
+
+# Model and matching of the worker process in a parallel sweep
+workerModel = None
+workerSubstring = False
+
+
+def initWorker(game, substring=False):
+    global workerModel, workerSubstring
+    workerModel = DobssModel(game)
+    workerSubstring = substring
+
+
+def solveWorker(invalidAttacks):
+    return solveTimed(workerModel, invalidAttacks, workerSubstring)
+
+
+def sweepSets(game, attack_sets, workers=1, substring=False):
+    """
+    Solves the game for every attack set taken out, yielding (attack set,
+    objective, status, seconds) as soon as a set is solved, in the order of
+    attack_sets. With workers > 1 the sets are solved by a pool of
+    processes, each with its own model.
+    """
+    game = sweepGame(game)
+    if workers > 1:
+        chunksize = max(1, min(len(attack_sets) // (4 * workers), 16))
+        with Pool(workers, initializer=initWorker, initargs=(game, substring)) as pool:
+            for attacks, solved in zip(attack_sets, pool.imap(solveWorker, attack_sets, chunksize)):
+                yield (attacks,) + solved
+        return
+
+    # The model is built once; every attack set only changes bounds
+    model = DobssModel(game)
+    for attacks in attack_sets:
+        yield (attacks,) + solveTimed(model, attacks, substring)
+
+
+def whatToFix(game, k=1, workers=1, substring=False):
+    """
+    Solves the game once for every k-set of attacks taken out.
+    Returns the list of (attack set, objective) pairs, in the order of the
+    sets. An attack set takes out the attacks it names and the combined
+    attacks using them, or with substring every attack whose name contains
+    one of them.
+    """
+    # Gets K-set permutations of attack actions
+    # NO-OP is not a member of the permutations sets
+    attack_sets = list(combinations(getAllAttacks(game), k))
+    return [
+        (attacks, obj) for attacks, obj, status, seconds in sweepSets(game, attack_sets, workers, substring)
+    ]
+
+
+def loggedWhatToFix(game, path, k=1, workers=1, substring=False):
+    """
+    whatToFix writing every result to the sweep log at path as it is
+    solved instead of keeping them; the sets already in the log are
+    skipped. Returns the number of sets solved and skipped.
+    """
+    log = SweepLog(path)
+    recorded = log.recorded()
+    attack_sets = list(combinations(getAllAttacks(game), k))
+    todo = [attacks for attacks in attack_sets if attacks not in recorded]
+    with log.open() as f:
+        for attacks, obj, status, seconds in sweepSets(game, todo, workers, substring):
+            log.append(f, attacks, obj, status, seconds)
+    return len(todo), len(attack_sets) - len(todo)
+
+
+def screenedWhatToFix(game, k=1, substring=False):
+    """
+    Like whatToFix, but screens the k-sets first (see screening.py): inert
+    sets get the objective of the game without a solve and sets whose bound
+    cannot beat the best objective are skipped. Returns the list of
+    (attack set, objective) pairs of the sets that were not skipped (sets
+    leaving a type without attacks are kept, with objective -inf) and the
+    screening report.
+    """
+    attack_sets = list(combinations(getAllAttacks(game), k))
+    game = sweepGame(game)
+    model = DobssModel(game)
+
+    def solve(attacks):
+        obj, result = solveFixed(model, attacks, substring)
+        return obj
+
+    return screen_fix_sets(game, attack_sets, solve, substring)
+
+
+def printScreening(report):
+    print(
+        "Screened sets -> %d inert, %d infeasible, %d bounded, %d solved"
+        % (report["inert"], report["infeasible"], report["bounded"], report["solved"])
+    )
+    print("Screening time -> %.2fs, solve time -> %.2fs" % (report["screen_time"], report["solve_time"]))
+    print("Estimated time saved -> %.2fs" % report["saved_time"])
+
+
+def printResults(allSet):
+    # Obtain the subtracted attack_set that gives the highest reward
+    maxObj = -1000000
+    for attacks, obj in allSet:
+        if obj > maxObj:
+            maxObj = obj
+
+    print("=====")
+    print(allSet)
+    print("=====")
+    print("Best Obj value -> " + str(maxObj))
+
+    for attacks, obj in allSet:
+        if obj == maxObj:
+            print(attacks)
+
+
+def parseArgs():
+    parser = argparse.ArgumentParser(description="Find the attacks whose fix helps the defender most.")
+    parser.add_argument("input_file")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("-k", type=int, default=1, help="number of attacks fixed together")
+    parser.add_argument(
+        "--search",
+        action="store_true",
+        help="search the best sets with bounds instead of solving every k-set",
+    )
+    parser.add_argument("--top", type=int, default=1, help="sets reported by --search and --log")
+    parser.add_argument(
+        "--lp-bound",
+        action="store_true",
+        help="bound --search nodes with the LP relaxation (cheaper, prunes less)",
+    )
+    parser.add_argument(
+        "--screen",
+        action="store_true",
+        help="skip the sets that cannot change the objective or beat the best one",
+    )
+    parser.add_argument(
+        "--log",
+        default=None,
+        help="append every result to this JSONL log and skip the sets already in it",
+    )
+    parser.add_argument(
+        "--substring",
+        action="store_true",
+        help="fix every attack whose name contains a fixed attack",
+    )
+    return parser.parse_args()
 
 
 """ Main code starts here """
-attack_list = getAllAttacks()
-
-# Gets K-set permutations of attack actions
-# NO-OP is not a member of the permutations sets
-k = 1
-attack_sets = combinations(attack_list, k)
-
-# Obtain the subtracted attack_set that gives the highest reward
-maxObj = -1000000
-bestSet = []
-maxVar = []
-allSet = []
-for attacks in attack_sets:
-    obj, var = solveBSG(attacks)
-    allSet.append((attacks, obj))
-    if obj > maxObj:
-        maxObj = obj
-
-print("=====")
-print(allSet)
-print("=====")
-print("Best Obj value -> " + str(maxObj))
-
-for attacks, obj in allSet:
-    if obj == maxObj:
-        print(attacks)
+if __name__ == "__main__":
+    args = parseArgs()
+    game = load_game(args.input_file)
+    # The sweep merges attacker types with identical payoffs and attacks
+    sweep = sweepGame(game)
+    if sweep is not game:
+        print(Presolve(game, drop_columns=False).summary())
+    if args.search:
+        allSet, stats = best_fix_sets(
+            sweep, args.k, args.top, substring=args.substring, lp_bound=args.lp_bound
+        )
+        printResults(allSet)
+        print("Bounds solved -> %d, sets solved -> %d" % (stats["bounds"], stats["evaluated"]))
+    elif args.screen:
+        allSet, report = screenedWhatToFix(game, args.k, args.substring)
+        printResults(allSet)
+        printScreening(report)
+    elif args.log is not None:
+        solved, skipped = loggedWhatToFix(game, args.log, args.k, args.workers, args.substring)
+        print("Sets solved -> %d, already in the log -> %d" % (solved, skipped))
+        summary = summarise(args.log, args.top)
+        printResults(summary["best"])
+    else:
+        printResults(whatToFix(game, args.k, args.workers, args.substring))
@@ -0,0 +1,64 @@
+#!/usr/bin/python
+
+"""
+Compares the switching cost model with and without its McCormick rows
+(the "mccormick" and "flow" engines of cost_dobss.ENGINES) on the same game
+and alphas. The flow rows imply the McCormick rows, so the LP bounds (q
+continuous) and objectives agree; what differs is the model size, the SCIP
+nodes and the build and solve times.
+
+Usage: python bench_switch_engines.py [input_file] [alpha ...]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "DOBSS"))
+from cost_dobss import ENGINES
+from game_loader import load_game
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+ALPHAS = [0.0, 0.5, 2.0, 10.0]
+
+
+def lp_bound(game, engine, alpha):
+    """Objective of the LP relaxation of the model of engine."""
+    model = ENGINES[engine](game, alpha)
+    for q_l in model.q:
+        for q_lj in q_l:
+            q_lj.SetInteger(False)
+    model.solver.Solve()
+    return model.solver.Objective().Value()
+
+
+def run(game, engine, alpha):
+    start = time.perf_counter()
+    model = ENGINES[engine](game, alpha)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    result = model.solve()
+    seconds = time.perf_counter() - start
+    size = (model.solver.NumConstraints(), model.solver.NumVariables())
+    return result, size, model.solver.nodes(), build, seconds
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "cost_BSSG_input.txt"
+    alphas = [float(a) for a in sys.argv[2:]] or ALPHAS
+    game = load_game(path, switch_cost=True)
+
+    print(
+        "%-6s %-10s %6s %6s %12s %8s %9s %9s %12s"
+        % ("alpha", "engine", "rows", "vars", "LP bound", "nodes", "build (s)", "solve (s)", "objective")
+    )
+    for alpha in alphas:
+        for engine in sorted(ENGINES):
+            result, (rows, columns), nodes, build, seconds = run(game, engine, alpha)
+            print(
+                "%-6g %-10s %6d %6d %12.6g %8d %9.3f %9.3f %12.6g"
+                % (alpha, engine, rows, columns, lp_bound(game, engine, alpha), nodes, build, seconds, result.objective)
+            )
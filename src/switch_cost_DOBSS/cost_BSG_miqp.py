@@ -1,13 +1,22 @@
 #!/usr/bin/python
 
 from gurobipy import *
+import math
+import os
 import sys
 
+# The game loader is shared with the DOBSS solvers
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "DOBSS"))
+from dobss_model import big_m_values
+from cost_dobss import switch_costs, switches
+from game_loader import load_game
+
 """
 Input Format:
 # X - Num of defender actions
 # ---
 # X * X matrix -- (i, j) represents cost to switch from configuration i to j
+#   (or EDGES E and E lines "i j cost", the only switches allowed)
 # ---
 # Num Attackers
 # Prob of each attacker
@@ -19,21 +28,16 @@ Input Format:
 
 # Create a new model
 m = Model("MIQP")
-f = open(str(sys.argv[1]), "r")
+game = load_game(sys.argv[1], switch_cost=True)
 
 # Add defender stategies to the model
-X = int(f.readline())
+X = game.X
 x = []
 for i in range(X):
     n = "x-" + str(i)
     x.append(m.addVar(lb=0, ub=1, vtype=GRB.CONTINUOUS, name=n))
 m.update()
 
-# Add defender's switching cost
-cost = []
-for i in range(X):
-    cost.append([int(j) for j in f.readline().split()])
-
 # Add defender stategy constraints
 con = LinExpr()
 for i in range(X):
@@ -41,31 +45,34 @@ for i in range(X):
 m.addConstr(con == 1)
 m.update()
 
-# Add transition cost variables
+# Add transition cost variables, one per allowed switch: every pair of a
+# cost matrix or the switches of a sparse cost, but none for a disallowed
+# (infinite cost) switch
 w = []
+cost = []
+from_config_constr = [LinExpr() for i in range(X)]
 to_config_constr = [LinExpr() for i in range(X)]
-for i in range(X):
-    _w = []
-    from_config_constr = LinExpr()
-    for j in range(X):
-        n = "w-" + str(i) + str(j)
-        temp = m.addVar(vtype=GRB.CONTINUOUS, name=n)
-        # Use McCormick_envelopes to find upper and lower bounds for the
-        # non-convex function x_i * x_j
-        if i == j:
-            m.addConstr(temp == 0)
-        else:
-            m.addConstr(temp >= 0)
-            m.addConstr(temp >= x[i] + x[j] - 1)
-            m.addConstr(temp <= x[i])
-            m.addConstr(temp <= x[j])
-        _w.append(temp)
-        from_config_constr.add(temp)
-        to_config_constr[j].add(temp)
-    m.addConstr(from_config_constr == x[i])
-    w.append(_w)
+for (i, j), c in zip(switches(game.cost), switch_costs(game.cost)):
+    if not math.isfinite(c):
+        continue
+    n = "w-" + str(i) + str(j)
+    temp = m.addVar(vtype=GRB.CONTINUOUS, name=n)
+    # Use McCormick_envelopes to find upper and lower bounds for the
+    # non-convex function x_i * x_j
+    if i == j:
+        m.addConstr(temp == 0)
+    else:
+        m.addConstr(temp >= 0)
+        m.addConstr(temp >= x[i] + x[j] - 1)
+        m.addConstr(temp <= x[i])
+        m.addConstr(temp <= x[j])
+    w.append(temp)
+    cost.append(c)
+    from_config_constr[i].add(temp)
+    to_config_constr[j].add(temp)
 
 for i in range(X):
+    m.addConstr(from_config_constr[i] == x[i])
     m.addConstr(to_config_constr[i] == x[i])
 
 m.update()
@@ -85,54 +92,46 @@ for i in range(X):
 obj = QuadExpr()
 alpha = float(sys.argv[2])
 two_step_configs = LinExpr()
-for i in range(X):
-    for j in range(X):
-        obj.add(alpha * cost[i][j] * w[i][j], -1)
-        two_step_configs.add(w[i][j])
+for w_ij, c in zip(w, cost):
+    obj.add(alpha * c * w_ij, -1)
+    two_step_configs.add(w_ij)
 m.addConstr(two_step_configs == 1)
 
 """ Start processing for attacker types """
-L = int(f.readline())
-M = 100000000
+L = game.L
 
 for l in range(L):
 
     # Probability of l-th attacker
-    v = f.readline().strip()
-    p = float(v)
+    p = float(game.p[l])
 
     # Add l-th attacker info to the model
-    Q = int(f.readline())
+    Q = game.Q[l]
     q = []
-    cve_names = f.readline().strip().split("|")
+    cve_names = game.cve_names[l]
     for i in range(Q):
         n = str(l) + "-" + cve_names[i]
         q.append(m.addVar(lb=0, ub=1, vtype=GRB.INTEGER, name=n))
 
+    # Per-column big-M and bounds of a from the attacker payoffs
+    M, (a_lb, a_ub) = big_m_values(game.C[l])
     a = m.addVar(
-        lb=-GRB.INFINITY, ub=GRB.INFINITY, vtype=GRB.CONTINUOUS, name="a-" + str(l)
+        lb=max(a_lb, -GRB.INFINITY),
+        ub=min(a_ub, GRB.INFINITY),
+        vtype=GRB.CONTINUOUS,
+        name="a-" + str(l),
     )
 
     m.update()
 
-    # Get reward for attacker and defender
-    R = []
-    C = []
-    for i in range(X):
-        rewards = f.readline().split()
-        r = []
-        c = []
-        for j in range(Q):
-            r_and_c = rewards[j].split(",")
-            r.append(r_and_c[0])
-            c.append(r_and_c[1])
-        R.append(r)
-        C.append(c)
+    # Reward for defender and attacker (already converted to floats)
+    R = game.R[l].tolist()
+    C = game.C[l].tolist()
 
     # Update objective function
     for i in range(X):
         for j in range(Q):
-            r = p * float(R[i][j])
+            r = p * R[i][j]
             obj.add(r * x[i] * q[j])
 
     # Add constraints to make attaker have a pure strategy
@@ -146,9 +145,9 @@ for l in range(L):
         val = LinExpr()
         val.add(a)
         for i in range(X):
-            val.add(float(C[i][j]) * x[i], -1.0)
+            val.add(C[i][j] * x[i], -1.0)
         m.addConstr(val >= 0, q[j].getAttr("VarName") + "lb")
-        m.addConstr(val <= (1 - q[j]) * M, q[j].getAttr("VarName") + "ub")
+        m.addConstr(val <= (1 - q[j]) * float(M[j]), q[j].getAttr("VarName") + "ub")
 
 # Set objective funcion as all attackers have now been considered
 m.setObjective(obj, GRB.MAXIMIZE)
@@ -31,9 +31,16 @@
 #         sum_i,j(w[i][j]) = 1 (total probability)
 #         w[i][i] = 0 (no self-transition cost)
 
-from ortools.linear_solver import pywraplp
+import argparse
+import os
 import sys
 
+# The game loader is shared with the DOBSS solvers
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "DOBSS"))
+from game_loader import load_game
+from cost_dobss import solve_switch_cost
+from presolve import Presolve
+
 __author__ = "Sailik Sengupta"
 __version__ = "2.0"
 __email__ = "link2sailik [at] gmail [dot] com"
@@ -43,6 +50,7 @@ Input Format:
 # X - Num of defender actions
 # ---
 # X * X matrix -- (i, j) represents cost to switch from configuration i to j
+#   or EDGES E followed by E lines "i j cost" -- only the listed switches are allowed
 # ---
 # Num Attackers
 # Prob of each attacker
@@ -50,162 +58,12 @@ Input Format:
 # ---
 # X * Attack actions -- Utility matrix showcasing (Reward for defender, Reward for attacker)
 # ---
-"""
-
-# Create a new model using SCIP solver (supports MILP)
-solver = pywraplp.Solver.CreateSolver('SCIP')
-if not solver:
-    print("Could not create SCIP solver")
-    sys.exit(1)
-
-if len(sys.argv) < 3:
-    print("Usage: python cost_BSG_miqp_ortools.py <input_file> <alpha>")
-    print("  alpha: switching cost weight parameter (e.g., 0.5)")
-    sys.exit(1)
-
-f = open(str(sys.argv[1]), "r")
-alpha = float(sys.argv[2])
-
-infinity = solver.infinity()
-
-# Add defender strategies to the model
-X = int(f.readline())
-x = []
-for i in range(X):
-    n = "x-" + str(i)
-    x.append(solver.NumVar(0, 1, n))
-
-# Add defender's switching cost matrix
-cost = []
-for i in range(X):
-    cost.append([int(j) for j in f.readline().split()])
-
-# Add defender strategy constraints: sum of x[i] = 1
-solver.Add(sum(x[i] for i in range(X)) == 1)
-
-# Add transition cost variables w[i][j]
-# w[i][j] approximates x[i] * x[j] using McCormick envelopes
-w = []
-for i in range(X):
-    w_row = []
-    from_config_sum = []  # sum_j(w[i][j])
-    for j in range(X):
-        n = "w-" + str(i) + "-" + str(j)
-        w_ij = solver.NumVar(0, 1, n)
-
-        if i == j:
-            # No self-transition cost
-            solver.Add(w_ij == 0)
-        else:
-            # McCormick envelope constraints for x[i] * x[j]
-            solver.Add(w_ij >= 0)
-            solver.Add(w_ij >= x[i] + x[j] - 1)
-            solver.Add(w_ij <= x[i])
-            solver.Add(w_ij <= x[j])
-
-        w_row.append(w_ij)
-        from_config_sum.append(w_ij)
-    w.append(w_row)
-    # Flow conservation: sum_j(w[i][j]) = x[i]
-    solver.Add(sum(from_config_sum) == x[i])
-
-# Flow conservation: sum_i(w[i][j]) = x[j]
-for j in range(X):
-    to_config_sum = [w[i][j] for i in range(X)]
-    solver.Add(sum(to_config_sum) == x[j])
-
-# Total probability constraint: sum_i,j(w[i][j]) = 1
-all_w = []
-for i in range(X):
-    for j in range(X):
-        all_w.append(w[i][j])
-solver.Add(sum(all_w) == 1)
-
-# Objective function (linear after substitution with auxiliary variables)
-objective = solver.Objective()
-
-# Add switching cost terms to objective: -alpha * cost[i][j] * w[i][j]
-for i in range(X):
-    for j in range(X):
-        coef = -alpha * cost[i][j]
-        objective.SetCoefficient(w[i][j], coef)
 
-""" Start processing for attacker types """
-L = int(f.readline())
-M = 100000000
-
-for l in range(L):
-
-    # Probability of l-th attacker
-    v = f.readline().strip()
-    p = float(v)
-
-    # Add l-th attacker info to the model
-    Q = int(f.readline())
-    q = []
-    cve_names = f.readline().strip().split("|")
-    for j in range(Q):
-        n = str(l) + "-" + cve_names[j]
-        q.append(solver.IntVar(0, 1, n))
-
-    a = solver.NumVar(-infinity, infinity, "a-" + str(l))
-
-    # Get reward for attacker and defender
-    R = []
-    C = []
-    for i in range(X):
-        rewards = f.readline().split()
-        r = []
-        c = []
-        for j in range(Q):
-            r_and_c = rewards[j].split(",")
-            r.append(r_and_c[0])
-            c.append(r_and_c[1])
-        R.append(r)
-        C.append(c)
-
-    # Linearize x[i] * q[j] using auxiliary variables z[l][i][j]
-    # McCormick envelope for product of continuous [0,1] and binary {0,1}
-    z = []
-    for i in range(X):
-        z_row = []
-        for j in range(Q):
-            z_name = "z-" + str(l) + "-" + str(i) + "-" + str(j)
-            z_ij = solver.NumVar(0, 1, z_name)
-
-            # z[i][j] <= x[i]
-            solver.Add(z_ij <= x[i])
-            # z[i][j] <= q[j]
-            solver.Add(z_ij <= q[j])
-            # z[i][j] >= x[i] + q[j] - 1
-            solver.Add(z_ij >= x[i] + q[j] - 1)
-
-            z_row.append(z_ij)
-        z.append(z_row)
-
-    # Update objective function: sum of p * R[i][j] * z[i][j]
-    for i in range(X):
-        for j in range(Q):
-            coef = p * float(R[i][j])
-            objective.SetCoefficient(z[i][j], coef)
-
-    # Add constraints to make attacker have a pure strategy: sum of q[j] = 1
-    solver.Add(sum(q[j] for j in range(Q)) == 1)
-
-    # Add constraints to make attacker select dominant pure strategy
-    for j in range(Q):
-        # a - sum(C[i][j] * x[i]) >= 0
-        solver.Add(a - sum(float(C[i][j]) * x[i] for i in range(X)) >= 0)
-        # a - sum(C[i][j] * x[i]) <= (1 - q[j]) * M
-        solver.Add(a - sum(float(C[i][j]) * x[i] for i in range(X)) <= (1 - q[j]) * M)
-
-f.close()
-
-# Set objective to maximize
-objective.SetMaximization()
-
-# Solve
-status = solver.Solve()
+The model is built and solved by cost_dobss.solve_switch_cost; this script
+only prints the result. Attacker types with identical payoffs are merged
+into one; pass --presolve to also drop duplicate and dominated
+attacks before building the model.
+"""
 
 
 # Print out values
@@ -213,13 +71,10 @@ def printSeperator():
     print("---------------")
 
 
-if status == pywraplp.Solver.OPTIMAL:
-    printSeperator()
-    for var in solver.variables():
-        # Only print x, q, and w variables (skip auxiliary z variables)
-        name = var.name()
-        if not name.startswith("z-"):
-            val = var.solution_value()
+def printResult(result):
+    if result.optimal:
+        printSeperator()
+        for name, val in result.variables():
             # Only print non-zero values for w variables to reduce output
             if name.startswith("w-"):
                 if abs(val) > 1e-6:
@@ -227,8 +82,31 @@ if status == pywraplp.Solver.OPTIMAL:
             else:
                 print("%s -> %g" % (name, val))
 
-    printSeperator()
-    print("Obj -> %g" % solver.Objective().Value())
-    printSeperator()
-else:
-    print("The problem does not have an optimal solution. Status:", status)
+        printSeperator()
+        print("Obj -> %g" % result.objective)
+        printSeperator()
+    else:
+        print("The problem does not have an optimal solution. Status:", result.status)
+
+
+def parseArgs():
+    parser = argparse.ArgumentParser(
+        description="Solve a Bayesian Stackelberg game with switching costs.", allow_abbrev=False
+    )
+    parser.add_argument("input_file")
+    parser.add_argument("alpha", type=float, help="switching cost weight (e.g. 0.5)")
+    parser.add_argument(
+        "--presolve",
+        action="store_true",
+        help="drop duplicate and dominated attacks before building the model",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parseArgs()
+    game = load_game(args.input_file, switch_cost=True)
+    presolved = Presolve(game, drop_columns=args.presolve)
+    if presolved.reduced:
+        print(presolved.summary())
+    printResult(solve_switch_cost(game, args.alpha, {"presolve": args.presolve}))
@@ -0,0 +1,285 @@
+#!/usr/bin/python
+
+#   maximize
+#       p[l] * R[l][i][j] * x[i] * q[l][j] - alpha * cost[i][j] * w[i][j]
+#   subject to
+#       Sum x[i] = 1
+#       For each l, Sum q[l][j] = 1
+#       For each l & all j, 0 <= a[l] - C[l][i][j] * x[i]
+#       For each l & all j, a[l] - C[l][i][j] * x[i] <= (1-q[l][j])M
+#       x[i] in [0, 1]
+#       For each l, q[l][j] binary
+#       a[l] is Real
+#
+# Note: The quadratic terms are linearized using auxiliary variables:
+#   - z[l][i][j] = x[i] * q[l][j] (for reward computation)
+#   - w[i][j] = x[i] * x[j] (for switching cost computation)
+#
+# McCormick envelope for w[i][j] (x[i], x[j] continuous [0,1]):
+#   w[i][j] >= 0
+#   w[i][j] >= x[i] + x[j] - 1
+#   w[i][j] <= x[i]
+#   w[i][j] <= x[j]
+#   Plus: sum_j(w[i][j]) = x[i] for all i (flow conservation)
+#         sum_i(w[i][j]) = x[j] for all j (flow conservation)
+#         sum_i,j(w[i][j]) = 1 (total probability)
+#         w[i][i] = 0 (no self-transition cost)
+#
+# With a sparse cost (game_loader.SwitchEdges) w[i][j] is only created for
+# the listed switches; every other switch is disallowed (infinite cost), so
+# the flow sums run over the switches in and out of each configuration and
+# the model grows with the number of switches rather than X * X. An
+# infinite entry of a cost matrix disallows its switch too (w[i][j] = 0).
+#
+# The "flow" engine (FlowSwitchModel) is the same model without the
+# McCormick rows, which the flow sums already imply: w[i][j] <= x[i] and
+# <= x[j] follow from the flow sums and w >= 0, and x[i] <= 1/2 (the flow
+# into i comes from the other configurations), so x[i] + x[j] - 1 <= 0.
+# It has the same optimum and LP relaxation with three fewer rows per
+# switch. In both, w[i][j] / x[i] is the probability of switching from i
+# to j in a Markov chain with stationary distribution x
+# (SwitchCostResult.transition_matrix).
+#
+# Library entry point for the switching cost model:
+#
+#     result = solve_switch_cost(load_game(path, switch_cost=True), alpha=0.5)
+#     print(result.objective, result.x, result.w)
+#     result = solve_switch_cost(game, alpha=0.5, engine="flow")
+
+from ortools.linear_solver import pywraplp
+import math
+import numpy as np
+import os
+import sys
+
+# The game loader and the DOBSS model are shared with the DOBSS solvers
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "DOBSS"))
+from dobss import DEFAULT_OPTIONS, DobssModel, DobssResult
+from dobss_model import build_loop_model
+from game_loader import SwitchEdges
+from presolve import build_presolved
+from warm_start import HintStore
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+
+class SwitchCostResult(DobssResult):
+    """
+    DobssResult of the switching cost model, with alpha and the w (X, X)
+    transition variables, or w (E,) along the switches of a SwitchEdges cost.
+    """
+
+    def __init__(self, game, status, objective=None, x=None, q=None, a=None, w=None, alpha=None):
+        DobssResult.__init__(self, game, status, objective, x, q, a)
+        self.w = w
+        self.alpha = alpha
+
+    def variables(self):
+        """(name, value) of the x, w, q and a variables, in model order."""
+        values = DobssResult.variables(self)
+        X = self.game.X
+        w = np.ravel(self.w)
+        w_values = [
+            ("w-" + str(i) + "-" + str(j), w[e]) for e, (i, j) in enumerate(switches(self.game.cost))
+        ]
+        return values[:X] + w_values + values[X:]
+
+    def transition_matrix(self):
+        """
+        The X * X switching probabilities T[i][j] = w[i][j] / x[i] of the
+        Markov chain with stationary distribution x; rows of configurations
+        with x[i] = 0 are 0.
+        """
+        X = self.game.X
+        if isinstance(self.game.cost, SwitchEdges):
+            w = np.zeros((X, X))
+            w[self.game.cost.i, self.game.cost.j] = self.w
+        else:
+            w = np.array(self.w, dtype=np.float64)
+        w = np.clip(w, 0, None)
+        out = w.sum(axis=1, keepdims=True)
+        return np.divide(w, out, out=np.zeros_like(w), where=out > 1e-12)
+
+    def switching_cost(self):
+        """Expected switching cost Sum cost[i][j] * w[i][j]."""
+        cost = self.game.cost.cost if isinstance(self.game.cost, SwitchEdges) else self.game.cost
+        # Disallowed switches have an infinite cost and w = 0
+        used = self.w != 0
+        return float(cost[used] @ self.w[used])
+
+    def reward(self):
+        """Expected defender reward, the objective without the switching cost."""
+        return self.objective + self.alpha * self.switching_cost()
+
+
+def switches(cost):
+    """
+    The (i, j) pairs the model has a w variable for: every pair of an
+    X * X matrix, or the switches of a SwitchEdges.
+    """
+    if isinstance(cost, SwitchEdges):
+        return list(zip(cost.i.tolist(), cost.j.tolist()))
+    X = cost.shape[0]
+    return [(i, j) for i in range(X) for j in range(X)]
+
+
+def switch_costs(cost):
+    """The cost of every pair of switches(cost), as a list (inf if disallowed)."""
+    if isinstance(cost, SwitchEdges):
+        return cost.cost.tolist()
+    return np.asarray(cost).ravel().tolist()
+
+
+class SwitchCostModel(DobssModel):
+    """
+    The switching cost MILP of a game, built once in a pywraplp SCIP solver.
+    set_alpha() moves it to another switching cost weight.
+    """
+
+    # Add the McCormick rows of w[i][j] = x[i] * x[j]
+    mccormick = True
+
+    def __init__(self, game, alpha, options=None):
+        if game.cost is None:
+            raise ValueError("The game has no switching cost matrix")
+        self.game = game
+        self.alpha = alpha
+        self.options = dict(DEFAULT_OPTIONS, **(options or {}))
+        self.solver = pywraplp.Solver.CreateSolver("SCIP")
+        if not self.solver:
+            raise RuntimeError("Could not create SCIP solver")
+        solver = self.solver
+
+        # Add defender strategies to the model
+        X = game.X
+        x = []
+        for i in range(X):
+            n = "x-" + str(i)
+            x.append(solver.NumVar(0, 1, n))
+
+        # Add defender strategy constraints: sum of x[i] = 1
+        solver.Add(sum(x[i] for i in range(X)) == 1)
+
+        # Add transition cost variables w[i][j]
+        # w[i][j] approximates x[i] * x[j] using McCormick envelopes
+        w = []
+        out_flow = [[] for i in range(X)]
+        in_flow = [[] for j in range(X)]
+        self.costs = [c if math.isfinite(c) else 0.0 for c in switch_costs(game.cost)]
+        for (i, j), cost in zip(switches(game.cost), switch_costs(game.cost)):
+            n = "w-" + str(i) + "-" + str(j)
+            if i == j or not math.isfinite(cost):
+                # No self-transition cost, no disallowed (infinite cost) switch
+                w_ij = solver.NumVar(0, 0, n)
+            else:
+                w_ij = solver.NumVar(0, 1, n)
+                if self.mccormick:
+                    # McCormick envelope constraints for x[i] * x[j]
+                    solver.Add(w_ij >= x[i] + x[j] - 1)
+                    solver.Add(w_ij <= x[i])
+                    solver.Add(w_ij <= x[j])
+            w.append(w_ij)
+            out_flow[i].append(w_ij)
+            in_flow[j].append(w_ij)
+
+        # Flow conservation: sum_j(w[i][j]) = x[i] and sum_i(w[i][j]) = x[j];
+        # a configuration without switches in or out gets x = 0
+        for i in range(X):
+            solver.Add(x[i] == sum(out_flow[i]))
+            solver.Add(x[i] == sum(in_flow[i]))
+
+        # Total probability constraint: sum_i,j(w[i][j]) = 1
+        solver.Add(sum(w) == 1)
+
+        # Add switching cost terms to objective: -alpha * cost[i][j] * w[i][j]
+        objective = solver.Objective()
+        for w_ij, cost in zip(w, self.costs):
+            objective.SetCoefficient(w_ij, -alpha * cost)
+
+        # Attacker types, rewards and best responses as in the DOBSS model
+        self.br_rows = []
+        self.z = []
+        self.x, self.q, self.a = build_loop_model(
+            solver, game, self.options["big_m"], x=x, br_rows=self.br_rows, z_vars=self.z
+        )
+        self.w = w
+        self.cutoff = None
+        self.a_lb = [a.lb() for a in self.a]
+        self.fixed = []
+        self.kept = None
+
+    def set_alpha(self, alpha):
+        """
+        Moves the model to weight alpha: only the objective coefficients
+        -alpha * cost[i][j] of the w variables are rewritten. A cutoff row
+        is rewritten too and switched off.
+        """
+        objective = self.solver.Objective()
+        for w_ij, cost in zip(self.w, self.costs):
+            objective.SetCoefficient(w_ij, -alpha * cost)
+            if self.cutoff is not None:
+                self.cutoff.SetCoefficient(w_ij, -alpha * cost)
+        if self.cutoff is not None:
+            self.cutoff.SetLb(-self.solver.infinity())
+        self.alpha = alpha
+
+    def incumbent(self):
+        """
+        None: the heuristics ignore switching costs, so their value is no
+        cutoff for this model.
+        """
+        return None
+
+    def solve(self):
+        result = DobssModel.solve(self)
+        w = None
+        if result.has_solution:
+            w = np.array([v.solution_value() for v in self.w])
+            if not isinstance(self.game.cost, SwitchEdges):
+                w = w.reshape(self.game.X, self.game.X)
+        return SwitchCostResult(
+            self.game,
+            result.status,
+            result.objective,
+            result.x,
+            result.q,
+            result.a,
+            w,
+            self.alpha,
+        )
+
+
+class FlowSwitchModel(SwitchCostModel):
+    """
+    The switching cost MILP with the flow rows only, without the McCormick
+    rows they imply.
+    """
+
+    mccormick = False
+
+
+ENGINES = {"mccormick": SwitchCostModel, "flow": FlowSwitchModel}
+
+
+def solve_switch_cost(game, alpha, options=None, engine="mccormick"):
+    """
+    Builds and solves the switching cost model of engine (see ENGINES);
+    returns a SwitchCostResult.
+    """
+    if engine not in ENGINES:
+        raise ValueError(
+            "Unknown engine %r, expected one of %s" % (engine, ", ".join(sorted(ENGINES)))
+        )
+    options = dict(DEFAULT_OPTIONS, **(options or {}))
+    store = None
+    if options["hint_store"] is not None:
+        store = HintStore(options["hint_store"])
+        if options["hint"] is None:
+            options["hint"] = store.load(game)
+
+    result = build_presolved(ENGINES[engine], game, options, alpha).solve()
+    if store is not None:
+        store.save(game, result)
+    return result
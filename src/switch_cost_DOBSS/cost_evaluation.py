@@ -0,0 +1,245 @@
+#!/usr/bin/python
+
+"""
+Evaluation and local improvement of defender strategies under switching
+costs, without solving the MILP.
+
+The switching cost model charges a flow w between configurations: w[i][j]
+is the probability of switching from i to j, its row and column sums are
+x, w[i][i] = 0 and only the allowed switches carry flow (cost_dobss). For
+a fixed x the MILP pays the cheapest such flow, so the switching cost of x
+is the transportation problem
+
+    cost(x) = min Sum cost[i][j] * w[i][j]
+              s.t. Sum_j w[i][j] = x[i], Sum_i w[i][j] = x[j], w >= 0
+
+over the allowed switches i != j, solved with GLOP. It is infinite when no
+such flow exists, e.g. when x[i] > 1/2 in a game where every switch is
+allowed. The objective of x is reward(x) - alpha * cost(x), where reward(x)
+is the defender utility against best-responding attackers (see
+DOBSS/evaluation.py); for the x of a MILP solution it is the MILP objective.
+
+    evaluator = SwitchCostEvaluator(game, alpha)
+    evaluation = evaluator.evaluate(xs)          # xs is (N, X)
+    xs, evaluation = polish_strategies(game, alpha, xs)
+
+polish_strategies is a projected (sub)gradient ascent over the simplex
+with the attackers' responses held fixed; the gradient of cost(x) is the
+sum of the duals of the row and column sums of x. A step is only taken if
+every type still best-responds as before and the objective improves, so
+the objective of every strategy can only go up. Its results can seed the
+MILP through polished_hint.
+
+Usage: python cost_evaluation.py <input_file> <alpha> [--x 0.25,0.25,0.25,0.25 ...]
+           [--random N] [--polish K] [--seed S]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+from ortools.linear_solver import pywraplp
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "DOBSS"))
+from cost_dobss import switch_costs, switches
+from evaluation import StrategyEvaluator
+from game_loader import load_game
+from policies import check_strategy
+from warm_start import Hint
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+TOLERANCE = 1e-9
+
+
+class SwitchCostEvaluation(object):
+    """
+    objective  -- float array (N,) with reward - alpha * cost of every x
+    reward     -- float array (N,) with the defender utility
+    cost       -- float array (N,) with the switching cost of the cheapest flow
+    responses  -- int array (N, L) with the attack chosen by every type
+    """
+
+    def __init__(self, objective, reward, cost, responses):
+        self.objective = objective
+        self.reward = reward
+        self.cost = cost
+        self.responses = responses
+
+
+def project_simplex(v):
+    """The Euclidean projection of every row of v onto the simplex."""
+    v = np.atleast_2d(v)
+    u = -np.sort(-v, axis=1)
+    cumulative = np.cumsum(u, axis=1) - 1
+    k = np.arange(1, v.shape[1] + 1)
+    rho = (u - cumulative / k > 0).sum(axis=1)
+    theta = cumulative[np.arange(v.shape[0]), rho - 1] / rho
+    return np.maximum(v - theta[:, None], 0)
+
+
+class SwitchCostEvaluator(object):
+    """Evaluates batches of defender strategies of a switching cost game."""
+
+    def __init__(self, game, alpha):
+        if game.cost is None:
+            raise ValueError("The game has no switching cost matrix")
+        self.game = game
+        self.alpha = alpha
+        self.strategies = StrategyEvaluator(game)
+
+        # The transportation problem of the flow, built once; evaluating an
+        # x only moves the bounds of its row and column sums
+        self.solver = pywraplp.Solver.CreateSolver("GLOP")
+        if not self.solver:
+            raise RuntimeError("Could not create GLOP solver")
+        solver = self.solver
+        self.out_rows = [solver.Constraint(0, 0) for i in range(game.X)]
+        self.in_rows = [solver.Constraint(0, 0) for j in range(game.X)]
+        objective = solver.Objective()
+        for (i, j), cost in zip(switches(game.cost), switch_costs(game.cost)):
+            if i == j or not math.isfinite(cost):
+                continue
+            w_ij = solver.NumVar(0, solver.infinity(), "w-" + str(i) + "-" + str(j))
+            self.out_rows[i].SetCoefficient(w_ij, 1)
+            self.in_rows[j].SetCoefficient(w_ij, 1)
+            objective.SetCoefficient(w_ij, cost)
+        objective.SetMinimization()
+
+    def flow(self, x):
+        """
+        (cost, gradient) of the cheapest flow with row and column sums x;
+        (inf, None) if there is none.
+        """
+        for i, v in enumerate(x):
+            self.out_rows[i].SetBounds(v, v)
+            self.in_rows[i].SetBounds(v, v)
+        if self.solver.Solve() != pywraplp.Solver.OPTIMAL:
+            return np.inf, None
+        gradient = [a.dual_value() + b.dual_value() for a, b in zip(self.out_rows, self.in_rows)]
+        return self.solver.Objective().Value(), np.array(gradient)
+
+    def switching_cost(self, xs):
+        """Cost of the cheapest flow of every row of xs (inf if there is none)."""
+        xs = np.atleast_2d(np.asarray(xs, dtype=np.float64))
+        return np.array([self.flow(x.tolist())[0] for x in xs])
+
+    def evaluate(self, xs):
+        """SwitchCostEvaluation of every row of xs, an (N, X) array (or one x)."""
+        xs = np.atleast_2d(np.asarray(xs, dtype=np.float64))
+        evaluation = self.strategies.evaluate(xs)
+        cost = self.switching_cost(xs)
+        objective = evaluation.defender - self.alpha * cost if self.alpha else evaluation.defender.copy()
+        return SwitchCostEvaluation(objective, evaluation.defender, cost, evaluation.responses)
+
+    def gradient(self, xs, responses):
+        """
+        Gradient of the objective of xs with the responses held fixed; rows
+        of xs without a flow are nan.
+        """
+        xs = np.atleast_2d(np.asarray(xs, dtype=np.float64))
+        columns = np.asarray(responses) + self.strategies.offsets
+        # Column R[l][:, j] of every response, weighted by the type prior
+        reward = np.einsum("inl,l->ni", self.strategies.R[:, columns], self.game.p)
+        if not self.alpha:
+            return reward
+        for n, x in enumerate(xs):
+            cost, gradient = self.flow(x.tolist())
+            reward[n] = reward[n] - self.alpha * gradient if gradient is not None else np.nan
+        return reward
+
+
+def polish_strategies(game, alpha, xs, iterations=200, step=0.1, min_step=1e-9):
+    """
+    Projected gradient ascent from every row of xs, with the responses of
+    the starting points held fixed. Returns the polished (N, X) strategies
+    and their SwitchCostEvaluation; strategies the MILP cannot play (no
+    flow) are returned unchanged.
+    """
+    evaluator = SwitchCostEvaluator(game, alpha)
+    xs = np.atleast_2d(np.asarray(xs, dtype=np.float64)).copy()
+    evaluation = evaluator.evaluate(xs)
+    responses = evaluation.responses
+    objective = evaluation.objective
+    # Strategies without a flow have no gradient and are left as they are
+    steps = np.where(np.isfinite(objective), float(step), 0.0)
+
+    for n in range(iterations):
+        active = steps >= min_step
+        if not active.any():
+            break
+        rows = np.flatnonzero(active)
+        gradient = evaluator.gradient(xs[rows], responses[rows])
+        candidates = project_simplex(xs[rows] + steps[rows, None] * gradient)
+        trial = evaluator.evaluate(candidates)
+        better = (trial.responses == responses[rows]).all(axis=1)
+        better &= trial.objective > objective[rows] + TOLERANCE
+        accepted = rows[better]
+        xs[accepted] = candidates[better]
+        objective[accepted] = trial.objective[better]
+        # Grow the step while it pays, halve it when it does not
+        steps[accepted] *= 1.5
+        steps[rows[~better]] /= 2
+
+    return xs, evaluator.evaluate(xs)
+
+
+def polished_hint(game, alpha, x, **kwargs):
+    """warm_start.Hint of x after polish_strategies, to seed the MILP with."""
+    xs, evaluation = polish_strategies(game, alpha, [x], **kwargs)
+    names = [game.cve_names[l][j] for l, j in enumerate(evaluation.responses[0])]
+    return Hint(xs[0], names)
+
+
+def parseArgs():
+    parser = argparse.ArgumentParser(description="Score and polish defender strategies under switching costs.")
+    parser.add_argument("input_file")
+    parser.add_argument("alpha", type=float)
+    parser.add_argument(
+        "--x",
+        action="append",
+        default=[],
+        help="comma separated defender strategy to score, may be repeated",
+    )
+    parser.add_argument("--random", type=int, default=10000, help="random strategies to score")
+    parser.add_argument("--polish", type=int, default=5, help="best strategies to polish")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args()
+
+
+def printRows(rows):
+    print("%-10s %12s %12s %12s  %s" % ("strategy", "objective", "reward", "cost", "x"))
+    for name, x, objective, reward, cost in rows:
+        x = " ".join("%.4g" % v for v in x)
+        print("%-10s %12.6g %12.6g %12.6g  %s" % (name, objective, reward, cost, x))
+
+
+if __name__ == "__main__":
+    args = parseArgs()
+    game = load_game(args.input_file, switch_cost=True)
+    evaluator = SwitchCostEvaluator(game, args.alpha)
+    rng = np.random.default_rng(args.seed)
+    xs = np.vstack(
+        [check_strategy(game, [float(v) for v in x.split(",")]) for x in args.x]
+        + [rng.dirichlet(np.ones(game.X), args.random)]
+    )
+    start = time.perf_counter()
+    evaluation = evaluator.evaluate(xs)
+    seconds = time.perf_counter() - start
+    print("Scored -> %d strategies in %.3fs" % (len(xs), seconds))
+
+    rows = []
+    for n in range(len(args.x)):
+        rows.append(("x-%d" % n, xs[n], evaluation.objective[n], evaluation.reward[n], evaluation.cost[n]))
+    best = np.argsort(-evaluation.objective)[: args.polish]
+    for n in best:
+        rows.append(("best-%d" % n, xs[n], evaluation.objective[n], evaluation.reward[n], evaluation.cost[n]))
+    polished, after = polish_strategies(game, args.alpha, xs[best])
+    for k, n in enumerate(best):
+        rows.append(("polished-%d" % n, polished[k], after.objective[k], after.reward[k], after.cost[k]))
+    printRows(rows)
@@ -0,0 +1,133 @@
+#!/usr/bin/python
+
+#   The optimum of the switching cost model as a function of alpha,
+#
+#       V(alpha) = max_s  reward[s] - alpha * cost[s]
+#
+#   over the solutions s, is the upper envelope of one line per solution.
+#   Its breakpoints are found with the Eisner-Severance method: given the
+#   optimal solutions a and b at alpha_a < alpha_b, their lines cross at
+#
+#       alpha* = (reward[a] - reward[b]) / (cost[a] - cost[b])
+#
+#   If the optimum at alpha* lies on the lines of a and b, they are
+#   neighbours on the envelope and alpha* is a breakpoint; otherwise the
+#   new solution splits [alpha_a, alpha_b] in two. Every solve finds either
+#   a new line or a breakpoint, so the frontier is found with at most
+#   2 * (number of frontier points) - 1 solves and no grid.
+#
+#   One model is built and only the -alpha * cost[i][j] coefficients of
+#   the w variables change between solves (SwitchCostModel.set_alpha); each
+#   solve starts from the solution at the closer end of its interval.
+#
+# Usage: python cost_frontier.py <input_file> [--alpha-min A] [--alpha-max B]
+
+from cost_dobss import SwitchCostModel
+from game_loader import load_game
+import argparse
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+TOLERANCE = 1e-6
+
+
+class FrontierPoint(object):
+    """
+    One solution on the reward / switching cost frontier.
+
+    alpha      -- the weight it was found at
+    reward     -- expected defender reward
+    cost       -- expected switching cost
+    x          -- defender strategy
+    responses  -- attack chosen by every attacker type
+    """
+
+    def __init__(self, result):
+        self.alpha = result.alpha
+        self.reward = result.reward()
+        self.cost = result.switching_cost()
+        self.x = result.x
+        self.responses = result.response_names()
+        self.result = result
+
+    def value(self, alpha):
+        """Objective of this solution at weight alpha."""
+        return self.reward - alpha * self.cost
+
+
+def alpha_frontier(game, alpha_min=0.0, alpha_max=1.0, options=None, max_solves=100):
+    """
+    The Pareto frontier of expected reward against expected switching cost
+    for alpha in [alpha_min, alpha_max]. Returns the FrontierPoints by
+    decreasing cost (and reward), the breakpoints (the alphas at which the
+    optimal solution changes from one point to the next) and the number of
+    MILPs solved.
+    """
+    model = SwitchCostModel(game, alpha_min, options)
+    solves = [0]
+
+    def solve(alpha, hint):
+        model.set_alpha(alpha)
+        model.options["hint"] = hint
+        result = model.solve()
+        solves[0] += 1
+        if not result.optimal:
+            raise RuntimeError("No optimal solution at alpha = %g: %s" % (alpha, result.status))
+        return FrontierPoint(result)
+
+    low = solve(alpha_min, None)
+    points = [low]
+    if alpha_max > alpha_min:
+        high = solve(alpha_max, low.result)
+        points.append(high)
+        intervals = [(low, high)]
+        while intervals and solves[0] < max_solves:
+            a, b = intervals.pop()
+            if a.cost - b.cost <= TOLERANCE:
+                continue
+            alpha = (a.reward - b.reward) / (a.cost - b.cost)
+            if not a.alpha < alpha < b.alpha:
+                continue
+            hint = a.result if alpha - a.alpha < b.alpha - alpha else b.result
+            middle = solve(alpha, hint)
+            if middle.value(alpha) <= a.value(alpha) + TOLERANCE:
+                continue
+            points.append(middle)
+            intervals += [(middle, b), (a, middle)]
+
+    # Keep the points no other point beats on both reward and cost
+    points.sort(key=lambda point: (-point.cost, -point.reward))
+    frontier = []
+    for point in reversed(points):
+        if not frontier or point.reward > frontier[-1].reward + TOLERANCE:
+            frontier.append(point)
+    frontier.reverse()
+    breakpoints = [
+        (a.reward - b.reward) / (a.cost - b.cost) for a, b in zip(frontier, frontier[1:])
+    ]
+    return frontier, breakpoints, solves[0]
+
+
+def parseArgs():
+    parser = argparse.ArgumentParser(description="Reward against switching cost frontier of a game.")
+    parser.add_argument("input_file")
+    parser.add_argument("--alpha-min", type=float, default=0.0)
+    parser.add_argument("--alpha-max", type=float, default=10.0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parseArgs()
+    game = load_game(args.input_file, switch_cost=True)
+    frontier, breakpoints, solves = alpha_frontier(game, args.alpha_min, args.alpha_max)
+    # Every point is optimal between the breakpoints around it
+    edges = [args.alpha_min] + breakpoints + [args.alpha_max]
+    print("%-20s %12s %12s  %s" % ("alpha", "reward", "cost", "x"))
+    for n, point in enumerate(frontier):
+        alphas = "%.4g - %.4g" % (edges[n], edges[n + 1])
+        x = " ".join("%.4g" % v for v in point.x)
+        print("%-20s %12.6g %12.6g  %s  %s" % (alphas, point.reward, point.cost, x, " | ".join(point.responses)))
+    print("Breakpoints -> " + ", ".join("%.6g" % alpha for alpha in breakpoints))
+    print("MILPs solved -> %d" % solves)
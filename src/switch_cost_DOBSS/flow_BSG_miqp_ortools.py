@@ -0,0 +1,72 @@
+#!/usr/bin/python
+
+#   maximize
+#       p[l] * R[l][i][j] * x[i] * q[l][j] - alpha * cost[i][j] * w[i][j]
+#   subject to
+#       Sum x[i] = 1
+#       For each l, Sum q[l][j] = 1
+#       For each l & all j, 0 <= a[l] - C[l][i][j] * x[i]
+#       For each l & all j, a[l] - C[l][i][j] * x[i] <= (1-q[l][j])M
+#       For each i, Sum_j w[i][j] = x[i]
+#       For each j, Sum_i w[i][j] = x[j]
+#       w[i][j] >= 0, w[i][i] = 0
+#       x[i] in [0, 1]
+#       For each l, q[l][j] binary
+#       a[l] is Real
+#
+# The model of cost_BSG_miqp_ortools.py without the McCormick rows of w,
+# which the flow rows imply (see cost_dobss.FlowSwitchModel): same input,
+# optimum and output, plus the switching probabilities T-i-j = w[i][j] / x[i].
+#
+# Usage: python flow_BSG_miqp_ortools.py <input_file> <alpha> [--presolve]
+
+import argparse
+import os
+import sys
+
+# The game loader is shared with the DOBSS solvers
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "DOBSS"))
+from game_loader import load_game
+from cost_BSG_miqp_ortools import printResult, printSeperator
+from cost_dobss import solve_switch_cost
+from presolve import Presolve
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+
+def printTransitions(result):
+    T = result.transition_matrix()
+    for i in range(result.game.X):
+        for j in range(result.game.X):
+            if T[i][j] > 1e-6:
+                print("T-%d-%d -> %g" % (i, j, T[i][j]))
+    printSeperator()
+
+
+def parseArgs():
+    parser = argparse.ArgumentParser(
+        description="Solve a Bayesian Stackelberg game with switching costs, as a flow model.",
+        allow_abbrev=False,
+    )
+    parser.add_argument("input_file")
+    parser.add_argument("alpha", type=float, help="switching cost weight (e.g. 0.5)")
+    parser.add_argument(
+        "--presolve",
+        action="store_true",
+        help="drop duplicate and dominated attacks before building the model",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parseArgs()
+    game = load_game(args.input_file, switch_cost=True)
+    presolved = Presolve(game, drop_columns=args.presolve)
+    if presolved.reduced:
+        print(presolved.summary())
+    result = solve_switch_cost(game, args.alpha, {"presolve": args.presolve}, engine="flow")
+    printResult(result)
+    if result.optimal:
+        printTransitions(result)
@@ -0,0 +1,269 @@
+#!/usr/bin/python
+
+"""
+Turns a solved switching policy into a schedule of configurations.
+
+The solution of the switching cost model is a Markov chain: x is its
+stationary distribution and T[i][j] = w[i][j] / x[i] the probability of
+switching from i to j (SwitchCostResult.transition_matrix). ScheduleSampler
+walks that chain. Every row of T gets a Vose alias table over the switches
+it allows, so a step costs one uniform draw and two table lookups whatever
+the number of configurations:
+
+    sampler = ScheduleSampler.from_result(solve_switch_cost(game, 0.5), seed=1)
+    for configuration in sampler:           # unbounded
+        ...
+    sampler.take(10 ** 6)                   # the next million, as an array
+    sampler.empirical_cost()                # mean switching cost per step
+
+simulate_chains runs many independent chains at once, one vectorized step
+for all of them at a time, for Monte Carlo estimates and replay.
+
+Usage: python schedule_sampler.py <input_file> <alpha> [--steps N] [--show K] [--seed S]
+"""
+
+from cost_dobss import ENGINES, solve_switch_cost
+from game_loader import SwitchEdges, load_game
+import argparse
+import numpy as np
+import time
+
+__author__ = "Sailik Sengupta"
+__version__ = "2.0"
+__email__ = "link2sailik [at] gmail [dot] com"
+
+BLOCK = 1 << 16
+TOLERANCE = 1e-9
+
+
+def alias_table(p):
+    """
+    Vose alias table of the distribution p (K entries): slot k is drawn
+    with probability 1/K and yields k with probability prob[k], else
+    alias[k].
+    """
+    p = np.asarray(p, dtype=np.float64)
+    K = p.size
+    scaled = (p / p.sum() * K).tolist()
+    prob = [1.0] * K
+    alias = list(range(K))
+    small = [k for k in range(K) if scaled[k] < 1]
+    large = [k for k in range(K) if scaled[k] >= 1]
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1 - scaled[s]
+        (small if scaled[l] < 1 else large).append(l)
+    # Whatever is left is 1 up to rounding
+    return np.array(prob), np.array(alias, dtype=np.int64)
+
+
+def transition_tables(T):
+    """
+    Alias tables of every row of the transition matrix T, over the switches
+    the row allows (padded to the longest row with never drawn slots).
+    Returns (prob, target, alias_target), each (X, K): slot k of row i moves
+    to target[i][k] with probability prob[i][k], else to alias_target[i][k].
+    Rows without switches stay where they are.
+    """
+    T = np.asarray(T, dtype=np.float64)
+    X = T.shape[0]
+    support = [np.flatnonzero(T[i] > TOLERANCE) for i in range(X)]
+    K = max(1, max(len(s) for s in support))
+    prob = np.ones((X, K))
+    target = np.repeat(np.arange(X), K).reshape(X, K)
+    alias_target = target.copy()
+    for i, s in enumerate(support):
+        if not len(s):
+            continue
+        p = np.zeros(K)
+        p[: len(s)] = T[i, s]
+        prob[i], alias = alias_table(p)
+        padded = np.concatenate((s, np.full(K - len(s), s[0])))
+        target[i] = padded
+        alias_target[i] = padded[alias]
+    return prob, target, alias_target
+
+
+def check_transitions(T):
+    """T as a float array, if it is a transition matrix where it matters."""
+    T = np.asarray(T, dtype=np.float64)
+    if T.ndim != 2 or T.shape[0] != T.shape[1]:
+        raise ValueError("A transition matrix must be square, got shape %s" % (T.shape,))
+    if (T < -TOLERANCE).any():
+        raise ValueError("Transition probabilities must be non-negative")
+    rows = T.sum(axis=1)
+    moving = rows > TOLERANCE
+    if (abs(rows[moving] - 1) > 1e-6).any():
+        raise ValueError("Every row of a transition matrix must sum to 1 or 0")
+    stuck = ~moving & (T[moving] > TOLERANCE).any(axis=0)
+    if stuck.any():
+        raise ValueError("Configurations %s can be reached but have no switches" % np.flatnonzero(stuck).tolist())
+    return T
+
+
+def dense_cost(cost):
+    """The X * X cost matrix of a game's cost (inf for disallowed switches)."""
+    if isinstance(cost, SwitchEdges):
+        return cost.dense()
+    return np.asarray(cost, dtype=np.float64)
+
+
+class ScheduleSampler(object):
+    """
+    An unbounded stream of configurations from a Markov chain.
+
+    state     -- the configuration the schedule is in
+    steps     -- number of configurations drawn after the start
+    switches  -- how many of them changed the configuration
+    total     -- switching cost paid over all steps, if cost was given
+    """
+
+    def __init__(self, T, cost=None, x=None, start=None, seed=None):
+        """
+        T is the transition matrix; cost (X * X, or SwitchEdges) is charged
+        for every step. The start is the configuration start, or drawn from
+        the distribution x.
+        """
+        T = check_transitions(T)
+        self.X = T.shape[0]
+        self.rng = np.random.default_rng(seed)
+        self.prob, self.target, self.alias_target = transition_tables(T)
+        self.cost = None if cost is None else dense_cost(cost)
+        if start is None:
+            if x is None:
+                raise ValueError("Give a start configuration or a distribution x to draw it from")
+            x = np.clip(np.asarray(x, dtype=np.float64), 0, None)
+            start = int(self.rng.choice(self.X, p=x / x.sum()))
+        self.state = start
+        self.steps = 0
+        self.switches = 0
+        self.total = 0.0
+
+    @classmethod
+    def from_result(cls, result, start=None, seed=None):
+        """Sampler of the chain of a SwitchCostResult, started from x."""
+        return cls(result.transition_matrix(), result.game.cost, result.x, start, seed)
+
+    @classmethod
+    def from_flows(cls, w, cost=None, start=None, seed=None):
+        """
+        Sampler of the chain with joint switching flows w (X * X), e.g. the
+        w-i-j values printed by cost_BSG_miqp_ortools.py; x is their row sums.
+        """
+        w = np.clip(np.asarray(w, dtype=np.float64), 0, None)
+        x = w.sum(axis=1)
+        T = np.divide(w, x[:, None], out=np.zeros_like(w), where=x[:, None] > TOLERANCE)
+        return cls(T, cost, x, start, seed)
+
+    def take(self, n):
+        """The next n configurations, as an int array."""
+        K = self.prob.shape[1]
+        # One uniform per step: its integer part picks the slot, the rest
+        # decides between the slot's target and its alias
+        draws = (self.rng.random(n) * K).tolist()
+        prob = self.prob.tolist()
+        target = self.target.tolist()
+        alias_target = self.alias_target.tolist()
+        path = [0] * n
+        state = self.state
+        for t, v in enumerate(draws):
+            k = int(v)
+            if v - k < prob[state][k]:
+                state = target[state][k]
+            else:
+                state = alias_target[state][k]
+            path[t] = state
+        path = np.array(path, dtype=np.int64)
+
+        previous = np.concatenate(([self.state], path[:-1]))
+        moved = previous != path
+        self.switches += int(moved.sum())
+        if self.cost is not None:
+            self.total += float(self.cost[previous[moved], path[moved]].sum())
+        self.steps += n
+        self.state = int(path[-1]) if n else self.state
+        return path
+
+    def __iter__(self):
+        """
+        Yields configurations forever. They are drawn a block at a time, so
+        steps, switches and total run ahead of the iterator by up to a block.
+        """
+        while True:
+            for configuration in self.take(BLOCK).tolist():
+                yield configuration
+
+    def empirical_cost(self):
+        """Mean switching cost per step so far."""
+        return self.total / self.steps if self.steps else 0.0
+
+    def switch_rate(self):
+        """Fraction of the steps so far that changed the configuration."""
+        return self.switches / self.steps if self.steps else 0.0
+
+
+def simulate_chains(T, chains, steps, x=None, start=None, cost=None, seed=None):
+    """
+    Runs chains independent copies of the chain T for steps steps, all
+    chains advanced together. The chains start at start (one configuration
+    or one per chain) or are drawn from x. Returns the (chains, steps)
+    configurations and, with cost, the switching cost paid by every chain.
+    """
+    T = check_transitions(T)
+    X = T.shape[0]
+    rng = np.random.default_rng(seed)
+    prob, target, alias_target = transition_tables(T)
+    K = prob.shape[1]
+    if start is None:
+        if x is None:
+            raise ValueError("Give start configurations or a distribution x to draw them from")
+        x = np.clip(np.asarray(x, dtype=np.float64), 0, None)
+        state = rng.choice(X, size=chains, p=x / x.sum())
+    else:
+        state = np.broadcast_to(np.asarray(start, dtype=np.int64), (chains,)).copy()
+
+    cost = None if cost is None else dense_cost(cost)
+    paid = np.zeros(chains)
+    paths = np.empty((chains, steps), dtype=np.int64)
+    for t in range(steps):
+        v = rng.random(chains) * K
+        k = v.astype(np.int64)
+        direct = v - k < prob[state, k]
+        after = np.where(direct, target[state, k], alias_target[state, k])
+        if cost is not None:
+            moved = after != state
+            paid[moved] += cost[state[moved], after[moved]]
+        paths[:, t] = after
+        state = after
+    return paths, (paid if cost is not None else None)
+
+
+def parseArgs():
+    parser = argparse.ArgumentParser(description="Sample a configuration schedule from a solved switching policy.")
+    parser.add_argument("input_file")
+    parser.add_argument("alpha", type=float)
+    parser.add_argument("--steps", type=int, default=10 ** 6)
+    parser.add_argument("--show", type=int, default=20, help="configurations to print")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="mccormick")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parseArgs()
+    game = load_game(args.input_file, switch_cost=True)
+    result = solve_switch_cost(game, args.alpha, engine=args.engine)
+    if not result.optimal:
+        print("The problem does not have an optimal solution. Status:", result.status)
+        raise SystemExit(1)
+    sampler = ScheduleSampler.from_result(result, seed=args.seed)
+    print("Schedule -> " + " ".join(str(i) for i in sampler.take(args.show)))
+    start = time.perf_counter()
+    sampler.take(args.steps)
+    seconds = time.perf_counter() - start
+    print("Steps -> %d in %.3fs (%.3g per second)" % (sampler.steps, seconds, args.steps / seconds))
+    print("Switch rate -> %.4f" % sampler.switch_rate())
+    print("Switching cost per step -> %.6g (expected %.6g)" % (sampler.empirical_cost(), result.switching_cost()))
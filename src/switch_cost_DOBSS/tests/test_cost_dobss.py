@@ -0,0 +1,164 @@
+#!/usr/bin/python
+"""
+Test for the cost_dobss.py library API.
+Solves the switching cost games in-process and verifies the returned arrays.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SWITCH_COST_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, SWITCH_COST_DIR)
+
+from cost_dobss import FlowSwitchModel, SwitchCostModel, solve_switch_cost
+from game_loader import BayesianGame, SwitchEdges, load_game
+
+
+class TestSolveSwitchCost(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.game = load_game(os.path.join(TESTS_DIR, "simple_cost_input.txt"), switch_cost=True)
+
+    def test_simple_game(self):
+        """Test the 2x2 game with a high switching cost weight."""
+        result = solve_switch_cost(self.game, alpha=10.0)
+        self.assertTrue(result.optimal)
+        self.assertAlmostEqual(result.objective, -45.75, places=4)
+        np.testing.assert_allclose(result.x, [0.5, 0.5], atol=1e-6)
+        np.testing.assert_allclose(result.w, [[0, 0.5], [0.5, 0]], atol=1e-6)
+        self.assertEqual(result.response_names(), ["Attack2", "Attack3"])
+
+    def test_w_is_a_flow(self):
+        """Test that w sums to x along rows and columns."""
+        game = load_game(os.path.join(SWITCH_COST_DIR, "cost_BSSG_input.txt"), switch_cost=True)
+        result = solve_switch_cost(game, alpha=0.5)
+        self.assertTrue(result.optimal)
+        np.testing.assert_allclose(result.w.sum(axis=1), result.x, atol=1e-6)
+        np.testing.assert_allclose(result.w.sum(axis=0), result.x, atol=1e-6)
+
+    def test_merge_types(self):
+        """Test that splitting a type into two identical halves changes nothing."""
+        game = self.game
+        p = np.array([0.25, 0.5, 0.25])
+        split = BayesianGame(
+            game.X, p, game.R + [game.R[0]], game.C + [game.C[0]], game.cve_names * 2, game.cost
+        )
+        result = solve_switch_cost(split, alpha=10.0)
+        self.assertAlmostEqual(result.objective, -45.75, places=4)
+        self.assertEqual(result.response_names(), ["Attack2", "Attack3", "Attack2"])
+        self.assertEqual(len(result.variables()), 2 + 4 + 3 * 3)
+
+    def test_hint(self):
+        """Test that an earlier solution can seed the switching cost model."""
+        previous = solve_switch_cost(self.game, alpha=1.0)
+        result = solve_switch_cost(self.game, alpha=10.0, options={"hint": previous})
+        self.assertAlmostEqual(result.objective, -45.75, places=4)
+
+    def test_presolve(self):
+        """Test that presolve keeps the optimum and reports original attacks."""
+        game = load_game(os.path.join(SWITCH_COST_DIR, "cost_BSSG_input.txt"), switch_cost=True)
+        result = solve_switch_cost(game, alpha=0.5, options={"presolve": True})
+        self.assertTrue(result.optimal)
+        self.assertAlmostEqual(result.objective, -4.25, places=4)
+        self.assertEqual([len(q) for q in result.q], game.Q)
+        self.assertEqual(result.w.shape, (game.X, game.X))
+
+    def test_requires_cost_matrix(self):
+        """Test that a game without switching costs is rejected."""
+        game = load_game(os.path.join(SWITCH_COST_DIR, "..", "DOBSS", "input.txt"))
+        with self.assertRaises(ValueError):
+            solve_switch_cost(game, alpha=0.5)
+
+
+class TestSparseSwitchCost(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dense = load_game(os.path.join(SWITCH_COST_DIR, "cost_BSSG_input.txt"), switch_cost=True)
+        cls.sparse = load_game(os.path.join(TESTS_DIR, "sparse_cost_input.txt"), switch_cost=True)
+
+    def with_cost(self, cost):
+        game = self.dense
+        return BayesianGame(game.X, game.p, game.R, game.C, game.cve_names, cost)
+
+    def test_all_switches_match_dense(self):
+        """Test that listing every switch gives the dense model's optimum."""
+        result = solve_switch_cost(self.with_cost(SwitchEdges.from_dense(self.dense.cost)), alpha=0.5)
+        self.assertTrue(result.optimal)
+        self.assertAlmostEqual(result.objective, -4.25, places=4)
+        self.assertEqual(result.w.shape, (12,))
+
+    def test_edge_list(self):
+        """Test that w is only created for the listed switches."""
+        result = solve_switch_cost(self.sparse, alpha=0.5)
+        self.assertTrue(result.optimal)
+        self.assertAlmostEqual(result.objective, -4.25, places=4)
+        self.assertEqual(result.w.shape, (self.sparse.cost.E,))
+        self.assertAlmostEqual(result.switching_cost(), 2.0, places=4)
+        names = [name for name, value in result.variables() if name.startswith("w-")]
+        self.assertEqual(len(names), 8)
+        self.assertNotIn("w-0-2", names)
+
+    def test_infinite_costs_match_edge_list(self):
+        """Test that inf in a cost matrix disallows a switch like a missing edge."""
+        cost = self.sparse.cost.dense()
+        cost[2, 3] = cost[3, 2] = np.inf
+        dense = solve_switch_cost(self.with_cost(cost), alpha=0.5)
+        sparse = solve_switch_cost(self.with_cost(SwitchEdges.from_dense(cost)), alpha=0.5)
+        self.assertAlmostEqual(dense.objective, sparse.objective, places=4)
+        self.assertLess(sparse.objective, -4.25)
+        self.assertAlmostEqual(dense.w[2, 3], 0)
+
+    def test_configuration_without_switches(self):
+        """Test that a configuration no switch reaches is never played."""
+        edges = SwitchEdges(4, [0, 1, 1, 2, 2, 0], [1, 0, 2, 1, 0, 2], [1] * 6)
+        result = solve_switch_cost(self.with_cost(edges), alpha=0.5)
+        self.assertTrue(result.optimal)
+        self.assertAlmostEqual(result.x[3], 0)
+        np.testing.assert_allclose(np.bincount(edges.i, result.w, 4), result.x, atol=1e-6)
+
+
+class TestFlowEngine(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.game = load_game(os.path.join(SWITCH_COST_DIR, "cost_BSSG_input.txt"), switch_cost=True)
+
+    def test_same_optimum(self):
+        """Test that both engines find the same optimum."""
+        simple = load_game(os.path.join(TESTS_DIR, "simple_cost_input.txt"), switch_cost=True)
+        result = solve_switch_cost(simple, alpha=10.0, engine="flow")
+        self.assertAlmostEqual(result.objective, -45.75, places=4)
+        result = solve_switch_cost(self.game, alpha=0.5, options={"presolve": True}, engine="flow")
+        self.assertAlmostEqual(result.objective, -4.25, places=4)
+
+    def test_smaller_model(self):
+        """Test that the flow model drops three rows per switch."""
+        mccormick = SwitchCostModel(self.game, 0.5)
+        flow = FlowSwitchModel(self.game, 0.5)
+        self.assertEqual(
+            mccormick.solver.NumConstraints() - flow.solver.NumConstraints(), 3 * 4 * 3
+        )
+
+    def test_transition_matrix(self):
+        """Test that x is the stationary distribution of the transition matrix."""
+        result = solve_switch_cost(self.game, alpha=0.5, options={"presolve": True}, engine="flow")
+        T = result.transition_matrix()
+        played = result.x > 1e-6
+        np.testing.assert_allclose(T[played].sum(axis=1), 1, atol=1e-6)
+        np.testing.assert_allclose(result.x @ T, result.x, atol=1e-6)
+        np.testing.assert_allclose(np.diag(T), 0)
+
+    def test_unknown_engine(self):
+        """Test that an unknown engine is rejected."""
+        with self.assertRaises(ValueError):
+            solve_switch_cost(self.game, alpha=0.5, engine="quadratic")
+
+
+if __name__ == "__main__":
+    unittest.main()
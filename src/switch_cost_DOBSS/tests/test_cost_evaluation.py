@@ -0,0 +1,137 @@
+#!/usr/bin/python
+"""
+Test for cost_evaluation.py.
+Checks the batch evaluator against direct computation and the local search
+against its guarantees.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SWITCH_COST_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, SWITCH_COST_DIR)
+
+from cost_dobss import solve_switch_cost
+from cost_evaluation import (
+    SwitchCostEvaluator,
+    polish_strategies,
+    polished_hint,
+    project_simplex,
+)
+from evaluation import evaluate_strategies
+from game_loader import load_game
+
+
+class TestSwitchCostEvaluator(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.game = load_game(os.path.join(SWITCH_COST_DIR, "cost_BSSG_input.txt"), switch_cost=True)
+        cls.xs = np.random.default_rng(0).dirichlet(np.ones(4), 50)
+
+    def test_objective(self):
+        """Test reward, switching cost and objective of a batch."""
+        evaluation = SwitchCostEvaluator(self.game, 0.5).evaluate(self.xs)
+        rewards = evaluate_strategies(self.game, self.xs)
+        np.testing.assert_allclose(evaluation.reward, rewards.defender)
+        np.testing.assert_allclose(evaluation.objective, evaluation.reward - 0.5 * evaluation.cost)
+
+    def test_milp_solution(self):
+        """Test that the x of a MILP solution scores the MILP objective."""
+        for game in (self.game, load_game(os.path.join(TESTS_DIR, "simple_cost_input.txt"), switch_cost=True)):
+            result = solve_switch_cost(game, 0.5)
+            evaluation = SwitchCostEvaluator(game, 0.5).evaluate(result.x)
+            self.assertAlmostEqual(evaluation.cost[0], result.switching_cost(), places=6)
+            self.assertAlmostEqual(evaluation.objective[0], result.objective, places=6)
+
+    def test_cheapest_flow(self):
+        """Test the flow cost by hand and without a flow."""
+        evaluator = SwitchCostEvaluator(self.game, 0.5)
+        # 0 <-> 1 costs 2 each way, 2 <-> 3 costs 2 each way
+        cost = evaluator.switching_cost([[0.25, 0.25, 0.25, 0.25], [0, 0, 0.5, 0.5], [0.6, 0.4, 0, 0]])
+        self.assertAlmostEqual(cost[0], 2.0)
+        self.assertAlmostEqual(cost[1], 2.0)
+        # No flow can leave configuration 0 often enough
+        self.assertEqual(cost[2], np.inf)
+
+    def test_disallowed_switches(self):
+        """Test that flows only use the allowed switches."""
+        game = load_game(os.path.join(TESTS_DIR, "sparse_cost_input.txt"), switch_cost=True)
+        evaluator = SwitchCostEvaluator(game, 0.5)
+        cost = evaluator.switching_cost([[0.5, 0, 0.5, 0], [0, 0, 0.5, 0.5]])
+        self.assertEqual(cost[0], np.inf)
+        self.assertAlmostEqual(cost[1], 2.0)
+        evaluation = SwitchCostEvaluator(game, 0).evaluate([[0.5, 0, 0.5, 0]])
+        self.assertFalse(np.isnan(evaluation.objective).any())
+
+    def test_gradient(self):
+        """Test the gradient against finite differences."""
+        evaluator = SwitchCostEvaluator(self.game, 0.5)
+        x = self.xs[np.isfinite(evaluator.switching_cost(self.xs))][:1]
+        responses = evaluator.evaluate(x).responses
+        gradient = evaluator.gradient(x, responses)[0]
+        # Linear reward with the responses fixed, minus the flow cost
+        reward = evaluator.strategies.R[:, responses[0] + evaluator.strategies.offsets] @ self.game.p
+
+        def value(y):
+            return y @ reward - 0.5 * evaluator.flow(y.tolist())[0]
+
+        h = 1e-6
+        for i in range(4):
+            e = np.zeros(4)
+            e[i] = h
+            self.assertAlmostEqual((value(x[0] + e) - value(x[0] - e)) / (2 * h), gradient[i], places=4)
+
+
+class TestLocalSearch(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.game = load_game(os.path.join(SWITCH_COST_DIR, "cost_BSSG_input.txt"), switch_cost=True)
+
+    def test_project_simplex(self):
+        """Test projections onto the simplex."""
+        np.testing.assert_allclose(project_simplex([[2.0, 0.0], [0.5, 0.5]]), [[1, 0], [0.5, 0.5]])
+        v = np.random.default_rng(1).normal(size=(20, 5))
+        p = project_simplex(v)
+        np.testing.assert_allclose(p.sum(axis=1), 1)
+        self.assertTrue((p >= 0).all())
+        np.testing.assert_allclose(project_simplex(p), p, atol=1e-12)
+
+    def test_polish(self):
+        """Test that polishing keeps the responses and never loses objective."""
+        xs = np.random.default_rng(2).dirichlet(np.ones(4), 40)
+        before = SwitchCostEvaluator(self.game, 0.5).evaluate(xs)
+        polished, after = polish_strategies(self.game, 0.5, xs)
+        np.testing.assert_array_equal(after.responses, before.responses)
+        played = np.isfinite(before.objective)
+        self.assertTrue(played.any())
+        self.assertTrue((after.objective[played] >= before.objective[played] - 1e-9).all())
+        self.assertTrue((after.objective[played] > before.objective[played] + 1e-3).any())
+        np.testing.assert_allclose(polished.sum(axis=1), 1)
+
+    def test_polish_sparse(self):
+        """Test polishing along the allowed switches only."""
+        game = load_game(os.path.join(TESTS_DIR, "sparse_cost_input.txt"), switch_cost=True)
+        xs = [[0.25, 0.25, 0.25, 0.25], [0.5, 0, 0.5, 0]]
+        before = SwitchCostEvaluator(game, 0.5).evaluate(xs)
+        polished, after = polish_strategies(game, 0.5, xs)
+        self.assertTrue(after.objective[0] >= before.objective[0] - 1e-9)
+        # Without a flow the strategy is left as it is
+        np.testing.assert_array_equal(polished[1], xs[1])
+        self.assertEqual(after.cost[1], np.inf)
+
+    def test_polished_hint(self):
+        """Test that a polished strategy seeds the MILP."""
+        hint = polished_hint(self.game, 0.5, [0.05, 0.05, 0.45, 0.45])
+        self.assertEqual(len(hint.responses), self.game.L)
+        result = solve_switch_cost(self.game, 0.5, {"hint": hint, "presolve": True})
+        self.assertAlmostEqual(result.objective, -4.25, places=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+#!/usr/bin/python
+"""
+Test for cost_frontier.py.
+Checks the alpha frontier of a small random game against fresh solves.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SWITCH_COST_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, SWITCH_COST_DIR)
+
+from cost_dobss import SwitchCostModel, solve_switch_cost
+from cost_frontier import alpha_frontier
+from bench_model_build import random_game
+from game_loader import BayesianGame, load_game
+
+
+def cost_game(seed):
+    """Random 4-configuration game with a symmetric switching cost matrix."""
+    game = random_game(4, 2, 4, seed)
+    cost = np.round(np.random.default_rng(seed + 10).uniform(0, 5, (4, 4)), 1)
+    cost = (cost + cost.T) / 2
+    np.fill_diagonal(cost, 0)
+    return BayesianGame(game.X, game.p, game.R, game.C, game.cve_names, cost)
+
+
+class TestCostFrontier(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.game = cost_game(1)
+        cls.frontier, cls.breakpoints, cls.solves = alpha_frontier(cls.game, 0.0, 10.0)
+
+    def test_set_alpha(self):
+        """Test that moving a built model to another alpha matches a fresh build."""
+        game = load_game(os.path.join(SWITCH_COST_DIR, "cost_BSSG_input.txt"), switch_cost=True)
+        model = SwitchCostModel(game, 2.0)
+        model.set_alpha(0.5)
+        result = model.solve()
+        self.assertAlmostEqual(result.objective, -4.25, places=4)
+        self.assertAlmostEqual(result.reward() - 0.5 * result.switching_cost(), -4.25, places=4)
+
+    def test_frontier_shape(self):
+        """Test that cost and reward both fall along the frontier."""
+        self.assertEqual(len(self.frontier), 5)
+        self.assertLessEqual(self.solves, 2 * len(self.frontier) - 1)
+        for a, b in zip(self.frontier, self.frontier[1:]):
+            self.assertGreater(a.reward, b.reward)
+            self.assertGreater(a.cost, b.cost)
+        self.assertEqual(self.breakpoints, sorted(self.breakpoints))
+
+    def test_envelope_matches_solves(self):
+        """Test the frontier envelope against solving at alphas between breakpoints."""
+        edges = [0.0] + self.breakpoints + [10.0]
+        for n, point in enumerate(self.frontier[:3]):
+            alpha = (edges[n] + edges[n + 1]) / 2
+            result = solve_switch_cost(self.game, alpha)
+            best = max(p.value(alpha) for p in self.frontier)
+            self.assertAlmostEqual(result.objective, best, places=4)
+            self.assertAlmostEqual(point.value(alpha), best, places=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
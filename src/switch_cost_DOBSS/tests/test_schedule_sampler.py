@@ -0,0 +1,131 @@
+#!/usr/bin/python
+"""
+Test for schedule_sampler.py.
+Checks the alias tables exactly and the sampled schedules statistically.
+"""
+
+import itertools
+import os
+import sys
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SWITCH_COST_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, SWITCH_COST_DIR)
+
+from cost_dobss import solve_switch_cost
+from game_loader import load_game
+from schedule_sampler import (
+    ScheduleSampler,
+    alias_table,
+    check_transitions,
+    simulate_chains,
+    transition_tables,
+)
+
+# A chain with a disallowed switch (0 -> 2) and a self-loop
+T = np.array([[0.0, 1.0, 0.0], [0.25, 0.0, 0.75], [0.5, 0.2, 0.3]])
+COST = np.array([[0.0, 1.0, np.inf], [1.0, 0.0, 2.0], [4.0, 3.0, 0.0]])
+
+
+def stationary(T):
+    values, vectors = np.linalg.eig(T.T)
+    x = np.real(vectors[:, np.argmin(abs(values - 1))])
+    return x / x.sum()
+
+
+class TestAliasTables(unittest.TestCase):
+
+    def test_alias_table(self):
+        """Test that the slots of an alias table add up to the distribution."""
+        p = np.array([0.1, 0.0, 0.45, 0.3, 0.15])
+        prob, alias = alias_table(p)
+        K = p.size
+        implied = prob / K + np.bincount(alias, (1 - prob) / K, K)
+        np.testing.assert_allclose(implied, p)
+
+    def test_transition_tables(self):
+        """Test that every row's table gives that row of T and only its switches."""
+        prob, target, alias_target = transition_tables(T)
+        K = prob.shape[1]
+        self.assertEqual(K, 3)
+        for i in range(3):
+            implied = np.bincount(target[i], prob[i] / K, 3)
+            implied += np.bincount(alias_target[i], (1 - prob[i]) / K, 3)
+            np.testing.assert_allclose(implied, T[i], atol=1e-12)
+
+    def test_check_transitions(self):
+        """Test that rows not summing to 1 and dead ends are rejected."""
+        with self.assertRaises(ValueError):
+            check_transitions([[0.5, 0.4], [1.0, 0.0]])
+        with self.assertRaises(ValueError):
+            check_transitions([[0.0, 1.0], [0.0, 0.0]])
+        check_transitions([[0.0, 1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+
+
+class TestScheduleSampler(unittest.TestCase):
+
+    def test_switch_frequencies(self):
+        """Test that the sampled switches follow T and pay the expected cost."""
+        sampler = ScheduleSampler(T, COST, start=0, seed=3)
+        path = sampler.take(200000)
+        previous = np.concatenate(([0], path[:-1]))
+        counts = np.zeros((3, 3))
+        np.add.at(counts, (previous, path), 1)
+        np.testing.assert_allclose(counts / counts.sum(axis=1, keepdims=True), T, atol=0.01)
+        self.assertEqual(counts[0, 2], 0)
+
+        x = stationary(T)
+        flows = x[:, None] * T
+        expected = (np.where(flows > 0, COST, 0) * flows).sum()
+        self.assertAlmostEqual(sampler.empirical_cost(), expected, delta=0.02)
+        self.assertAlmostEqual(sampler.switch_rate(), 1 - x[2] * 0.3, delta=0.01)
+
+    def test_stream(self):
+        """Test that iterating continues the same schedule as take."""
+        a = ScheduleSampler(T, start=1, seed=5)
+        b = ScheduleSampler(T, start=1, seed=5)
+        self.assertEqual(list(itertools.islice(iter(a), 10)), b.take(10).tolist())
+
+    def test_from_result(self):
+        """Test the schedule of a solved switching cost game."""
+        game = load_game(os.path.join(TESTS_DIR, "simple_cost_input.txt"), switch_cost=True)
+        result = solve_switch_cost(game, alpha=10.0)
+        sampler = ScheduleSampler.from_result(result, seed=0)
+        path = sampler.take(1000)
+        self.assertTrue((path[1:] != path[:-1]).all())
+        self.assertAlmostEqual(sampler.empirical_cost(), result.switching_cost())
+
+    def test_from_flows(self):
+        """Test that joint flows are normalized into switching probabilities."""
+        sampler = ScheduleSampler.from_flows([[0, 0.25], [0.25, 0.5]], start=0, seed=0)
+        path = sampler.take(100000)
+        self.assertAlmostEqual((path == 1).mean(), 0.75, delta=0.01)
+
+    def test_needs_start(self):
+        """Test that a sampler needs a start or a distribution to draw it from."""
+        with self.assertRaises(ValueError):
+            ScheduleSampler(T)
+
+
+class TestSimulateChains(unittest.TestCase):
+
+    def test_chains(self):
+        """Test that parallel chains spread over the stationary distribution."""
+        x = stationary(T)
+        paths, paid = simulate_chains(T, 20000, 5, x=x, cost=COST, seed=2)
+        self.assertEqual(paths.shape, (20000, 5))
+        np.testing.assert_allclose(np.bincount(paths[:, -1], minlength=3) / 20000, x, atol=0.02)
+        self.assertTrue(np.isfinite(paid).all())
+
+    def test_fixed_start(self):
+        """Test that chains started in 0 all switch to 1 first."""
+        paths, paid = simulate_chains(T, 100, 3, start=0, seed=2)
+        self.assertTrue((paths[:, 0] == 1).all())
+        self.assertIsNone(paid)
+
+
+if __name__ == "__main__":
+    unittest.main()